@@ -1,18 +1,42 @@
-import uvicorn
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
 from a2a.types import AgentSkill, AgentCard, AgentCapabilities
 import click
 from a2a.server.request_handlers import DefaultRequestHandler
 
 from agents.host_agent.agent_executor import HostAgentExecutor
 from a2a.server.tasks import InMemoryTaskStore
+from utilities.a2a.sqlite_task_store import SQLiteTaskStore
+from utilities.a2a.multi_worker import serve
+from utilities.adk.llm_response_cache import LLMResponseCache
+from utilities.a2a.delegation_cache import DelegationCache
 from a2a.server.apps import A2AStarletteApplication
+from starlette.middleware import Middleware
+from utilities.common.telemetry import TraceContextMiddleware, setup_tracing, telemetry_routes
+from google.adk.models import BaseLlm
+from typing import Optional
 
 
-@click.command()
-@click.option('--host', default='localhost', help='Host for the agent server')
-@click.option('--port', default=11000, type=int, help='Port for the agent server')
-def main(host: str, port: int):
-    """Main function to run the Host Agent"""
+def build_app(
+    host: str,
+    port: int,
+    task_db: str,
+    shared_store: bool = False,
+    session_db: str = "memory",
+    llm_cache: str = "off",
+    delegation_ttls: tuple[str, ...] = (),
+    status_interval: float = 1.0,
+    stream_partial: bool = False,
+    model: str | BaseLlm = "gemini-2.5-flash",
+    registry_file: Optional[str] = None,
+    mcp_config_file: Optional[str] = None,
+    mcp_manifest_file: Optional[str] = None
+):
+    """Builds the Host Agent server app (one per worker process)"""
 
     # Define Host Agent skill
     skill = AgentSkill(
@@ -38,20 +62,171 @@ def main(host: str, port: int):
         capabilities=AgentCapabilities(streaming=True)
     )
 
+    # Durable task storage (or in-memory when asked for)
+    if task_db == "memory":
+        task_store = InMemoryTaskStore()
+    else:
+        task_store = SQLiteTaskStore(task_db, shared=shared_store)
+
+    # Optional cache of model answers
+    response_cache = None
+    if llm_cache == "memory":
+        response_cache = LLMResponseCache()
+    elif llm_cache != "off":
+        response_cache = LLMResponseCache(cache_file=llm_cache)
+
+    # Per-agent reuse of delegation results ("agent_name=seconds")
+    delegation_cache = DelegationCache(agent_ttls={
+        name: float(seconds)
+        for name, seconds in (entry.split("=", 1) for entry in delegation_ttls)
+    })
+
     # Create request handler
+    agent_executor = HostAgentExecutor(
+        response_cache=response_cache,
+        delegation_cache=delegation_cache,
+        status_interval=status_interval,
+        stream_partial=stream_partial,
+        model=model,
+        registry_file=registry_file,
+        mcp_config_file=mcp_config_file,
+        mcp_manifest_file=mcp_manifest_file,
+        session_db=None if session_db == "memory" else session_db
+    )
     request_handler = DefaultRequestHandler(
-        agent_executor=HostAgentExecutor(),
-        task_store=InMemoryTaskStore()
+        agent_executor=agent_executor,
+        task_store=task_store
     )
 
+    async def warm_up():
+        try:
+            await agent_executor.agent.warm_up()
+            print("Host agent is warm and ready")
+        except Exception as e:
+            # Not fatal: the first request retries initialization
+            print(f"Host agent warm-up failed: {e}")
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Warm up in the background so the server can answer /ready meanwhile
+        warm_up_task = asyncio.create_task(warm_up())
+        yield
+        # Stop a warm-up still running before tearing down what it uses
+        warm_up_task.cancel()
+        try:
+            await warm_up_task
+        except asyncio.CancelledError:
+            pass
+        # Close pooled delegation connections and the session spill file on shutdown
+        await agent_executor.agent.close()
+        # Flush batched task writes
+        if isinstance(task_store, SQLiteTaskStore):
+            await task_store.close()
+
+    async def readiness(request: Request) -> JSONResponse:
+        """Readiness probe: 200 once the agent is warm, 503 before"""
+        ready = agent_executor.agent.is_ready
+        return JSONResponse(
+            {"ready": ready},
+            status_code=200 if ready else 503
+        )
+
     # Build server app
     server = A2AStarletteApplication(
         agent_card=agent_card,
         http_handler=request_handler,
     )
 
+    # Spans of this process (kept for /traces, exported if OTLP is configured)
+    setup_tracing("host_agent")
+
+    return server.build(
+        lifespan=lifespan,
+        routes=[Route("/ready", readiness, methods=["GET"]), *telemetry_routes()],
+        middleware=[Middleware(TraceContextMiddleware)]
+    )
+
+
+@click.command()
+@click.option('--host', default='localhost', help='Host for the agent server')
+@click.option('--port', default=11000, type=int, help='Port for the agent server')
+@click.option(
+    '--task-db',
+    default=os.path.expanduser("~/.cache/mcp_a2a_project/host_agent_tasks.db"),
+    help='SQLite file for durable task storage (use "memory" to keep tasks in RAM only)'
+)
+@click.option(
+    '--session-db',
+    default=os.path.expanduser("~/.cache/mcp_a2a_project/host_agent_sessions.db"),
+    help='SQLite file idle sessions are moved to (use "memory" to drop them instead)'
+)
+@click.option(
+    '--llm-cache',
+    default='off',
+    help='Cache identical model calls: "off", "memory", or a SQLite file to persist them in'
+)
+@click.option(
+    '--delegation-ttl',
+    'delegation_ttls',
+    multiple=True,
+    help='AGENT=SECONDS: reuse results from an agent for that long (repeatable)'
+)
+@click.option(
+    '--status-interval',
+    default=1.0,
+    type=float,
+    help='Minimum seconds between two progress updates of a task'
+)
+@click.option(
+    '--stream-partial',
+    is_flag=True,
+    help='Stream the answer to clients as it is generated (artifact updates)'
+)
+@click.option('--workers', default=1, type=int, help='Number of worker processes')
+def main(
+    host: str,
+    port: int,
+    task_db: str,
+    session_db: str,
+    llm_cache: str,
+    delegation_ttls: tuple[str, ...],
+    status_interval: float,
+    stream_partial: bool,
+    workers: int
+):
+    """Main function to run the Host Agent"""
+    if workers > 1 and task_db == "memory":
+        raise click.BadParameter(
+            "multiple workers need a shared --task-db file",
+            param_hint="--task-db"
+        )
+    for entry in delegation_ttls:
+        name, _, seconds = entry.partition("=")
+        try:
+            valid = bool(name) and float(seconds) >= 0
+        except ValueError:
+            valid = False
+        if not valid:
+            raise click.BadParameter(
+                f"expected AGENT=SECONDS, got '{entry}'",
+                param_hint="--delegation-ttl"
+            )
+
     # Run the server
-    uvicorn.run(server.build(), host=host, port=port)
+    serve(
+        "agents.host_agent.__main__:build_app",
+        host=host,
+        port=port,
+        workers=workers,
+        shared_task_db=None if task_db == "memory" else task_db,
+        task_db=task_db,
+        shared_store=workers > 1,
+        session_db=session_db,
+        llm_cache=llm_cache,
+        delegation_ttls=delegation_ttls,
+        status_interval=status_interval,
+        stream_partial=stream_partial,
+    )
 
 
 if __name__ == "__main__":
@@ -1,32 +1,76 @@
-from typing import AsyncIterable
+import asyncio
+from typing import AsyncIterable, Awaitable, Callable, Optional
 from uuid import uuid4
 
 from utilities.a2a.agent_discovery import AgentDiscovery
-from utilities.a2a.agent_connector import AgentConnector
+from utilities.a2a.agent_connector import AgentConnector, StreamEvent, event_text
+from utilities.a2a.agent_client_pool import AgentClientPool
+from utilities.a2a.delegation_cache import DelegationCache
+from utilities.a2a.scatter_gather import scatter_gather
+from utilities.a2a.skill_router import SkillRouter, card_summary
 from utilities.common.file_loader import load_instructions_file
 
 from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk import Runner
+from google.adk.apps import App
 from google.adk.artifacts import InMemoryArtifactService
-from google.adk.sessions import InMemorySessionService
+from utilities.adk.bounded_session_service import BoundedSessionService
+from utilities.adk.llm_response_cache import LLMResponseCache
+from utilities.adk.tool_progress import ToolProgress
+from utilities.adk.event_text import partial_text
+from utilities.adk.telemetry_plugin import TelemetryPlugin
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.tool_context import ToolContext
 
 from google.genai import types
 
 from utilities.mcp.mcp_connect import MCPConnect
-from a2a.types import AgentCard
+from utilities.mcp.mcp_manifest_cache import MCPManifestCache
+from a2a.types import AgentCard, TaskArtifactUpdateEvent
 
 from dotenv import load_dotenv
 load_dotenv()
 
 
+# Receives (agent_name, event) for every event streamed by a delegated agent
+DelegationListener = Callable[[str, StreamEvent], Awaitable[None]]
+
+# Seconds a cancelled delegation waits for the remote task id it needs to
+# cancel the remote task
+CANCEL_WAIT = 10.0
+
+
 class HostAgent:
     """
     Orchestrator agent
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        response_cache: Optional[LLMResponseCache] = None,
+        delegation_cache: Optional[DelegationCache] = None,
+        stream_partial: bool = False,
+        model: str | BaseLlm = "gemini-2.5-flash",
+        registry_file: Optional[str] = None,
+        mcp_config_file: Optional[str] = None,
+        mcp_manifest_file: Optional[str] = None,
+        session_db: Optional[str] = None
+    ):
+        # Model name, or a model instance (e.g. the benchmark stub)
+        self.model = model
+
+        # Optional cache of model answers (opt-in)
+        self.response_cache = response_cache
+
+        # Stream the model's answer token by token (SSE mode)
+        self.stream_partial = stream_partial
+
+        # Coalesces identical delegations (and memoizes deterministic agents)
+        self.delegation_cache = delegation_cache or DelegationCache()
+
         # Load instructions
         self.system_instruction = load_instructions_file(
             "agents/host_agent/instructions.txt"
@@ -40,12 +84,28 @@ class HostAgent:
         self._user_id = "host_agent_user"
 
         # Services
-        self.agent_discovery = AgentDiscovery()
-        self.mcp_connector = MCPConnect()
+        self.agent_discovery = AgentDiscovery(registry_file=registry_file)
+        self.skill_router = SkillRouter(self.agent_discovery)
+        self.client_pool = AgentClientPool()
+        self.mcp_connector = MCPConnect(
+            config_file=mcp_config_file,
+            manifest_cache=MCPManifestCache(cache_file=mcp_manifest_file)
+        )
+        # Sessions in memory, spilled to the SQLite file `session_db` (if
+        # given) when idle or over budget
+        self.session_service = BoundedSessionService(spill_path=session_db)
+        self.session_service.export_metrics("host_agent")
 
-        # Will be built lazily
+        # Will be built lazily (or eagerly via warm_up)
         self._agent = None
         self._runner = None
+        self._init_lock = asyncio.Lock()
+
+        # Per-session receivers of streamed delegation events
+        self._delegation_listeners: dict[str, DelegationListener] = {}
+
+        # Remote cancellations still being sent
+        self._background: set[asyncio.Task] = set()
 
     # ---------------- TOOLS ---------------- #
 
@@ -53,25 +113,270 @@ class HostAgent:
         cards: list[AgentCard] = await self.agent_discovery.list_agent_cards()
         return [card.model_dump(exclude_none=True) for card in cards]
 
-    async def _delegate_task(self, agent_name: str, message: str) -> str:
-        cards = await self.agent_discovery.list_agent_cards()
-        matched = None
-
-        for card in cards:
-            if card.name.lower() == agent_name.lower():
-                matched = card
-                break
+    async def _delegate_task(
+        self,
+        agent_name: str,
+        message: str,
+        tool_context: ToolContext
+    ) -> str:
+        matched = await self.agent_discovery.get_agent_card(agent_name)
 
         if not matched:
             return f"Agent '{agent_name}' not found"
 
-        connector = AgentConnector(agent_card=matched)
+        try:
+            return await self._send_to_agent(
+                matched,
+                message,
+                self._delegation_listeners.get(tool_context.session.id)
+            )
+        except Exception as e:
+            return f"Delegation to '{agent_name}' failed: {e}"
+
+    async def _route_and_delegate(
+        self,
+        message: str,
+        tool_context: ToolContext
+    ) -> dict:
+        """
+        Delegate a task to the agent whose skills match it best, without
+        listing the agents first.
+
+        Args:
+            message: The task, phrased for the agent that will do it
+
+        Returns:
+            dict: {"agent_name", "skill", "response"} when an agent clearly
+                matches; otherwise {"error", "candidates"}, where candidates
+                summarize the closest agents for a _delegate_task call
+        """
+        matches = await self.skill_router.route(message)
+        best = self.skill_router.pick(matches)
+
+        if best is None:
+            cards = await self.agent_discovery.list_agent_cards()
+            closest = {match.agent_name for match in matches}
+            return {
+                "error": "No agent clearly matches this task; choose one and call _delegate_task",
+                "candidates": [
+                    card_summary(card) for card in cards
+                    if not closest or card.name in closest
+                ],
+            }
+
+        card = await self.agent_discovery.get_agent_card(best.agent_name)
+        try:
+            response = await self._send_to_agent(
+                card,
+                message,
+                self._delegation_listeners.get(tool_context.session.id)
+            )
+        except Exception as e:
+            return {
+                "agent_name": best.agent_name,
+                "error": f"Delegation to '{best.agent_name}' failed: {e}",
+            }
+
+        return {
+            "agent_name": best.agent_name,
+            "skill": best.skill,
+            "response": response,
+        }
+
+    async def _delegate_parallel(
+        self,
+        tasks: list[dict],
+        tool_context: ToolContext,
+        strategy: str = "all",
+        quorum: int = 1,
+        timeout_seconds: float = 120.0
+    ) -> dict:
+        """
+        Send sub-tasks to several agents at once and gather their answers.
+
+        Args:
+            tasks: List of {"agent_name": str, "message": str} sub-tasks
+            strategy: "all" (wait for every agent), "first" (first successful
+                answer wins) or "quorum" (stop after `quorum` successes)
+            quorum: Successful answers required by the "quorum" strategy
+            timeout_seconds: Time limit for each agent
+
+        Returns:
+            dict: Strategy outcome with one result per sub-task
+        """
+        listener = self._delegation_listeners.get(tool_context.session.id)
+        branches = []
+
+        for task in tasks:
+            agent_name = str(task.get("agent_name", ""))
+            message = str(task.get("message", ""))
+            matched = await self.agent_discovery.get_agent_card(agent_name)
+
+            if not matched:
+                branches.append((agent_name, self._agent_not_found(agent_name)))
+                continue
+
+            branches.append((
+                agent_name,
+                lambda card=matched, text=message: self._send_to_agent(
+                    card, text, listener
+                )
+            ))
+
+        try:
+            result = await scatter_gather(
+                branches,
+                strategy=strategy,
+                quorum=quorum,
+                timeout=timeout_seconds,
+            )
+        except ValueError as e:
+            return {"error": str(e)}
+
+        return result.to_dict()
+
+    @staticmethod
+    def _agent_not_found(agent_name: str):
+        async def fail():
+            raise LookupError(f"Agent '{agent_name}' not found")
+        return fail
+
+    async def _send_to_agent(
+        self,
+        card: AgentCard,
+        message: str,
+        listener: Optional[DelegationListener] = None
+    ) -> str:
+        """
+        Delegate through the delegation cache: identical in-flight requests
+        share one call (whose events reach every caller's listener), and
+        results of deterministic agents are reused.
+        """
+        return await self.delegation_cache.run(
+            card,
+            message,
+            lambda emit: self._send_uncached(card, message, emit),
+            listener=listener,
+        )
+
+    async def _send_uncached(
+        self,
+        card: AgentCard,
+        message: str,
+        listener: Optional[DelegationListener] = None
+    ) -> str:
+        connector = AgentConnector(agent_card=card, pool=self.client_pool)
+
+        # Streaming exposes the remote task id, so the task can be cancelled
+        if card.capabilities.streaming:
+            return await self._stream_delegation(
+                connector, message, listener
+            )
 
         return await connector.send_task(
             message=message,
             session_id=str(uuid4())
         )
 
+    async def _stream_delegation(
+        self,
+        connector: AgentConnector,
+        message: str,
+        listener: Optional[DelegationListener] = None
+    ) -> str:
+        """
+        Delegate over the streaming endpoint, relaying every event to the
+        session's listener (if any), and return the remote agent's final
+        text. If the delegation is cancelled, the remote task is cancelled too.
+        """
+        agent_name = connector.agent_card.name
+        status_text = ""
+        artifact_text = ""
+
+        # The stream is read by its own task, so a delegation cancelled
+        # before the remote task id arrives can still wait for it
+        events: asyncio.Queue = asyncio.Queue()
+        stream = asyncio.create_task(self._read_stream(connector, message, events))
+
+        try:
+            while (event := await events.get()) is not None:
+                if listener:
+                    await listener(agent_name, event)
+
+                text = event_text(event)
+                if isinstance(event, TaskArtifactUpdateEvent):
+                    artifact_text = artifact_text + text if event.append else text
+                elif text:
+                    status_text = text
+
+            # Raises the stream's error, if it failed
+            await stream
+        except asyncio.CancelledError:
+            self._cancel_remote(connector, stream, events)
+            raise
+        except Exception:
+            stream.cancel()
+            raise
+
+        return (
+            artifact_text or status_text or
+            "The agent processed your request but returned no text response."
+        )
+
+    @staticmethod
+    async def _read_stream(
+        connector: AgentConnector,
+        message: str,
+        events: asyncio.Queue
+    ):
+        """Queue the events of a streaming delegation, then None"""
+        try:
+            async for event in connector.stream_task(
+                message=message,
+                session_id=str(uuid4())
+            ):
+                events.put_nowait(event)
+        finally:
+            events.put_nowait(None)
+
+    def _cancel_remote(
+        self,
+        connector: AgentConnector,
+        stream: asyncio.Task,
+        events: asyncio.Queue
+    ):
+        """
+        Send an A2A cancel for the connector's remote task in the background
+        (the caller is being cancelled and cannot wait for it). If the
+        request is still in flight, first wait up to CANCEL_WAIT seconds for
+        the event that names the remote task.
+        """
+
+        async def wait_for_task_id():
+            while not connector.remote_task_id and await events.get() is not None:
+                pass
+
+        async def send_cancel():
+            try:
+                if not connector.remote_task_id:
+                    await asyncio.wait_for(wait_for_task_id(), timeout=CANCEL_WAIT)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                stream.cancel()
+
+            task_id = connector.remote_task_id
+            if not task_id:
+                return
+            try:
+                await connector.cancel_task(task_id)
+            except Exception as e:
+                print(f"Could not cancel remote task {task_id}: {e}")
+
+        task = asyncio.create_task(send_cancel())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
     # ---------------- BUILD ---------------- #
 
     async def _init_agent(self):
@@ -82,31 +387,97 @@ class HostAgent:
 
         self._agent = LlmAgent(
             name="host_agent",
-            model="gemini-2.5-flash",
+            model=self.model,
             instruction=self.system_instruction,
             description=self.description,
             tools=[
+                FunctionTool(self._route_and_delegate),
                 FunctionTool(self._delegate_task),
+                FunctionTool(self._delegate_parallel),
                 FunctionTool(self._list_agents),
                 *mcp_tools
-            ]
+            ],
+            **self._cache_callbacks(),
         )
 
         self._runner = Runner(
-            app_name=self._agent.name,
-            agent=self._agent,
+            # Model and tool calls are timed and traced by the plugin
+            app=App(
+                name=self._agent.name,
+                root_agent=self._agent,
+                plugins=[TelemetryPlugin()],
+            ),
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=self.session_service,
             memory_service=InMemoryMemoryService(),
         )
 
-    # ---------------- INVOKE ---------------- #
+    def _cache_callbacks(self) -> dict:
+        """
+        Model callbacks that serve repeated prompts from the response cache.
+        """
+        if not self.response_cache:
+            return {}
+        return {
+            "before_model_callback": self.response_cache.before_model,
+            "after_model_callback": self.response_cache.after_model,
+        }
+
+    @property
+    def is_ready(self) -> bool:
+        """True once the LLM agent, runner and MCP tools are built"""
+        return self._agent is not None and self._runner is not None
+
+    async def warm_up(self):
+        """
+        Build the agent if it is not built yet.
+
+        Concurrent callers share a single initialization: the first one
+        builds (and prefetches agent cards), the rest wait on the lock and
+        find the agent ready.
+        """
+        if self.is_ready:
+            return
+
+        async with self._init_lock:
+            if not self.is_ready:
+                # Prefetch agent cards while MCP tools load
+                await asyncio.gather(
+                    self._init_agent(),
+                    self.agent_discovery.list_agent_cards(),
+                )
+
+    async def close(self):
+        """Release pooled connections and files (called on server shutdown)"""
+        # Let pending remote cancellations go out first
+        if self._background:
+            await asyncio.wait(self._background, timeout=5)
+        await self.client_pool.aclose()
+        if self.response_cache:
+            await self.response_cache.close()
+        await self.session_service.close()
 
-    async def invoke(self, query: str, session_id: str) -> AsyncIterable[dict]:
+    # ---------------- INVOKE ---------------- #
 
-        # ✅ Lazy initialize async things
-        if self._agent is None or self._runner is None:
-            await self._init_agent()
+    async def invoke(
+        self,
+        query: str,
+        session_id: str,
+        on_delegation_event: Optional[DelegationListener] = None
+    ) -> AsyncIterable[dict]:
+        """
+        Streams responses from the agent.
+
+        Args:
+            query (str): User query
+            session_id (str): Session the query belongs to
+            on_delegation_event (DelegationListener, optional): Called with
+                each status/artifact event streamed back by agents that
+                `_delegate_task` hands work to during this query
+        """
+
+        # ✅ Lazy initialize async things (no-op once warmed up)
+        await self.warm_up()
 
         session = await self._runner.session_service.get_session(
             app_name=self._agent.name,
@@ -126,12 +497,44 @@ class HostAgent:
             parts=[types.Part.from_text(text=query)]
         )
 
+        if on_delegation_event:
+            self._delegation_listeners[session_id] = on_delegation_event
+
+        try:
+            async for item in self._run(user_content, session_id):
+                yield item
+        finally:
+            if on_delegation_event:
+                self._delegation_listeners.pop(session_id, None)
+
+    async def _run(
+        self,
+        user_content: types.Content,
+        session_id: str
+    ) -> AsyncIterable[dict]:
+        progress = ToolProgress()
+        run_config = (
+            RunConfig(streaming_mode=StreamingMode.SSE)
+            if self.stream_partial else None
+        )
+
         async for event in self._runner.run_async(
             user_id=self._user_id,
             session_id=session_id,
             new_message=user_content,
+            run_config=run_config,
         ):
-            if event.is_final_response:
+            # Streamed chunk of the answer being generated
+            if event.partial:
+                text = partial_text(event)
+                if text:
+                    yield {
+                        "is_task_complete": False,
+                        "partial": text
+                    }
+                continue
+
+            if event.is_final_response():
                 final_response = ""
 
                 if (
@@ -146,7 +549,10 @@ class HostAgent:
                     "content": final_response
                 }
             else:
-                yield {
-                    "is_task_complete": False,
-                    "updates": "agent is processing your request..."
-                } 
\ No newline at end of file
+                # Only report tool activity; other events carry no news
+                update = progress.describe(event)
+                if update:
+                    yield {
+                        "is_task_complete": False,
+                        "updates": update
+                    } 
\ No newline at end of file
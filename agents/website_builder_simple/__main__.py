@@ -1,18 +1,22 @@
-import uvicorn
+import os
+from contextlib import asynccontextmanager
 from a2a.types import AgentSkill, AgentCard, AgentCapabilities
 import click
 from a2a.server.request_handlers import DefaultRequestHandler
 
 from agents.website_builder_simple.agent_executor import WebsiteBuilderSimpleAgentExecutor
 from a2a.server.tasks import InMemoryTaskStore
+from utilities.a2a.sqlite_task_store import SQLiteTaskStore
+from utilities.a2a.multi_worker import serve
+from utilities.adk.llm_response_cache import LLMResponseCache
 from a2a.server.apps import A2AStarletteApplication
+from starlette.middleware import Middleware
+from utilities.common.telemetry import TraceContextMiddleware, setup_tracing, telemetry_routes
+from google.adk.models import BaseLlm
 
 
-@click.command()
-@click.option('--host', default='localhost', help='Host for the agent server')
-@click.option('--port', default=10000, type=int, help='Port for the agent server')
-def main(host: str, port: int):
-    """Main function to run the website builder"""
+def build_agent_card(host: str, port: int) -> AgentCard:
+    """The website builder's agent card"""
 
     # Define agent skill
     skill = AgentSkill(
@@ -37,21 +41,139 @@ def main(host: str, port: int):
         skills=[skill],
         capabilities=AgentCapabilities(streaming=True)
     )
+    return agent_card
+
+
+def build_app(
+    host: str,
+    port: int,
+    task_db: str,
+    shared_store: bool = False,
+    session_db: str = "memory",
+    llm_cache: str = "off",
+    status_interval: float = 1.0,
+    stream_partial: bool = False,
+    model: str | BaseLlm = "gemini-2.5-flash"
+):
+    """Builds the website builder server app (one per worker process)"""
+
+    agent_card = build_agent_card(host, port)
+
+    # Durable task storage (or in-memory when asked for)
+    if task_db == "memory":
+        task_store = InMemoryTaskStore()
+    else:
+        task_store = SQLiteTaskStore(task_db, shared=shared_store)
+
+    # Optional cache of model answers
+    response_cache = None
+    if llm_cache == "memory":
+        response_cache = LLMResponseCache()
+    elif llm_cache != "off":
+        response_cache = LLMResponseCache(cache_file=llm_cache)
 
     # Create request handler
+    agent_executor = WebsiteBuilderSimpleAgentExecutor(
+        response_cache=response_cache,
+        status_interval=status_interval,
+        stream_partial=stream_partial,
+        model=model,
+        session_db=None if session_db == "memory" else session_db
+    )
     request_handler = DefaultRequestHandler(
-        agent_executor=WebsiteBuilderSimpleAgentExecutor(),
-        task_store=InMemoryTaskStore()
+        agent_executor=agent_executor,
+        task_store=task_store
     )
 
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        # Close the session spill file
+        await agent_executor.agent.close()
+        # Flush batched task writes on shutdown
+        if isinstance(task_store, SQLiteTaskStore):
+            await task_store.close()
+        # Persist response cache hit counters
+        if response_cache:
+            await response_cache.close()
+
     # Build server app
     server = A2AStarletteApplication(
         agent_card=agent_card,
         http_handler=request_handler,
     )
 
+    # Spans of this process (kept for /traces, exported if OTLP is configured)
+    setup_tracing("website_builder_simple")
+
+    return server.build(
+        lifespan=lifespan,
+        routes=telemetry_routes(),
+        middleware=[Middleware(TraceContextMiddleware)]
+    )
+
+
+@click.command()
+@click.option('--host', default='localhost', help='Host for the agent server')
+@click.option('--port', default=10000, type=int, help='Port for the agent server')
+@click.option(
+    '--task-db',
+    default=os.path.expanduser("~/.cache/mcp_a2a_project/website_builder_simple_tasks.db"),
+    help='SQLite file for durable task storage (use "memory" to keep tasks in RAM only)'
+)
+@click.option(
+    '--session-db',
+    default=os.path.expanduser("~/.cache/mcp_a2a_project/website_builder_simple_sessions.db"),
+    help='SQLite file idle sessions are moved to (use "memory" to drop them instead)'
+)
+@click.option(
+    '--llm-cache',
+    default='off',
+    help='Cache identical model calls: "off", "memory", or a SQLite file to persist them in'
+)
+@click.option(
+    '--status-interval',
+    default=1.0,
+    type=float,
+    help='Minimum seconds between two progress updates of a task'
+)
+@click.option(
+    '--stream-partial',
+    is_flag=True,
+    help='Stream the answer to clients as it is generated (artifact updates)'
+)
+@click.option('--workers', default=1, type=int, help='Number of worker processes')
+def main(
+    host: str,
+    port: int,
+    task_db: str,
+    session_db: str,
+    llm_cache: str,
+    status_interval: float,
+    stream_partial: bool,
+    workers: int
+):
+    """Main function to run the website builder"""
+    if workers > 1 and task_db == "memory":
+        raise click.BadParameter(
+            "multiple workers need a shared --task-db file",
+            param_hint="--task-db"
+        )
+
     # Run the server
-    uvicorn.run(server.build(), host=host, port=port)
+    serve(
+        "agents.website_builder_simple.__main__:build_app",
+        host=host,
+        port=port,
+        workers=workers,
+        shared_task_db=None if task_db == "memory" else task_db,
+        task_db=task_db,
+        shared_store=workers > 1,
+        session_db=session_db,
+        llm_cache=llm_cache,
+        status_interval=status_interval,
+        stream_partial=stream_partial,
+    )
 
 
 if __name__ == "__main__":
@@ -1,10 +1,17 @@
-from typing import AsyncIterable
+from typing import AsyncIterable, Optional
 from utilities.common.file_loader import load_instructions_file
 from google.adk.agents import LlmAgent
+from google.adk.models import BaseLlm
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk import Runner
+from google.adk.apps import App
 
 from google.adk.artifacts import InMemoryArtifactService
-from google.adk.sessions import InMemorySessionService
+from utilities.adk.bounded_session_service import BoundedSessionService
+from utilities.adk.llm_response_cache import LLMResponseCache
+from utilities.adk.tool_progress import ToolProgress
+from utilities.adk.event_text import partial_text
+from utilities.adk.telemetry_plugin import TelemetryPlugin
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 
 from google.genai import types
@@ -16,7 +23,22 @@ class WebsiteBuilderSimple:
     web pages using Google's development framework.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        response_cache: Optional[LLMResponseCache] = None,
+        stream_partial: bool = False,
+        model: str | BaseLlm = "gemini-2.5-flash",
+        session_db: Optional[str] = None
+    ):
+        # Model name, or a model instance (e.g. the benchmark stub)
+        self.model = model
+
+        # Optional cache of model answers (opt-in)
+        self.response_cache = response_cache
+
+        # Stream the model's answer token by token (SSE mode)
+        self.stream_partial = stream_partial
+
         # Load system instructions (rules for the agent)
         self.system_instruction = load_instructions_file(
             "agents/website_builder_simple/instructions.txt"
@@ -33,26 +55,51 @@ class WebsiteBuilderSimple:
         # Unique ID for the user session
         self._user_id = "website_builder_simple_agent_user"
 
+        # Sessions in memory, spilled to the SQLite file `session_db` (if
+        # given) when idle or over budget
+        self.session_service = BoundedSessionService(spill_path=session_db)
+        self.session_service.export_metrics("website_builder_simple")
+
         # Create a Runner to manage sessions, memory, and artifacts
         self._runner = Runner(
-            app_name=self._agent.name,
-            agent=self._agent,
+            # Model and tool calls are timed and traced by the plugin
+            app=App(
+                name=self._agent.name,
+                root_agent=self._agent,
+                plugins=[TelemetryPlugin()],
+            ),
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=self.session_service,
             memory_service=InMemoryMemoryService(),
         )
 
+    async def close(self):
+        """Closes the session spill file (called on server shutdown)"""
+        await self.session_service.close()
+
     def _build_agent(self) -> LlmAgent:
         """
         Builds and returns the LLM agent configuration.
         """
         return LlmAgent(
             name="website_builder_simple",
-            model="gemini-2.5-flash",
+            model=self.model,
             instruction=self.system_instruction,
             description=self.description,
+            **self._cache_callbacks(),
         )
 
+    def _cache_callbacks(self) -> dict:
+        """
+        Model callbacks that serve repeated prompts from the response cache.
+        """
+        if not self.response_cache:
+            return {}
+        return {
+            "before_model_callback": self.response_cache.before_model,
+            "after_model_callback": self.response_cache.after_model,
+        }
+
     async def invoke(self, query: str, session_id: str) -> AsyncIterable[dict]:
         """
         Streams responses from the agent.
@@ -61,6 +108,7 @@ class WebsiteBuilderSimple:
         {
             'is_task_complete': bool,  # True if task is finished
             'updates': str,            # Progress updates (while working)
+            'partial': str,            # Streamed answer chunk (stream_partial)
             'content': str             # Final output (when done)
         }
         """
@@ -86,15 +134,31 @@ class WebsiteBuilderSimple:
             parts=[types.Part.from_text(text=query)]
         )
 
+        progress = ToolProgress()
+        run_config = (
+            RunConfig(streaming_mode=StreamingMode.SSE)
+            if self.stream_partial else None
+        )
+
         # Stream the model responses asynchronously
         async for event in self._runner.run_async(
             user_id=self._user_id,
             session_id=session_id,
             new_message=user_content,
+            run_config=run_config,
         ):
-            print_json_response(event, "=====NEW EVENT=====")
+            # Streamed chunk of the page being generated
+            if event.partial:
+                text = partial_text(event)
+                if text:
+                    yield {
+                        'is_task_complete': False,
+                        'partial': text
+                    }
+                continue
+
             # If this is the final response from the model
-            if event.is_final_response:
+            if event.is_final_response():
                 final_response = ""
 
                 # Extract text from the last part of the response
@@ -107,9 +171,11 @@ class WebsiteBuilderSimple:
                     'content': final_response
                 }
 
-            # If the agent is still processing
+            # If the agent is still processing, report tool activity
             else:
-                yield {
-                    'is_task_complete': False,
-                    'updates': "agent is processing your request.... "
-                }
\ No newline at end of file
+                update = progress.describe(event)
+                if update:
+                    yield {
+                        'is_task_complete': False,
+                        'updates': update
+                    }
\ No newline at end of file
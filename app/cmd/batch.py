@@ -0,0 +1,163 @@
+import sys
+import json
+import time
+import asyncio
+from typing import Any, Optional, TextIO
+from uuid import uuid4
+
+import asyncclick as click
+from a2a.client import A2ACardResolver
+
+from utilities.a2a.agent_client_pool import AgentClientPool
+from utilities.a2a.agent_connector import AgentConnector
+
+# Final task states that count as a failed prompt
+FAILED_STATES = {"failed", "rejected", "canceled"}
+
+
+def parse_prompt(line: str, number: int) -> Optional[tuple[Any, str]]:
+    """
+    Reads one input line: plain text, or a JSON object with a "prompt"
+    field and optionally an "id" to echo back.
+
+    Args:
+        line (str): Input line
+        number (int): Position of the prompt in the input, the default id
+
+    Returns:
+        tuple[Any, str] | None: (id, prompt), or None for a blank line
+    """
+    text = line.strip()
+    if not text:
+        return None
+
+    if text.startswith("{"):
+        try:
+            record = json.loads(text)
+        except json.JSONDecodeError:
+            record = None
+        if isinstance(record, dict) and "prompt" in record:
+            return record.get("id", number), str(record["prompt"])
+
+    return number, text
+
+
+async def run_batch(
+    connector: AgentConnector,
+    input_file: TextIO,
+    session_id: Optional[str],
+    concurrency: int
+) -> tuple[int, int]:
+    """
+    Sends every prompt of `input_file` with at most `concurrency` in flight
+    and prints one JSON line per prompt as soon as its answer arrives.
+    Input is read as it is needed, so it can be any length.
+
+    With a `session_id` every prompt is a turn of that one conversation;
+    without one each prompt starts a conversation of its own.
+
+    Returns:
+        tuple[int, int]: Number of prompts that succeeded and that failed
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    started = time.perf_counter()
+    outcome = {"ok": 0, "failed": 0}
+
+    async def read():
+        number = 0
+        try:
+            while line := await asyncio.to_thread(input_file.readline):
+                prompt = parse_prompt(line, number)
+                if prompt is not None:
+                    await queue.put(prompt)
+                    number += 1
+        finally:
+            for _ in range(concurrency):
+                await queue.put(None)
+
+    async def work():
+        while (item := await queue.get()) is not None:
+            prompt_id, prompt = item
+            sent = time.perf_counter()
+            record: dict[str, Any] = {"id": prompt_id, "prompt": prompt}
+
+            try:
+                result = await connector.send_task_result(
+                    message=prompt,
+                    session_id=session_id or uuid4().hex
+                )
+                record.update(
+                    ok=result.state not in FAILED_STATES,
+                    response=result.text,
+                    task_id=result.task_id,
+                    state=result.state,
+                )
+            except Exception as e:
+                record.update(ok=False, error=f"{type(e).__name__}: {e}")
+
+            record["start_ms"] = round((sent - started) * 1000, 1)
+            record["latency_ms"] = round((time.perf_counter() - sent) * 1000, 1)
+            outcome["ok" if record["ok"] else "failed"] += 1
+            print(json.dumps(record, ensure_ascii=False), flush=True)
+
+    await asyncio.gather(read(), *(work() for _ in range(concurrency)))
+    return outcome["ok"], outcome["failed"]
+
+
+@click.command("batch")
+@click.option(
+    "--input",
+    "input_file",
+    default="-",
+    type=click.File("r", encoding="utf-8"),
+    help='Prompts, one per line or JSON objects with a "prompt" field (default: stdin)'
+)
+@click.option("--concurrency", default=8, type=int, help="Prompts in flight at once")
+@click.option("--timeout", default=300.0, type=float, help="Seconds before a prompt times out")
+@click.pass_context
+async def batch(ctx: click.Context, input_file: TextIO, concurrency: int, timeout: float):
+    """
+    Send prompts from a file or stdin concurrently and print the answers as JSON lines
+    """
+    if concurrency < 1:
+        raise click.BadParameter("must be at least 1", param_hint="--concurrency")
+
+    agent = ctx.obj["agent"].rstrip("/")
+    session = ctx.obj["session"]
+    # Without --session the prompts are independent conversations
+    session_id = None if str(session) == "0" else session
+
+    pool = AgentClientPool(
+        max_connections_per_host=concurrency,
+        max_keepalive_per_host=concurrency,
+        timeout=timeout,
+    )
+    try:
+        # Resolve the agent card once for the whole batch
+        try:
+            card = await A2ACardResolver(
+                base_url=agent,
+                httpx_client=pool.get_httpx_client(agent)
+            ).get_agent_card()
+        except Exception as e:
+            print(f"Error resolving agent: {e}", file=sys.stderr)
+            raise SystemExit(1)
+
+        started = time.perf_counter()
+        succeeded, failed = await run_batch(
+            AgentConnector(card, pool=pool),
+            input_file,
+            session_id,
+            concurrency,
+        )
+    finally:
+        await pool.aclose()
+
+    # Stdout carries only the results
+    print(
+        f"{succeeded + failed} prompts to {card.name}: {succeeded} ok, {failed} failed "
+        f"in {time.perf_counter() - started:.2f}s",
+        file=sys.stderr,
+    )
+    if failed:
+        raise SystemExit(1)
@@ -1,21 +1,47 @@
+import time
 import asyncio
 from uuid import uuid4
 from a2a.types import AgentCard
 from a2a.client import A2ACardResolver
 import asyncclick as click
 import httpx
+from rich.console import Console
 
+from app.cmd.batch import batch
+from app.cmd.load_test import load_test
+from app.cmd.stream_view import stream_turn
 from utilities.a2a.agent_connector import AgentConnector
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option("--agent", default="http://localhost:11000", help="Base URL of the agent")
 @click.option("--session", default="0", help="Session ID (use 0 to generate a new one)")
-async def cli(agent: str, session: str):
+@click.option(
+    "--stream/--no-stream",
+    default=True,
+    help="Show the agent's progress and partial answers live (if the agent supports streaming)"
+)
+@click.pass_context
+async def cli(ctx: click.Context, agent: str, session: str, stream: bool):
     """
     CLI to send user messages to an A2A agent using an A2A client
     and display the responses
     """
+    ctx.obj = {"agent": agent, "session": session}
+
+    # Interactive session unless a subcommand was given
+    if ctx.invoked_subcommand is None:
+        await interactive(agent, session, stream)
+
+
+cli.add_command(batch)
+cli.add_command(load_test)
+
+
+async def interactive(agent: str, session: str, stream: bool = True):
+    """
+    Prompts for messages and prints the agent's answers until ':q'
+    """
 
     # ✅ Correct session ID logic
     session_id = uuid4().hex if str(session) == "0" else session
@@ -35,6 +61,11 @@ async def cli(agent: str, session: str):
             return
 
         connector = AgentConnector(card)
+        console = Console()
+
+        stream = stream and bool(card.capabilities.streaming)
+        if not stream:
+            print("Waiting for complete answers (streaming is off or unsupported by the agent)")
 
         while True:
             try:
@@ -46,7 +77,19 @@ async def cli(agent: str, session: str):
                 if prompt.strip().lower() in ["quit", ":q"]:
                     break
 
+                # Render progress and partial text as the agent streams them
+                if stream:
+                    await stream_turn(
+                        console,
+                        connector,
+                        message=prompt,
+                        session_id=session_id,
+                        httpx_client=httpx_client
+                    )
+                    continue
+
                 # ✅ Send task using shared client
+                started = time.perf_counter()
                 result = await connector.send_task(
                     message=prompt,
                     session_id=session_id,
@@ -55,6 +98,7 @@ async def cli(agent: str, session: str):
 
                 # ✅ Print result
                 print(f"\nAgent Response:\n{result}")
+                print(f"total {time.perf_counter() - started:.2f}s")
 
             except click.Abort:
                 break
@@ -0,0 +1,462 @@
+import json
+import math
+import time
+import random
+import asyncio
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+from uuid import uuid4
+
+import asyncclick as click
+from a2a.client import A2ACardResolver
+
+from app.cmd.batch import FAILED_STATES
+from benchmarks.stats import percentile
+from utilities.a2a.agent_client_pool import AgentClientPool
+from utilities.a2a.agent_connector import AgentConnector
+from utilities.common.telemetry import DEFAULT_BUCKETS
+
+# Percentiles shown in the report
+REPORT_PERCENTILES = (50, 90, 95, 99)
+
+
+# ---------------- SETTINGS & RESULTS ---------------- #
+
+@dataclass
+class LoadTestSettings:
+    """
+    Shape of a load test.
+
+    Attributes:
+        sessions (int): Virtual sessions (requests in flight at most)
+        requests (int): Measured requests to send, 0 for no limit
+        duration (float): Seconds to measure for after the warm-up, 0 for no limit
+        rate (float): Open loop: new requests per second regardless of answers.
+            0 runs a closed loop, where each session sends its next prompt
+            once the previous answer arrived
+        arrival (str): Open loop spacing of requests, "constant" or "poisson"
+        ramp_up (float): Seconds over which sessions start (closed loop) or
+            the arrival rate rises linearly to `rate` (open loop)
+        warmup (float): Seconds from the start whose requests are not measured
+        think_time (float): Closed loop pause between an answer and the
+            session's next prompt
+    """
+    sessions: int = 10
+    requests: int = 100
+    duration: float = 0.0
+    rate: float = 0.0
+    arrival: str = "poisson"
+    ramp_up: float = 0.0
+    warmup: float = 0.0
+    think_time: float = 0.0
+
+    @property
+    def mode(self) -> str:
+        return "open" if self.rate > 0 else "closed"
+
+
+@dataclass
+class RequestResult:
+    """
+    One request of a load test.
+
+    Attributes:
+        start (float): Seconds since the test started that the request was
+            due (open loop) or sent (closed loop)
+        latency (float): Seconds from `start` to the answer
+        error (str, optional): Error class and message, or the final task
+            state, if the request failed
+        warmup (bool): Sent during the warm-up, so not measured
+    """
+    start: float
+    latency: float
+    error: Optional[str] = None
+    warmup: bool = False
+
+
+@dataclass
+class LoadTestReport:
+    """
+    Measured outcome of a load test.
+
+    Attributes:
+        settings (LoadTestSettings): Shape of the test
+        latencies (list[float]): Seconds taken by each successful request
+        errors (Counter): Failed requests per error
+        elapsed (float): Wall-clock seconds of the measured phase
+        warmup_requests (int): Requests sent during the warm-up
+    """
+    settings: LoadTestSettings
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+    warmup_requests: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second of the measured phase"""
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def histogram(self) -> list[tuple[str, int]]:
+        """
+        Successful requests per latency bucket, from the first to the last
+        non-empty bucket.
+
+        Returns:
+            list[tuple[str, int]]: (upper bound in seconds or "+Inf", count)
+        """
+        counts = [0] * (len(DEFAULT_BUCKETS) + 1)
+        for latency in self.latencies:
+            counts[bisect_left(DEFAULT_BUCKETS, latency)] += 1
+
+        used = [index for index, count in enumerate(counts) if count]
+        if not used:
+            return []
+
+        bounds = [str(bound) for bound in DEFAULT_BUCKETS] + ["+Inf"]
+        return [(bounds[index], counts[index]) for index in range(used[0], used[-1] + 1)]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "settings": {**asdict(self.settings), "mode": self.settings.mode},
+            "requests": self.total,
+            "succeeded": len(self.latencies),
+            "failed": sum(self.errors.values()),
+            "warmup_requests": self.warmup_requests,
+            "elapsed_s": self.elapsed,
+            "throughput_rps": self.throughput,
+            "latency_ms": {
+                "mean": sum(self.latencies) / len(self.latencies) * 1000 if self.latencies else None,
+                **{
+                    f"p{q}": percentile(self.latencies, q) * 1000 if self.latencies else None
+                    for q in REPORT_PERCENTILES
+                },
+                "max": max(self.latencies) * 1000 if self.latencies else None,
+            },
+            "histogram": [{"le": bound, "count": count} for bound, count in self.histogram()],
+            "errors": dict(self.errors.most_common()),
+        }
+
+    def render(self) -> str:
+        """Text report"""
+        settings = self.settings
+        failed = sum(self.errors.values())
+        lines = [
+            f"Mode: {settings.mode} loop, {settings.sessions} sessions"
+            + (f", {settings.rate:g} req/s ({settings.arrival})" if settings.mode == "open" else ""),
+            f"Requests: {self.total} measured ({len(self.latencies)} ok, {failed} failed), "
+            f"{self.warmup_requests} warm-up",
+            f"Elapsed: {self.elapsed:.2f}s, throughput: {self.throughput:.2f} req/s",
+        ]
+
+        if self.latencies:
+            summary = ", ".join(
+                f"p{q} {percentile(self.latencies, q) * 1000:.1f}" for q in REPORT_PERCENTILES
+            )
+            mean = sum(self.latencies) / len(self.latencies) * 1000
+            lines.append(
+                f"Latency (ms): mean {mean:.1f}, {summary}, max {max(self.latencies) * 1000:.1f}"
+            )
+
+            histogram = self.histogram()
+            widest = max(count for _, count in histogram)
+            lines.append("\nLatency histogram:")
+            for bound, count in histogram:
+                label = "+Inf" if bound == "+Inf" else f"{float(bound) * 1000:g} ms"
+                bar = "█" * math.ceil(40 * count / widest) if count else ""
+                lines.append(f"  <= {label:>9} | {bar:<40} {count}")
+
+        if self.errors:
+            lines.append("\nErrors:")
+            for error, count in self.errors.most_common():
+                lines.append(f"  {count:>6}  {error}")
+
+        return "\n".join(lines)
+
+
+def _error_key(error: BaseException) -> str:
+    message = str(error).strip().splitlines()
+    return f"{type(error).__name__}: {message[0][:120]}" if message else type(error).__name__
+
+
+# ---------------- LOAD TEST ---------------- #
+
+class LoadTest:
+    """
+    Puts load on an A2A agent through an AgentConnector from a number of
+    virtual sessions, which share the connector's pooled HTTP client.
+
+    In the open loop, latency is measured from when a request was due, so
+    time spent waiting for a free session counts: an overloaded agent shows
+    up as growing latency rather than as a lower request rate.
+    """
+
+    def __init__(
+        self,
+        connector: AgentConnector,
+        prompts: list[str],
+        settings: LoadTestSettings
+    ):
+        if not prompts:
+            raise ValueError("A load test needs at least one prompt")
+
+        self.connector = connector
+        self.prompts = prompts
+        self.settings = settings
+
+        self._started = 0.0
+        self._issued = 0
+        self._measured = 0
+        self._results: list[RequestResult] = []
+
+    def _clock(self) -> float:
+        return time.perf_counter() - self._started
+
+    def _next_prompt(self, now: float) -> Optional[tuple[str, bool]]:
+        """
+        Prompt for a request due at `now` and whether it falls in the
+        warm-up, or None once the test is over
+        """
+        settings = self.settings
+        warmup = now < settings.warmup
+
+        if not warmup:
+            if settings.requests and self._measured >= settings.requests:
+                return None
+            if settings.duration and now >= settings.warmup + settings.duration:
+                return None
+            self._measured += 1
+
+        prompt = self.prompts[self._issued % len(self.prompts)]
+        self._issued += 1
+        return prompt, warmup
+
+    async def _send(self, session_id: str, prompt: str, start: float, warmup: bool):
+        error = None
+        try:
+            result = await self.connector.send_task_result(message=prompt, session_id=session_id)
+            if result.state in FAILED_STATES:
+                error = f"task {result.state}"
+        except Exception as e:
+            error = _error_key(e)
+
+        self._results.append(
+            RequestResult(start=start, latency=self._clock() - start, error=error, warmup=warmup)
+        )
+
+    # ---------------- CLOSED LOOP ---------------- #
+
+    async def _session(self, index: int):
+        settings = self.settings
+        session_id = uuid4().hex
+
+        await asyncio.sleep(index * settings.ramp_up / settings.sessions)
+        while (request := self._next_prompt(self._clock())) is not None:
+            prompt, warmup = request
+            await self._send(session_id, prompt, self._clock(), warmup)
+            if settings.think_time:
+                await asyncio.sleep(settings.think_time)
+
+    # ---------------- OPEN LOOP ---------------- #
+
+    def _arrival_time(self, arrivals: float) -> float:
+        """
+        Seconds since the start at which `arrivals` requests are due, with
+        the rate rising linearly over the ramp-up
+        """
+        rate, ramp_up = self.settings.rate, self.settings.ramp_up
+        during_ramp_up = rate * ramp_up / 2
+        if arrivals < during_ramp_up:
+            return math.sqrt(2 * ramp_up * arrivals / rate)
+        return ramp_up + (arrivals - during_ramp_up) / rate
+
+    async def _open_loop(self):
+        settings = self.settings
+        # Idle sessions: a request waits for one, so a conversation never
+        # has two turns in flight
+        idle: asyncio.Queue = asyncio.Queue()
+        for _ in range(settings.sessions):
+            idle.put_nowait(uuid4().hex)
+
+        async def request(prompt: str, due: float, warmup: bool):
+            session_id = await idle.get()
+            try:
+                await self._send(session_id, prompt, due, warmup)
+            finally:
+                idle.put_nowait(session_id)
+
+        tasks = []
+        arrivals = 0.0
+        while True:
+            due = self._arrival_time(arrivals)
+            delay = due - self._clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            next_request = self._next_prompt(due)
+            if next_request is None:
+                break
+
+            prompt, warmup = next_request
+            tasks.append(asyncio.create_task(request(prompt, due, warmup)))
+            arrivals += random.expovariate(1.0) if settings.arrival == "poisson" else 1.0
+
+        await asyncio.gather(*tasks)
+
+    async def run(self) -> LoadTestReport:
+        """
+        Runs the test until the measured request count or duration is
+        reached, then waits for the requests in flight.
+
+        Returns:
+            LoadTestReport: Outcome of the measured requests
+        """
+        self._started = time.perf_counter()
+        self._issued = self._measured = 0
+        self._results = []
+
+        if self.settings.mode == "open":
+            await self._open_loop()
+        else:
+            await asyncio.gather(*(self._session(index) for index in range(self.settings.sessions)))
+
+        report = LoadTestReport(settings=self.settings)
+        measured = [result for result in self._results if not result.warmup]
+        report.warmup_requests = len(self._results) - len(measured)
+
+        for result in measured:
+            if result.error:
+                report.errors[result.error] += 1
+            else:
+                report.latencies.append(result.latency)
+
+        if measured:
+            first = min(result.start for result in measured)
+            last = max(result.start + result.latency for result in measured)
+            report.elapsed = last - first
+        return report
+
+
+def load_prompts(path: str) -> list[str]:
+    """
+    Reads one prompt per line, skipping blank lines and # comments.
+    """
+    with open(path, encoding="utf-8") as file:
+        return [
+            line.strip() for line in file
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+# ---------------- COMMAND ---------------- #
+
+@click.command("loadtest")
+@click.option(
+    "--prompts",
+    "prompts_file",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="File with one prompt per line (used round-robin)"
+)
+@click.option("--sessions", default=10, type=int, help="Virtual sessions (requests in flight at most)")
+@click.option("--requests", default=100, type=int, help="Measured requests to send (0: no limit)")
+@click.option("--duration", default=0.0, type=float, help="Seconds to measure for (0: no limit)")
+@click.option(
+    "--rate",
+    default=0.0,
+    type=float,
+    help="Open loop: requests per second regardless of answers (0: closed loop)"
+)
+@click.option(
+    "--arrival",
+    default="poisson",
+    type=click.Choice(["poisson", "constant"]),
+    help="Open loop spacing of requests"
+)
+@click.option(
+    "--ramp-up",
+    default=0.0,
+    type=float,
+    help="Seconds over which sessions start, or the rate rises to --rate"
+)
+@click.option("--warmup", default=0.0, type=float, help="Seconds from the start not measured")
+@click.option("--think-time", default=0.0, type=float, help="Closed loop pause between requests of a session")
+@click.option("--timeout", default=300.0, type=float, help="Seconds before a request times out")
+@click.option("--output", default=None, help="Write the report as JSON to this file")
+@click.pass_context
+async def load_test(
+    ctx: click.Context,
+    prompts_file: str,
+    sessions: int,
+    requests: int,
+    duration: float,
+    rate: float,
+    arrival: str,
+    ramp_up: float,
+    warmup: float,
+    think_time: float,
+    timeout: float,
+    output: Optional[str]
+):
+    """
+    Put concurrent load on the agent and report latency, errors and throughput
+    """
+    if sessions < 1:
+        raise click.BadParameter("must be at least 1", param_hint="--sessions")
+    if not requests and not duration:
+        raise click.UsageError("Set --requests or --duration, or the test never ends")
+
+    prompts = load_prompts(prompts_file)
+    if not prompts:
+        raise click.BadParameter(f"no prompts in {prompts_file}", param_hint="--prompts")
+
+    settings = LoadTestSettings(
+        sessions=sessions,
+        requests=requests,
+        duration=duration,
+        rate=rate,
+        arrival=arrival,
+        ramp_up=ramp_up,
+        warmup=warmup,
+        think_time=think_time,
+    )
+
+    agent = ctx.obj["agent"].rstrip("/")
+    pool = AgentClientPool(
+        max_connections_per_host=sessions,
+        max_keepalive_per_host=sessions,
+        timeout=timeout,
+    )
+    try:
+        try:
+            card = await A2ACardResolver(
+                base_url=agent,
+                httpx_client=pool.get_httpx_client(agent)
+            ).get_agent_card()
+        except Exception as e:
+            print(f"Error resolving agent: {e}")
+            raise SystemExit(1)
+
+        print(
+            f"Load testing {card.name} at {agent}: {settings.mode} loop, "
+            f"{sessions} sessions, {len(prompts)} prompts"
+        )
+        report = await LoadTest(AgentConnector(card, pool=pool), prompts, settings).run()
+    finally:
+        await pool.aclose()
+
+    print(f"\n{report.render()}")
+
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(report.to_dict(), file, indent=2)
+        print(f"\nReport written to {output}")
+
+    if not report.latencies:
+        raise SystemExit(1)
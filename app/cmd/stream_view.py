@@ -0,0 +1,155 @@
+import time
+from typing import Optional
+
+import httpx
+from a2a.types import (
+    Message,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatusUpdateEvent,
+)
+from rich.console import Console, Group
+from rich.live import Live
+from rich.spinner import Spinner
+from rich.text import Text
+
+from utilities.a2a.agent_connector import AgentConnector, StreamEvent, event_text
+
+# States after which the agent sends nothing more for the turn
+FINAL_STATES = {
+    TaskState.completed,
+    TaskState.failed,
+    TaskState.canceled,
+    TaskState.rejected,
+    TaskState.input_required,
+    TaskState.auth_required,
+}
+
+
+class StreamedTurn:
+    """
+    What has arrived so far for one streamed prompt: the task's latest
+    state and progress message, the text of each artifact, the final
+    answer, and when each happened.
+
+    Renders (with rich) as the tail of the streamed text above a spinner
+    with the current status.
+    """
+
+    def __init__(self, max_lines: int = 20):
+        self.max_lines = max_lines
+        self.started = time.perf_counter()
+
+        # Seconds since the prompt was sent
+        self.first_event: Optional[float] = None
+        self.first_text: Optional[float] = None
+        self.total: Optional[float] = None
+
+        self.state = TaskState.submitted
+        self.progress = ""
+        # artifact id -> text streamed so far
+        self.artifacts: dict[str, str] = {}
+        self.answer: Optional[str] = None
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def text(self) -> str:
+        """Text of all artifacts"""
+        return "\n\n".join(text for text in self.artifacts.values() if text)
+
+    def update(self, event: StreamEvent):
+        """
+        Applies an event streamed by the agent.
+        """
+        if self.first_event is None:
+            self.first_event = self._elapsed()
+
+        if isinstance(event, TaskArtifactUpdateEvent):
+            artifact_id = event.artifact.artifact_id
+            text = event_text(event)
+            if event.append:
+                self.artifacts[artifact_id] = self.artifacts.get(artifact_id, "") + text
+            else:
+                self.artifacts[artifact_id] = text
+            if text and self.first_text is None:
+                self.first_text = self._elapsed()
+
+        elif isinstance(event, (Task, TaskStatusUpdateEvent)):
+            self.state = event.status.state
+            text = event_text(event)
+            if self.state in FINAL_STATES:
+                self.answer = text
+                self.progress = ""
+            elif text:
+                self.progress = text
+
+        elif isinstance(event, Message):
+            self.state = TaskState.completed
+            self.answer = event_text(event)
+
+    def finish(self):
+        """Marks the end of the stream"""
+        self.total = self._elapsed()
+
+    def timings(self) -> str:
+        """e.g. "completed · first event 0.12s · first text 0.80s · total 3.41s" """
+        parts = [self.state.value]
+        if self.first_event is not None:
+            parts.append(f"first event {self.first_event:.2f}s")
+        if self.first_text is not None:
+            parts.append(f"first text {self.first_text:.2f}s")
+        parts.append(f"total {self.total if self.total is not None else self._elapsed():.2f}s")
+        return " · ".join(parts)
+
+    def __rich__(self) -> Group:
+        tail = self.text.splitlines()[-self.max_lines:]
+        status = f"{self.state.value} {self.progress}".strip()
+        return Group(
+            Text("\n".join(tail)),
+            Spinner("dots", text=Text(f"{status} ({self._elapsed():.1f}s)", style="cyan")),
+        )
+
+
+async def stream_turn(
+    console: Console,
+    connector: AgentConnector,
+    message: str,
+    session_id: str,
+    httpx_client: httpx.AsyncClient | None = None
+) -> StreamedTurn:
+    """
+    Sends `message` over the agent's streaming endpoint, rendering progress
+    and partial text live, then prints the complete answer and timings.
+
+    Returns:
+        StreamedTurn: Everything received for the prompt
+    """
+    turn = StreamedTurn(max_lines=max(console.height - 4, 5))
+
+    # Redrawn from `turn` on every refresh; transient, as the complete
+    # text is printed once the stream ends
+    with Live(turn, console=console, refresh_per_second=12, transient=True):
+        try:
+            async for event in connector.stream_task(
+                message=message,
+                session_id=session_id,
+                httpx_client=httpx_client
+            ):
+                turn.update(event)
+        finally:
+            turn.finish()
+
+    console.print("\nAgent Response:")
+    text = turn.text
+    if text:
+        console.print(text, markup=False, highlight=False, soft_wrap=True)
+    if turn.answer and turn.answer.strip() not in text:
+        console.print(turn.answer, markup=False, highlight=False, soft_wrap=True)
+    if not text and not turn.answer:
+        console.print("The agent finished without a text response.")
+
+    console.print(turn.timings(), style="dim", markup=False, highlight=False)
+    return turn
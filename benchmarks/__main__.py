@@ -0,0 +1,154 @@
+import io
+import os
+import sys
+import asyncio
+import logging
+import contextlib
+from dataclasses import asdict
+
+import click
+from rich.console import Console
+
+from benchmarks.harness import STAGES, BenchmarkSettings, OrchestrationBenchmark
+from benchmarks.stats import StageResult, compare_to_baseline, print_report, save_results
+
+
+@contextlib.contextmanager
+def _silenced():
+    """
+    Discards stdout, logging and stderr, including the stderr of MCP server
+    subprocesses (which inherit the file descriptor).
+    """
+    sys.stderr.flush()
+    saved_stderr = os.dup(2)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 2)
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+        os.dup2(saved_stderr, 2)
+        os.close(saved_stderr)
+        os.close(devnull)
+
+
+async def run_benchmark(
+    settings: BenchmarkSettings,
+    stages: tuple[str, ...]
+) -> list[StageResult]:
+    benchmark = OrchestrationBenchmark(settings)
+    try:
+        await benchmark.start()
+        return await benchmark.run(stages)
+    finally:
+        await benchmark.stop()
+
+
+@click.command()
+@click.option('--requests', default=50, type=int, help='Timed operations per stage')
+@click.option('--concurrency', default=4, type=int, help='Operations in flight at once')
+@click.option('--warmup', default=3, type=int, help='Untimed operations before each stage')
+@click.option(
+    '--mcp-loads',
+    default=10,
+    type=int,
+    help='Timed MCP tool loads (run one at a time: each starts a server process)'
+)
+@click.option(
+    '--model-latency',
+    default=0.0,
+    type=float,
+    help='Seconds the stub model waits before each answer'
+)
+@click.option('--chunks', default=8, type=int, help='Chunks each streamed stub answer is split into')
+@click.option('--chunk-delay', default=0.0, type=float, help='Seconds between two streamed chunks')
+@click.option(
+    '--stage',
+    'stages',
+    multiple=True,
+    type=click.Choice(STAGES),
+    help='Stage to run (repeatable, default: all)'
+)
+@click.option('--output', default=None, help='Write the results as JSON to this file')
+@click.option(
+    '--baseline',
+    default=None,
+    type=click.Path(exists=True, dir_okay=False),
+    help='JSON results of an earlier run; exit with status 1 on regressions'
+)
+@click.option(
+    '--tolerance',
+    default=0.25,
+    type=float,
+    help='Relative p95 increase over the baseline counted as a regression'
+)
+@click.option(
+    '--min-delta-ms',
+    default=5.0,
+    type=float,
+    help='Smallest absolute p95 increase (ms) counted as a regression'
+)
+@click.option('--verbose', is_flag=True, help='Show the output and logs of the agents and MCP servers')
+def main(
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    mcp_loads: int,
+    model_latency: float,
+    chunks: int,
+    chunk_delay: float,
+    stages: tuple[str, ...],
+    output: str,
+    baseline: str,
+    tolerance: float,
+    min_delta_ms: float,
+    verbose: bool
+):
+    """
+    Offline latency/throughput benchmark of the orchestration stack,
+    with stub models in place of Gemini
+    """
+    settings = BenchmarkSettings(
+        requests=requests,
+        concurrency=concurrency,
+        warmup=warmup,
+        mcp_loads=mcp_loads,
+        model_latency=model_latency,
+        chunks=chunks,
+        chunk_delay=chunk_delay,
+    )
+
+    # The agents, servers and MCP clients print and log progress (and
+    # teardown noise when the loop closes); keep the report readable
+    with contextlib.nullcontext() if verbose else _silenced():
+        results = asyncio.run(run_benchmark(settings, stages or STAGES))
+    print_report(results)
+
+    if output:
+        save_results(results, output, asdict(settings))
+        print(f"Results written to {output}")
+
+    failed = any(result.errors for result in results)
+
+    if baseline:
+        regressions = compare_to_baseline(
+            results,
+            baseline,
+            tolerance=tolerance,
+            min_delta=min_delta_ms / 1000
+        )
+        console = Console()
+        for regression in regressions:
+            console.print(f"[bold red]Regression[/bold red] {regression}")
+        if not regressions:
+            console.print(f"[green]No regressions against {baseline}[/green]")
+        failed = failed or bool(regressions)
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+import gc
+import os
+import sys
+import json
+import time
+import runpy
+import asyncio
+import tempfile
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+from uuid import uuid4
+
+import httpx
+import uvicorn
+from starlette.applications import Starlette
+from a2a.client import A2ACardResolver
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import AgentCard, Message, MessageSendParams, Part, Role, TextPart
+
+from agents.host_agent.__main__ import build_app as build_host_app
+from agents.website_builder_simple.__main__ import build_app as build_website_builder_app
+from agents.website_builder_simple.agent import WebsiteBuilderSimple
+from agents.website_builder_simple.agent_executor import WebsiteBuilderSimpleAgentExecutor
+from benchmarks.stats import StageResult
+from benchmarks.stub_llm import StubLlm, StubStep
+from utilities.a2a.agent_client_pool import AgentClientPool
+from utilities.a2a.agent_connector import AgentConnector
+from utilities.a2a.agent_discovery import AgentDiscovery
+from utilities.a2a.multi_worker import _free_port
+from utilities.mcp.mcp_connect import MCPConnect
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TERMINAL_SERVER = os.path.join(REPO_ROOT, "mcp", "servers", "terminal_server", "terminal_server.py")
+ARITHMETIC_SERVER = os.path.join(REPO_ROOT, "mcp", "servers", "streamable_http_server.py")
+
+# Marker the stub website builder puts in every page, checked end to end
+PAGE_MARKER = "stub-page"
+
+STAGES = (
+    "discovery",
+    "mcp_load",
+    "delegation_hop",
+    "delegation_stream",
+    "executor_events",
+    "host_round_trip",
+)
+
+# Operation timed by a stage: gets the request number, may return extra
+# samples keyed by part name (reported as "stage/part")
+Operation = Callable[[int], Awaitable[Optional[dict[str, list[float]]]]]
+
+
+@dataclass
+class BenchmarkSettings:
+    """
+    Attributes:
+        requests (int): Timed operations per stage
+        concurrency (int): Operations in flight at once
+        warmup (int): Untimed operations run before each stage
+        mcp_loads (int): Timed operations of the (slow) MCP tool load stage
+        model_latency (float): Seconds the stub model waits before answering
+        chunks (int): Partial chunks of each streamed stub answer
+        chunk_delay (float): Seconds between two streamed chunks
+    """
+    requests: int = 50
+    concurrency: int = 4
+    warmup: int = 3
+    mcp_loads: int = 10
+    model_latency: float = 0.0
+    chunks: int = 8
+    chunk_delay: float = 0.0
+
+
+def website_builder_model(settings: BenchmarkSettings) -> StubLlm:
+    """Stub model of website_builder_simple: answers with a small page"""
+    return StubLlm(
+        script=[StubStep(
+            text=(
+                f"<html><head><title>{PAGE_MARKER}</title></head>"
+                "<body><h1>{query}</h1><p>Generated by the benchmark stub model.</p>"
+                "</body></html>"
+            )
+        )],
+        latency=settings.model_latency,
+        chunks=settings.chunks,
+        chunk_delay=settings.chunk_delay,
+    )
+
+
+def host_model(settings: BenchmarkSettings) -> StubLlm:
+    """
+    Stub model of the host agent: calls an MCP tool, delegates the query to
+    website_builder_simple and answers with what came back.
+    """
+    return StubLlm(
+        script=[
+            StubStep(tool="add_numbers", args={"input": {"a": 1, "b": 2}}),
+            StubStep(
+                tool="_delegate_task",
+                args={"agent_name": "website_builder_simple", "message": "{query}"}
+            ),
+            StubStep(text="{result}"),
+        ],
+        latency=settings.model_latency,
+    )
+
+
+async def run_stage(
+    name: str,
+    operation: Operation,
+    requests: int,
+    concurrency: int,
+    warmup: int = 0
+) -> list[StageResult]:
+    """
+    Runs `operation` `requests` times with at most `concurrency` in flight
+    and times each run.
+
+    Returns:
+        list[StageResult]: The stage itself, then one result per part
+            the operation reported extra samples for
+    """
+    for number in range(warmup):
+        await operation(-1 - number)
+
+    stage = StageResult(name)
+    parts: dict[str, StageResult] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(number: int):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                extra = await operation(number)
+            except Exception as e:
+                stage.errors += 1
+                stage.error = stage.error or (str(e) or type(e).__name__)
+                return
+            stage.samples.append(time.perf_counter() - started)
+
+            for part, samples in (extra or {}).items():
+                parts.setdefault(part, StageResult(f"{name}/{part}")).samples.extend(samples)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(number) for number in range(requests)))
+    stage.elapsed = time.perf_counter() - started
+
+    for part in parts.values():
+        part.elapsed = stage.elapsed
+    return [stage, *parts.values()]
+
+
+class LocalServer:
+    """
+    Serves an ASGI app with uvicorn on a loopback port, inside the
+    benchmark's own event loop.
+    """
+
+    def __init__(self, app: Starlette, port: int, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = port
+        self.server = uvicorn.Server(uvicorn.Config(
+            app,
+            host=host,
+            port=port,
+            log_level="warning",
+            lifespan="on",
+        ))
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self, timeout: float = 30.0):
+        self._task = asyncio.create_task(self.server.serve())
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if self._task.done():
+                self._task.result()
+                raise RuntimeError(f"Server on port {self.port} exited during startup")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Server on port {self.port} did not start")
+            await asyncio.sleep(0.05)
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self.server.should_exit = True
+        await self._task
+        self._task = None
+
+
+class OrchestrationBenchmark:
+    """
+    Runs the whole stack on loopback with stub models and times each hop.
+
+    Started locally, with no network access needed:
+    - arithmetic_server (streamable HTTP MCP, in process)
+    - terminal_server (stdio MCP, a subprocess per connection)
+    - website_builder_simple (A2A server, stub model, streamed answers)
+    - host_agent (A2A server, stub model scripted to call an MCP tool and
+      delegate to the website builder)
+
+    Servers share the event loop with the load generator, so the numbers
+    measure orchestration overhead on one core rather than peak capacity.
+    Task and session files live in a temporary directory removed by stop().
+    """
+
+    def __init__(self, settings: BenchmarkSettings):
+        self.settings = settings
+        self._workdir = tempfile.TemporaryDirectory(prefix="orchestration_bench_")
+        self.servers: list[LocalServer] = []
+        self.client_pool = AgentClientPool()
+        self.website_builder_card: Optional[AgentCard] = None
+        self.host_card: Optional[AgentCard] = None
+        # Agents run in process (not behind a server), closed by stop()
+        self._local_agents: list[WebsiteBuilderSimple] = []
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._workdir.name, name)
+
+    def _write_json(self, name: str, data: Any) -> str:
+        path = self._path(name)
+        with open(path, "w") as f:
+            json.dump(data, f)
+        return path
+
+    # ---------------- SETUP ---------------- #
+
+    async def _serve(self, app: Starlette, port: int) -> LocalServer:
+        server = LocalServer(app, port)
+        await server.start()
+        self.servers.append(server)
+        return server
+
+    async def _wait_ready(self, url: str, timeout: float = 60.0):
+        deadline = time.monotonic() + timeout
+        async with httpx.AsyncClient() as client:
+            while True:
+                response = await client.get(f"{url}/ready")
+                if response.status_code == 200:
+                    return
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{url} did not become ready")
+                await asyncio.sleep(0.1)
+
+    async def _resolve_card(self, url: str) -> AgentCard:
+        async with httpx.AsyncClient() as client:
+            return await A2ACardResolver(base_url=url, httpx_client=client).get_agent_card()
+
+    async def start(self):
+        host = "127.0.0.1"
+
+        # Arithmetic MCP server, built from its module without running it
+        arithmetic = runpy.run_path(ARITHMETIC_SERVER)["mcp"]
+        arithmetic_server = await self._serve(
+            arithmetic.streamable_http_app(),
+            _free_port(host)
+        )
+
+        self.mcp_config_file = self._write_json("mcp_config.json", {
+            "mcpServers": {
+                "terminal_server": {
+                    "command": sys.executable,
+                    "args": [TERMINAL_SERVER]
+                },
+                "arithmetic_server": {
+                    "command": "streamable_http",
+                    "args": [f"{arithmetic_server.url}{arithmetic.settings.streamable_http_path}"]
+                }
+            }
+        })
+
+        website_builder_port = _free_port(host)
+        website_builder = await self._serve(
+            build_website_builder_app(
+                host=host,
+                port=website_builder_port,
+                task_db="memory",
+                session_db=self._path("website_builder_sessions.db"),
+                stream_partial=True,
+                model=website_builder_model(self.settings),
+            ),
+            website_builder_port
+        )
+
+        host_port = _free_port(host)
+        self.registry_file = self._write_json(
+            "agent_registry.json",
+            [website_builder.url, f"http://{host}:{host_port}"]
+        )
+        host_agent = await self._serve(
+            build_host_app(
+                host=host,
+                port=host_port,
+                task_db="memory",
+                session_db=self._path("host_agent_sessions.db"),
+                model=host_model(self.settings),
+                registry_file=self._write_json("host_registry.json", [website_builder.url]),
+                mcp_config_file=self.mcp_config_file,
+                mcp_manifest_file=self._path("mcp_tool_manifest.json"),
+            ),
+            host_port
+        )
+        await self._wait_ready(host_agent.url)
+
+        self.website_builder_card = await self._resolve_card(website_builder.url)
+        self.host_card = await self._resolve_card(host_agent.url)
+
+    async def stop(self):
+        await self.client_pool.aclose()
+        for server in reversed(self.servers):
+            await server.stop()
+        self.servers = []
+        for agent in self._local_agents:
+            await agent.close()
+        self._local_agents = []
+        self._workdir.cleanup()
+
+    # ---------------- STAGES ---------------- #
+
+    async def discovery(self, number: int):
+        """Cold discovery of every registered agent card"""
+        result = await AgentDiscovery(registry_file=self.registry_file).discover()
+        failed = [status for status in result.statuses if status.status != "ok"]
+        if failed:
+            raise RuntimeError(f"{failed[0].url}: {failed[0].error}")
+
+    async def mcp_load(self, number: int) -> dict[str, list[float]]:
+        """Connecting to both MCP servers and listing their tools"""
+        connector = MCPConnect(config_file=self.mcp_config_file)
+        try:
+            reports = await connector.load_all_tools()
+        finally:
+            for toolset in connector.get_tools():
+                await toolset.close()
+
+        failed = [report for report in reports if report.error]
+        if failed:
+            raise RuntimeError(f"{failed[0].name}: {failed[0].error}")
+        return {report.name: [report.latency] for report in reports}
+
+    async def delegation_hop(self, number: int):
+        """One message/send round trip to website_builder_simple"""
+        connector = AgentConnector(self.website_builder_card, pool=self.client_pool)
+        answer = await connector.send_task(f"Page {number}", session_id=uuid4().hex)
+        if PAGE_MARKER not in answer:
+            raise RuntimeError(f"Unexpected answer: {answer[:200]}")
+
+    async def delegation_stream(self, number: int) -> dict[str, list[float]]:
+        """One message/stream round trip, as the host agent delegates"""
+        connector = AgentConnector(self.website_builder_card, pool=self.client_pool)
+        started = time.perf_counter()
+        first_event = None
+
+        async for _ in connector.stream_task(f"Page {number}", session_id=uuid4().hex):
+            if first_event is None:
+                first_event = time.perf_counter() - started
+
+        return {"first_event": [first_event]} if first_event is not None else {}
+
+    async def host_round_trip(self, number: int):
+        """Client -> host -> MCP tool call -> delegation -> answer"""
+        connector = AgentConnector(self.host_card, pool=self.client_pool)
+        answer = await connector.send_task(f"Page {number}", session_id=uuid4().hex)
+        if PAGE_MARKER not in answer:
+            raise RuntimeError(f"Unexpected answer: {answer[:200]}")
+
+    def executor_events(self) -> Operation:
+        """
+        Returns an operation that drives the website builder executor
+        in-process (no HTTP) and reports the gap before each event the
+        request handler delivers.
+        """
+        executor = WebsiteBuilderSimpleAgentExecutor(
+            stream_partial=True,
+            model=website_builder_model(self.settings),
+            session_db=self._path(f"executor_sessions_{len(self._local_agents)}.db"),
+        )
+        self._local_agents.append(executor.agent)
+        handler = DefaultRequestHandler(
+            agent_executor=executor,
+            task_store=InMemoryTaskStore(),
+        )
+
+        async def operation(number: int) -> dict[str, list[float]]:
+            params = MessageSendParams(message=Message(
+                message_id=uuid4().hex,
+                role=Role.user,
+                parts=[Part(root=TextPart(text=f"Page {number}"))],
+            ))
+
+            gaps = []
+            last = time.perf_counter()
+            async for _ in handler.on_message_send_stream(params):
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+            if not gaps:
+                raise RuntimeError("No events delivered")
+            return {"first_event": gaps[:1], "event": gaps}
+
+        return operation
+
+    async def run(self, stages: tuple[str, ...] = STAGES) -> list[StageResult]:
+        """
+        Runs the selected stages in order and returns their results.
+        """
+        settings = self.settings
+        operations = {
+            "discovery": self.discovery,
+            "mcp_load": self.mcp_load,
+            "delegation_hop": self.delegation_hop,
+            "delegation_stream": self.delegation_stream,
+            "executor_events": self.executor_events() if "executor_events" in stages else None,
+            "host_round_trip": self.host_round_trip,
+        }
+
+        results = []
+        for name in STAGES:
+            if name not in stages:
+                continue
+
+            # Let the previous stage's connections and processes wind down
+            gc.collect()
+            await asyncio.sleep(0.5)
+
+            slow = name == "mcp_load"
+            results.extend(await run_stage(
+                name,
+                operations[name],
+                requests=settings.mcp_loads if slow else settings.requests,
+                concurrency=1 if slow else settings.concurrency,
+                warmup=min(settings.warmup, 1) if slow else settings.warmup,
+            ))
+        return results
@@ -0,0 +1,161 @@
+import sys
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """
+    Linearly interpolated percentile of a list of samples.
+
+    Args:
+        samples (list[float]): Measured values
+        q (float): Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or nan if there are no samples
+    """
+    if not samples:
+        return math.nan
+
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * q / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class StageResult:
+    """
+    Latency samples of one benchmark stage.
+
+    Attributes:
+        name (str): Stage name, "stage/part" for per-part timings
+        samples (list[float]): Seconds taken by each operation
+        elapsed (float): Wall-clock seconds the whole stage ran for
+        errors (int): Operations that failed (not included in samples)
+        error (str, optional): First failure, for the report
+    """
+    name: str
+    samples: list[float] = field(default_factory=list)
+    elapsed: float = 0.0
+    errors: int = 0
+    error: Optional[str] = None
+
+    @property
+    def throughput(self) -> float:
+        """Completed operations per second of wall-clock time"""
+        return len(self.samples) / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "count": len(self.samples),
+            "errors": self.errors,
+            "error": self.error,
+            "elapsed": self.elapsed,
+            "mean": sum(self.samples) / len(self.samples) if self.samples else None,
+            "p50": percentile(self.samples, 50) if self.samples else None,
+            "p95": percentile(self.samples, 95) if self.samples else None,
+            "p99": percentile(self.samples, 99) if self.samples else None,
+            "rps": self.throughput,
+        }
+
+
+def _ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value * 1000:.2f}"
+
+
+def print_report(results: list[StageResult], console: Optional[Console] = None):
+    """
+    Prints one row per stage: sample count, errors, latency percentiles
+    (milliseconds) and throughput.
+    """
+    table = Table(title="Orchestration benchmark")
+    table.add_column("stage", no_wrap=True)
+    for column in ("n", "errors", "mean ms", "p50 ms", "p95 ms", "p99 ms", "ops/s"):
+        table.add_column(column, justify="right")
+
+    for result in results:
+        row = result.to_dict()
+        table.add_row(
+            row["name"],
+            str(row["count"]),
+            str(row["errors"]) if row["errors"] else "",
+            _ms(row["mean"]),
+            _ms(row["p50"]),
+            _ms(row["p95"]),
+            _ms(row["p99"]),
+            f"{row['rps']:.1f}",
+        )
+
+    # Keep every column readable when the output is piped to a file
+    console = console or Console(width=None if sys.stdout.isatty() else 120)
+    console.print(table)
+    for result in results:
+        if result.error:
+            console.print(f"[red]{result.name}: {result.errors} failed, first error: {result.error}[/red]")
+
+
+def save_results(results: list[StageResult], path: str, settings: dict[str, Any]):
+    """
+    Writes the results (and the settings that produced them) as JSON, for
+    use as a baseline by later runs.
+    """
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "settings": settings,
+                "stages": [result.to_dict() for result in results],
+            },
+            f,
+            indent=2,
+        )
+
+
+def compare_to_baseline(
+    results: list[StageResult],
+    path: str,
+    tolerance: float = 0.25,
+    min_delta: float = 0.005
+) -> list[str]:
+    """
+    Compares p95 latencies with a saved baseline.
+
+    A stage regresses when its p95 is more than `tolerance` (relative) and
+    `min_delta` seconds (absolute) above the baseline p95, or when it has
+    failures the baseline did not have.
+
+    Returns:
+        list[str]: One description per regressed stage (empty if none)
+    """
+    with open(path, "r") as f:
+        baseline = {stage["name"]: stage for stage in json.load(f)["stages"]}
+
+    regressions = []
+    for result in results:
+        before = baseline.get(result.name)
+        if before is None:
+            continue
+
+        now = result.to_dict()
+        if now["errors"] and not before["errors"]:
+            regressions.append(f"{result.name}: {now['errors']} failures (baseline had none)")
+            continue
+
+        if now["p95"] is None or before["p95"] is None:
+            continue
+
+        delta = now["p95"] - before["p95"]
+        if delta > min_delta and delta > before["p95"] * tolerance:
+            regressions.append(
+                f"{result.name}: p95 {_ms(now['p95'])} ms vs {_ms(before['p95'])} ms "
+                f"(+{delta / max(before['p95'], 1e-9):.0%})"
+            )
+
+    return regressions
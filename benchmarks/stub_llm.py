@@ -0,0 +1,138 @@
+import json
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Optional
+
+from pydantic import Field
+from google.adk.models import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+
+@dataclass
+class StubStep:
+    """
+    One scripted model turn: a tool call if `tool` is set, otherwise a
+    text answer.
+
+    Strings in `text` and `args` may contain two placeholders:
+    "{query}" (the user's latest message) and "{result}" (the response of
+    the last tool call, as JSON).
+    """
+    text: str = ""
+    tool: Optional[str] = None
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+# Answer given once a script has run out of steps
+FALLBACK_STEP = StubStep(text="Done.")
+
+
+def _substitute(value: Any, values: dict[str, str]) -> Any:
+    if isinstance(value, str):
+        for name, replacement in values.items():
+            value = value.replace("{" + name + "}", replacement)
+        return value
+    if isinstance(value, dict):
+        return {key: _substitute(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_substitute(item, values) for item in value]
+    return value
+
+
+class StubLlm(BaseLlm):
+    """
+    Deterministic stand-in for Gemini, so the orchestration stack can be
+    exercised and timed without network access.
+
+    Every user message replays `script` from the start: the n-th model call
+    after the message answers with the n-th step. Each call waits `latency`
+    seconds before answering; streamed text answers are split into `chunks`
+    partial responses, `chunk_delay` seconds apart.
+    """
+
+    model: str = "stub"
+    script: list[StubStep] = Field(default_factory=lambda: [StubStep(text="OK")])
+    latency: float = 0.0
+    chunks: int = 1
+    chunk_delay: float = 0.0
+    calls: int = 0
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"stub.*"]
+
+    @staticmethod
+    def _position(llm_request: LlmRequest) -> tuple[int, str, str]:
+        """
+        Returns the index of the current step, the user's latest message
+        and the last tool response seen since.
+        """
+        step = 0
+        query = ""
+        result = ""
+
+        for content in llm_request.contents:
+            parts = content.parts or []
+            if content.role == "user" and any(part.text for part in parts):
+                step = 0
+                query = "".join(part.text for part in parts if part.text)
+                result = ""
+            elif content.role == "model" and any(part.function_call for part in parts):
+                step += 1
+
+            for part in parts:
+                if part.function_response:
+                    result = json.dumps(part.function_response.response, default=str)
+
+        return step, query, result
+
+    async def generate_content_async(
+        self,
+        llm_request: LlmRequest,
+        stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        index, query, result = self._position(llm_request)
+        step = self.script[index] if index < len(self.script) else FALLBACK_STEP
+        values = {"query": query, "result": result}
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if step.tool:
+            yield LlmResponse(
+                content=types.Content(
+                    role="model",
+                    parts=[types.Part.from_function_call(
+                        name=step.tool,
+                        args=_substitute(step.args, values)
+                    )]
+                ),
+                turn_complete=True,
+            )
+            return
+
+        text = _substitute(step.text, values)
+
+        if stream and self.chunks > 1:
+            size = -(-len(text) // self.chunks)
+            for start in range(0, len(text), size):
+                if start and self.chunk_delay:
+                    await asyncio.sleep(self.chunk_delay)
+                yield LlmResponse(
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part.from_text(text=text[start:start + size])]
+                    ),
+                    partial=True,
+                )
+
+        yield LlmResponse(
+            content=types.Content(
+                role="model",
+                parts=[types.Part.from_text(text=text)]
+            ),
+            turn_complete=True,
+        )
@@ -1,6 +1,16 @@
+import ast
+import functools
+import math
+import operator
+from typing import Annotated, Literal
+
+import numpy as np
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field
 
+# Upper bound on array sizes accepted by the batch tools
+MAX_BATCH_SIZE = 100_000
+
 class ArithmeticInput(BaseModel):
     """Input model: two numbers to add."""
     a: float = Field(..., description="First number")
@@ -11,6 +21,43 @@ class ArithmeticOutput(BaseModel):
     result: float = Field(..., description="Result of the arithmetic operation")
     expression: str = Field(..., description="Expression evaluated")
 
+class BatchArithmeticInput(BaseModel):
+    """Input model: element-wise arithmetic over two arrays."""
+    operation: Literal["add", "sub", "mul", "div", "pow"] = Field(..., description="Operation to apply element-wise")
+    a: list[float] = Field(..., max_length=MAX_BATCH_SIZE, description="Left operands")
+    b: Annotated[list[float], Field(max_length=MAX_BATCH_SIZE)] | float = Field(
+        ..., description="Right operands (same length as a) or a single number applied to every element"
+    )
+
+class ArrayOutput(BaseModel):
+    """Output model: array result of a batch operation."""
+    values: list[float | None] = Field(..., description="Results; null where the result is undefined (e.g. division by zero)")
+    count: int = Field(..., description="Number of results")
+    expression: str = Field(..., description="Operation evaluated")
+
+class ReduceInput(BaseModel):
+    """Input model: reductions over an array of numbers."""
+    values: list[float] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE, description="Numbers to reduce")
+    operations: list[Literal["sum", "mean", "median", "min", "max", "std", "var", "prod", "count"]] = Field(
+        default=["sum"], description="Reductions to compute"
+    )
+
+class ReduceOutput(BaseModel):
+    """Output model: results of the requested reductions."""
+    results: dict[str, float | None] = Field(..., description="Result of each reduction")
+    count: int = Field(..., description="Number of input values")
+
+class ExpressionInput(BaseModel):
+    """Input model: a formula and the variables it uses."""
+    expression: str = Field(..., max_length=1000, description="Formula, e.g. 'sum(price * qty) / len(qty)'")
+    variables: dict[str, list[float] | float] = Field(default_factory=dict, description="Named numbers or arrays used in the formula")
+
+class ExpressionOutput(BaseModel):
+    """Output model: result of a formula."""
+    result: float | None = Field(None, description="Scalar result")
+    values: list[float | None] | None = Field(None, description="Array result")
+    expression: str = Field(..., description="Expression evaluated")
+
 # Initialize MCP Server
 mcp = FastMCP(
     "arithmetic_server",
@@ -38,5 +85,222 @@ async def add_numbers(input: ArithmeticInput) -> ArithmeticOutput:
         expression=expression
     )
 
+def _to_list(values: np.ndarray) -> list[float | None]:
+    """Convert an array to JSON-safe floats, mapping nan/inf to None."""
+    values = values.astype(np.float64)
+    return [None if not math.isfinite(v) else v for v in values.tolist()]
+
+def _to_scalar(value) -> float | None:
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+_BATCH_OPERATIONS = {
+    "add": (np.add, "+"),
+    "sub": (np.subtract, "-"),
+    "mul": (np.multiply, "*"),
+    "div": (np.divide, "/"),
+    "pow": (np.power, "**"),
+}
+
+@mcp.tool("batch_arithmetic")
+async def batch_arithmetic(input: BatchArithmeticInput) -> ArrayOutput:
+    """
+    Apply add, sub, mul, div or pow element-wise over arrays in one call.
+
+    Args:
+        input (BatchArithmeticInput): Operation, left operands and right operands
+            (an array of the same length, or one number broadcast to every element).
+
+    Returns:
+        ArrayOutput: Output containing the results and the expression evaluated.
+    """
+    a = np.asarray(input.a, dtype=np.float64)
+    b = np.asarray(input.b, dtype=np.float64)
+
+    if b.ndim and b.shape != a.shape:
+        raise ValueError(f"a has {a.size} values but b has {b.size}")
+
+    func, symbol = _BATCH_OPERATIONS[input.operation]
+    with np.errstate(all="ignore"):
+        result = func(a, b)
+
+    rhs = "b" if b.ndim else str(float(b))
+    return ArrayOutput(
+        values=_to_list(result),
+        count=int(result.size),
+        expression=f"a[i] {symbol} {rhs} for {a.size} values",
+    )
+
+_REDUCTIONS = {
+    "sum": np.sum,
+    "mean": np.mean,
+    "median": np.median,
+    "min": np.min,
+    "max": np.max,
+    "std": np.std,
+    "var": np.var,
+    "prod": np.prod,
+    "count": np.size,
+}
+
+@mcp.tool("reduce_numbers")
+async def reduce_numbers(input: ReduceInput) -> ReduceOutput:
+    """
+    Compute reductions (sum, mean, median, min, max, std, var, prod, count)
+    over an array of numbers in one call.
+
+    Args:
+        input (ReduceInput): The numbers and the reductions to compute.
+
+    Returns:
+        ReduceOutput: Output containing the result of each reduction.
+    """
+    values = np.asarray(input.values, dtype=np.float64)
+
+    with np.errstate(all="ignore"):
+        results = {
+            name: _to_scalar(_REDUCTIONS[name](values))
+            for name in input.operations
+        }
+
+    return ReduceOutput(results=results, count=int(values.size))
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+# Whitelisted functions and the number of arguments each takes. NumPy
+# reductions read a second positional argument as the axis, so they only
+# accept the array to reduce.
+_FUNCTIONS = {
+    "abs": (np.abs, 1),
+    "sqrt": (np.sqrt, 1),
+    "exp": (np.exp, 1),
+    "log": (np.log, 1),
+    "log10": (np.log10, 1),
+    "sin": (np.sin, 1),
+    "cos": (np.cos, 1),
+    "tan": (np.tan, 1),
+    "round": (np.round, 1),
+    "floor": (np.floor, 1),
+    "ceil": (np.ceil, 1),
+    "sum": (np.sum, 1),
+    "mean": (np.mean, 1),
+    "median": (np.median, 1),
+    "min": (np.min, 1),
+    "max": (np.max, 1),
+    "std": (np.std, 1),
+    "var": (np.var, 1),
+    "prod": (np.prod, 1),
+    "len": (np.size, 1),
+    "minimum": (np.minimum, 2),
+    "maximum": (np.maximum, 2),
+}
+
+# Like Python's min(a, b, ...) and max(a, b, ...): with several arguments
+# they compare element-wise instead of reducing one array
+_ELEMENTWISE = {
+    "min": np.minimum,
+    "max": np.maximum,
+}
+
+_CONSTANTS = {
+    "pi": np.float64(math.pi),
+    "e": np.float64(math.e),
+}
+
+def _evaluate(node: ast.AST, variables: dict[str, np.ndarray]):
+    """
+    Evaluate a parsed formula. Only numbers, variables, arithmetic operators
+    and whitelisted NumPy functions are allowed; numbers are float64 so
+    exponentiation cannot build huge Python integers.
+    """
+    if isinstance(node, ast.Expression):
+        return _evaluate(node.body, variables)
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return np.float64(node.value)
+
+    if isinstance(node, ast.Name):
+        if node.id in variables:
+            return variables[node.id]
+        if node.id in _CONSTANTS:
+            return _CONSTANTS[node.id]
+        raise ValueError(f"Unknown variable '{node.id}'")
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        return _BINARY_OPERATORS[type(node.op)](
+            _evaluate(node.left, variables),
+            _evaluate(node.right, variables),
+        )
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        return _UNARY_OPERATORS[type(node.op)](_evaluate(node.operand, variables))
+
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id in _FUNCTIONS
+        and not node.keywords
+    ):
+        name = node.func.id
+        args = [_evaluate(arg, variables) for arg in node.args]
+
+        if name in _ELEMENTWISE and len(args) > 1:
+            return functools.reduce(_ELEMENTWISE[name], args)
+
+        function, arity = _FUNCTIONS[name]
+        if len(args) != arity:
+            raise ValueError(
+                f"{name}() takes {arity} argument{'s' if arity > 1 else ''} ({len(args)} given)"
+            )
+        return function(*args)
+
+    raise ValueError(f"Unsupported syntax in expression: {ast.dump(node)[:80]}")
+
+@mcp.tool("evaluate_expression")
+async def evaluate_expression(input: ExpressionInput) -> ExpressionOutput:
+    """
+    Safely evaluate a compound formula over numbers and arrays in one call.
+
+    Supports + - * / // % **, parentheses, the constants pi and e, and the
+    functions abs, sqrt, exp, log, log10, sin, cos, tan, round, floor, ceil,
+    sum, mean, median, min, max, std, var, prod, len, minimum and maximum.
+    Array variables are combined element-wise. min and max reduce one
+    argument and compare several element-wise, like Python's min and max.
+
+    Args:
+        input (ExpressionInput): The formula and its named variables.
+
+    Returns:
+        ExpressionOutput: Scalar `result` or array `values`, and the expression evaluated.
+    """
+    variables = {}
+    for name, value in input.variables.items():
+        array = np.asarray(value, dtype=np.float64)
+        if array.size > MAX_BATCH_SIZE:
+            raise ValueError(f"Variable '{name}' has more than {MAX_BATCH_SIZE} values")
+        variables[name] = array
+
+    tree = ast.parse(input.expression, mode="eval")
+    with np.errstate(all="ignore"):
+        result = np.asarray(_evaluate(tree, variables), dtype=np.float64)
+
+    if result.ndim == 0:
+        return ExpressionOutput(result=_to_scalar(result), expression=input.expression)
+
+    return ExpressionOutput(values=_to_list(result.ravel()), expression=input.expression)
+
 if __name__ == "__main__":
     mcp.run(transport="streamable-http")
\ No newline at end of file
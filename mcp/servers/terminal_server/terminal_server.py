@@ -1,27 +1,413 @@
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
+from pydantic import BaseModel, Field
 import os
-import subprocess
+import time
+import uuid
+import shlex
+import signal
+import asyncio
+import weakref
 
 mcp= FastMCP("terminal_server")
 DEFAULT_WORKSPACE= os.path.expanduser("~/mcp/workspace")
 
+# Limits (overridable through the environment)
+MAX_CONCURRENT_COMMANDS= int(os.environ.get("TERMINAL_MAX_CONCURRENCY", "4"))
+DEFAULT_TIMEOUT= float(os.environ.get("TERMINAL_COMMAND_TIMEOUT", "60"))
+MAX_OUTPUT_BYTES= int(os.environ.get("TERMINAL_MAX_OUTPUT_BYTES", "16384"))
+MAX_SHELL_SESSIONS= int(os.environ.get("TERMINAL_MAX_SHELL_SESSIONS", "8"))
+SHELL_IDLE_TIMEOUT= float(os.environ.get("TERMINAL_SHELL_IDLE_TIMEOUT", "600"))
+
+_command_slots= asyncio.Semaphore(MAX_CONCURRENT_COMMANDS)
+
+# Shell that runs commands (persistent sessions and one-off processes alike)
+SHELL= "/bin/sh"
+
+# Pooled shell of a client's commands that name no session_id
+DEFAULT_SHELL_SESSION= "default"
+
+
+class CommandOutput(BaseModel):
+    """Output model: result of a terminal command."""
+    stdout: str = Field(..., description="Captured standard output (possibly truncated)")
+    stderr: str = Field(..., description="Captured standard error (possibly truncated)")
+    exit_code: int | None = Field(..., description="Process exit code, None if it was killed")
+    duration: float = Field(..., description="Wall-clock seconds the command ran for")
+    timed_out: bool = Field(False, description="True if the command hit its timeout and was killed")
+    truncated: bool = Field(False, description="True if stdout or stderr was truncated")
+    stdout_bytes: int = Field(0, description="Total bytes written to stdout")
+    stderr_bytes: int = Field(0, description="Total bytes written to stderr")
+
+
+class _CappedBuffer:
+    """
+    Keeps the first and last `limit / 2` bytes of a stream and counts the rest,
+    so a huge output costs a bounded amount of memory.
+    """
+
+    def __init__(self, limit: int):
+        self.head_limit= limit // 2
+        self.tail_limit= limit - self.head_limit
+        self.head= bytearray()
+        self.tail= bytearray()
+        self.total= 0
+
+    def write(self, chunk: bytes):
+        self.total += len(chunk)
+
+        room= self.head_limit - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            chunk= chunk[room:]
+
+        if chunk:
+            self.tail += chunk
+            if len(self.tail) > self.tail_limit:
+                del self.tail[:len(self.tail) - self.tail_limit]
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > len(self.head) + len(self.tail)
+
+    def text(self) -> str:
+        head= self.head.decode(errors="replace")
+        tail= self.tail.decode(errors="replace")
+
+        if not self.truncated:
+            return head + tail
+
+        omitted= self.total - len(self.head) - len(self.tail)
+        return f"{head}\n... [{omitted} bytes truncated] ...\n{tail}"
+
+
+async def _drain(stream: asyncio.StreamReader, buffer: _CappedBuffer):
+    while True:
+        chunk= await stream.read(65536)
+        if not chunk:
+            return
+        buffer.write(chunk)
+
+
+def _kill_process_group(process: asyncio.subprocess.Process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+async def execute(command: str, timeout: float, cwd: str) -> CommandOutput:
+    """
+    Run a shell command as an asyncio subprocess in its own process group,
+    killing the whole group if it exceeds `timeout` or is cancelled.
+    """
+    async with _command_slots:
+        started= time.monotonic()
+        process= await asyncio.create_subprocess_exec(
+            SHELL,
+            "-c",
+            command,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+
+        stdout= _CappedBuffer(MAX_OUTPUT_BYTES)
+        stderr= _CappedBuffer(MAX_OUTPUT_BYTES)
+        timed_out= False
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    _drain(process.stdout, stdout),
+                    _drain(process.stderr, stderr),
+                    process.wait(),
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            timed_out= True
+            _kill_process_group(process)
+            await process.wait()
+        except asyncio.CancelledError:
+            _kill_process_group(process)
+            raise
+
+        return CommandOutput(
+            stdout=stdout.text(),
+            stderr=stderr.text(),
+            exit_code=None if timed_out else process.returncode,
+            duration=time.monotonic() - started,
+            timed_out=timed_out,
+            truncated=stdout.truncated or stderr.truncated,
+            stdout_bytes=stdout.total,
+            stderr_bytes=stderr.total,
+        )
+
+
+class ShellSession:
+    """
+    A long-lived /bin/sh that runs commands written to its stdin.
+
+    Each command is followed by a unique sentinel line on stdout and stderr
+    carrying the exit code, so its output can be framed without spawning a
+    new process. cwd and environment persist between commands.
+
+    Commands run through `eval` as one quoted word, so an unterminated
+    here-document cannot swallow the sentinel. A syntax error inside `eval`
+    would end the shell, so each command is first parsed with `set -n` in a
+    subshell of this shell (a fork, not a new /bin/sh).
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process= process
+        self.lock= asyncio.Lock()
+        self.last_used= time.monotonic()
+
+    @classmethod
+    async def start(cls, cwd: str) -> "ShellSession":
+        process= await asyncio.create_subprocess_exec(
+            SHELL,
+            cwd=cwd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        return cls(process)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    @property
+    def busy(self) -> bool:
+        return self.lock.locked()
+
+    async def close(self):
+        if self.alive:
+            _kill_process_group(self.process)
+            await self.process.wait()
+
+    @staticmethod
+    async def _read_framed(
+        stream: asyncio.StreamReader,
+        marker: bytes,
+        buffer: _CappedBuffer
+    ) -> bytes:
+        """
+        Copy stream data into `buffer` up to `marker`, then return the rest of
+        the marker line. Raises EOFError if the shell exits first.
+        """
+        pending= b""
+        while True:
+            chunk= await stream.read(65536)
+            if not chunk:
+                buffer.write(pending)
+                raise EOFError("shell exited")
+            pending += chunk
+
+            index= pending.find(marker)
+            if index >= 0:
+                buffer.write(pending[:index])
+                rest= pending[index + len(marker):]
+                while b"\n" not in rest:
+                    chunk= await stream.read(65536)
+                    if not chunk:
+                        raise EOFError("shell exited")
+                    rest += chunk
+                return rest.split(b"\n", 1)[0]
+
+            # Keep a marker-sized tail in case the marker spans two reads
+            keep= len(marker) - 1
+            buffer.write(pending[:-keep])
+            pending= pending[-keep:]
+
+    async def run(self, command: str, timeout: float) -> CommandOutput:
+        """
+        Run one command in this shell. On timeout the shell's process group
+        is killed and the session must be discarded.
+        """
+        sentinel= uuid.uuid4().hex
+        script= (
+            f"__cmd={shlex.quote(command)}\n"
+            f"if ( eval \"set -n\n$__cmd\" ); then\n"
+            f"{{ eval \"$__cmd\"\n}} < /dev/null; __rc=$?\n"
+            f"else __rc=$?; fi\n"
+            f"printf '\\n%s %d\\n' {sentinel} \"$__rc\"; "
+            f"printf '\\n%s 0\\n' {sentinel} >&2\n"
+        )
+        marker= f"\n{sentinel} ".encode()
+
+        stdout= _CappedBuffer(MAX_OUTPUT_BYTES)
+        stderr= _CappedBuffer(MAX_OUTPUT_BYTES)
+        started= time.monotonic()
+        self.last_used= started
+
+        try:
+            self.process.stdin.write(script.encode())
+            await self.process.stdin.drain()
+
+            # Both streams are read to their end even if the shell exits
+            rc, stderr_rc= await asyncio.wait_for(
+                asyncio.gather(
+                    self._read_framed(self.process.stdout, marker, stdout),
+                    self._read_framed(self.process.stderr, marker, stderr),
+                    return_exceptions=True,
+                ),
+                timeout=timeout,
+            )
+            for outcome in (rc, stderr_rc):
+                if isinstance(outcome, BaseException):
+                    raise outcome
+            exit_code= int(rc)
+            timed_out= False
+        except asyncio.TimeoutError:
+            await self.close()
+            exit_code= None
+            timed_out= True
+        except (EOFError, ConnectionError):
+            # The command ended the shell (e.g. `exit 3`)
+            await self.process.wait()
+            exit_code= self.process.returncode
+            timed_out= False
+        except asyncio.CancelledError:
+            await self.close()
+            raise
+
+        self.last_used= time.monotonic()
+        return CommandOutput(
+            stdout=stdout.text(),
+            stderr=stderr.text(),
+            exit_code=exit_code,
+            duration=self.last_used - started,
+            timed_out=timed_out,
+            truncated=stdout.truncated or stderr.truncated,
+            stdout_bytes=stdout.total,
+            stderr_bytes=stderr.total,
+        )
+
+
+class ShellSessionPool:
+    """
+    Pool of ShellSessions keyed by caller. Sessions idle for longer than
+    `idle_timeout` are closed, and the least recently used idle session is
+    evicted when the pool is full.
+
+    A command never waits for another one: if its session's shell is busy
+    (or every pooled shell is), it runs as a one-off process instead.
+    """
+
+    def __init__(self, max_sessions: int, idle_timeout: float):
+        self.max_sessions= max_sessions
+        self.idle_timeout= idle_timeout
+        self.sessions: dict[str, ShellSession]= {}
+        self._lock= asyncio.Lock()
+
+    async def _evict(self, key: str):
+        session= self.sessions.pop(key, None)
+        if session:
+            await session.close()
+
+    async def acquire(self, key: str, cwd: str) -> ShellSession | None:
+        """
+        Returns the session for `key`, starting one if needed. Returns None if
+        the pool is full of busy sessions.
+        """
+        async with self._lock:
+            now= time.monotonic()
+            for other, session in list(self.sessions.items()):
+                idle= now - session.last_used > self.idle_timeout
+                if not session.alive or (idle and not session.busy):
+                    await self._evict(other)
+
+            session= self.sessions.get(key)
+            if session:
+                return session
+
+            if len(self.sessions) >= self.max_sessions:
+                idle_sessions= [
+                    (session.last_used, other)
+                    for other, session in self.sessions.items()
+                    if not session.busy
+                ]
+                if not idle_sessions:
+                    return None
+                await self._evict(min(idle_sessions)[1])
+
+            session= await ShellSession.start(cwd)
+            self.sessions[key]= session
+            return session
+
+    async def run(self, key: str, command: str, timeout: float, cwd: str) -> CommandOutput:
+        session= await self.acquire(key, cwd)
+        if session is None or session.busy:
+            # No free shell for this caller: fall back to a one-off process
+            return await execute(command, timeout, cwd)
+
+        async with _command_slots:
+            async with session.lock:
+                result= await session.run(command, timeout)
+
+        if not session.alive:
+            async with self._lock:
+                if self.sessions.get(key) is session:
+                    self.sessions.pop(key)
+        return result
+
+
+shell_pool= ShellSessionPool(MAX_SHELL_SESSIONS, SHELL_IDLE_TIMEOUT)
+
+# MCP client session -> prefix of its shell keys, so equal session ids
+# of different clients never share a shell
+_client_keys: weakref.WeakKeyDictionary= weakref.WeakKeyDictionary()
+
+
+def _shell_key(ctx: Context, session_id: str) -> str:
+    client= ctx.session
+    if client not in _client_keys:
+        _client_keys[client]= uuid.uuid4().hex
+    return f"{_client_keys[client]}:{session_id}"
+
+
 @mcp.tool("terminal_server")
-async def run_command(command:str)->str:
+async def run_command(
+    command:str,
+    ctx: Context,
+    timeout: float | None = None,
+    session_id: str | None = None,
+)->CommandOutput:
     """
-    run a command in the terminal and return the output
+    run a command in the terminal and return the output.
+    Commands given the same session_id share a persistent shell, so the
+    working directory and environment variables carry over between calls.
+    Without a session_id commands share the client's default shell.
 
     Args:
         command(str): the command to run in the terminal
+        timeout(float, optional): seconds before the command is killed
+        session_id(str, optional): shell session to run in, per client
 
     Returns:
-        str:the output of the command or an error message is the command fails.
+        CommandOutput: stdout, stderr, exit code, duration and truncation info,
+        or an error message in stderr if the command could not be started.
     """
     try:
-        result= subprocess.run(command,shell=True,cwd=DEFAULT_WORKSPACE,text=True,capture_output=True)
-        return result.stdout or result.stderr
+        os.makedirs(DEFAULT_WORKSPACE, exist_ok=True)
+        return await shell_pool.run(
+            _shell_key(ctx, session_id or DEFAULT_SHELL_SESSION),
+            command,
+            timeout or DEFAULT_TIMEOUT,
+            DEFAULT_WORKSPACE,
+        )
     except Exception as e:
-        return f"Error running command:{str(e)}"
-    
+        return CommandOutput(
+            stdout="",
+            stderr=f"Error running command:{str(e)}",
+            exit_code=None,
+            duration=0.0,
+        )
+
 if __name__ == "__main__":
     mcp.run(transport="stdio")
-    
\ No newline at end of file
@@ -0,0 +1,88 @@
+import io
+import json
+import unittest
+from unittest import mock
+from contextlib import redirect_stdout
+
+import httpx
+from a2a.types import AgentCapabilities, AgentCard
+
+from app.cmd.batch import run_batch
+from utilities.a2a.agent_connector import AgentConnector
+
+CARD = AgentCard(
+    name="echo",
+    description="Echoes",
+    url="http://agent/",
+    version="1.0.0",
+    default_input_modes=["text"],
+    default_output_modes=["text"],
+    skills=[],
+    capabilities=AgentCapabilities(streaming=True),
+)
+
+
+class EchoAgent:
+    """Answers message/send with a completed task and records the messages"""
+
+    def __init__(self):
+        self.messages = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        message = payload["params"]["message"]
+        self.messages.append(message)
+        task = {
+            "kind": "task",
+            "id": f"task-{len(self.messages)}",
+            "contextId": message.get("contextId") or "server-context",
+            "status": {
+                "state": "completed",
+                "message": {
+                    "kind": "message",
+                    "messageId": "reply",
+                    "role": "agent",
+                    "parts": [{"kind": "text", "text": "ok"}],
+                },
+            },
+        }
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": task})
+
+
+class SessionContextTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.agent = EchoAgent()
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(self.agent.handler))
+        self.connector = AgentConnector(CARD)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def test_session_id_is_sent_as_the_context(self):
+        for _ in range(2):
+            result = await self.connector.send_task_result("hi", "session-1", httpx_client=self.client)
+            self.assertEqual(result.text, "ok")
+
+        self.assertEqual([message["contextId"] for message in self.agent.messages], ["session-1"] * 2)
+
+    async def batch(self, session_id):
+        with redirect_stdout(io.StringIO()):
+            await run_batch(self.connector, io.StringIO("one\ntwo\nthree\n"), session_id, concurrency=2)
+        return [message["contextId"] for message in self.agent.messages]
+
+    async def test_batch_prompts_share_only_a_given_session(self):
+        with mock.patch.object(self.connector, "send_task_result", self.send_with_client):
+            self.assertEqual(await self.batch("shared"), ["shared"] * 3)
+
+            self.agent.messages.clear()
+            self.assertEqual(len(set(await self.batch(None))), 3)
+
+    async def send_with_client(self, message: str, session_id: str):
+        return await AgentConnector.send_task_result(
+            self.connector, message, session_id, httpx_client=self.client
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
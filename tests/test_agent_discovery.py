@@ -0,0 +1,125 @@
+import os
+import json
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+
+from utilities.a2a import agent_discovery
+from utilities.a2a.agent_discovery import AgentDiscovery
+
+URL = "http://agent.test"
+
+
+def card_json(name: str) -> dict:
+    return {
+        "name": name,
+        "description": f"{name} agent",
+        "url": f"{URL}/",
+        "version": "1.0.0",
+        "capabilities": {},
+        "defaultInputModes": ["text"],
+        "defaultOutputModes": ["text"],
+        "skills": [],
+    }
+
+
+class FakeAgent:
+    """Serves an agent card, or fails while `up` is False"""
+
+    def __init__(self, name: str = "website_builder_simple"):
+        self.name = name
+        self.up = True
+        self.requests = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if not self.up:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json=card_json(self.name))
+
+
+class AgentDiscoveryTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        registry = os.path.join(self.directory.name, "registry.json")
+        with open(registry, "w") as f:
+            json.dump([URL], f)
+
+        self.agent = FakeAgent()
+        # Agents by host
+        self.agents = {"agent.test": self.agent}
+        real_client = httpx.AsyncClient
+        transport = httpx.MockTransport(
+            lambda request: self.agents[request.url.host].handler(request)
+        )
+        patcher = mock.patch.object(
+            agent_discovery.httpx,
+            "AsyncClient",
+            lambda **kwargs: real_client(transport=transport, **kwargs),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.discovery = AgentDiscovery(registry_file=registry, cache_ttl=60)
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    async def test_fresh_cards_are_served_from_cache(self):
+        self.assertEqual(len(await self.discovery.list_agent_cards()), 1)
+        self.assertEqual(len(await self.discovery.list_agent_cards()), 1)
+        self.assertEqual(self.agent.requests, 1)
+
+    async def test_failed_pass_is_not_cached_as_fresh(self):
+        self.agent.up = False
+        self.assertEqual(await self.discovery.list_agent_cards(), [])
+        self.assertEqual(self.discovery.last_statuses[URL].status, "error")
+
+        # The agent comes up within the cache TTL and is found at once
+        self.agent.up = True
+        cards = await self.discovery.list_agent_cards()
+        self.assertEqual([card.name for card in cards], ["website_builder_simple"])
+
+    async def test_name_miss_forces_one_refresh(self):
+        await self.discovery.list_agent_cards()
+
+        # The agent was redeployed under a new name while the cache is fresh
+        self.agent.name = "website_builder_v2"
+        card = await self.discovery.get_agent_card("Website_Builder_V2")
+        self.assertIsNotNone(card)
+        self.assertEqual(self.agent.requests, 2)
+
+        # Unknown names do not refresh again within the minimum interval
+        self.assertIsNone(await self.discovery.get_agent_card("unknown"))
+        self.assertIsNone(await self.discovery.get_agent_card("unknown"))
+        self.assertEqual(self.agent.requests, 2)
+
+        self.discovery._forced_at -= self.discovery.min_refresh_interval
+        self.assertIsNone(await self.discovery.get_agent_card("unknown"))
+        self.assertEqual(self.agent.requests, 3)
+
+    async def test_card_of_a_down_agent_expires_while_others_answer(self):
+        self.agents["other.test"] = FakeAgent("other")
+        registry = os.path.join(self.directory.name, "two.json")
+        with open(registry, "w") as f:
+            json.dump([URL, "http://other.test"], f)
+
+        discovery = AgentDiscovery(registry_file=registry, cache_ttl=0.05, stale_ttl=0.05)
+        self.assertEqual(len(await discovery.list_agent_cards()), 2)
+
+        self.agent.up = False
+        for _ in range(3):
+            await asyncio.sleep(0.04)
+            await discovery.refresh()
+
+        cards = await discovery.list_agent_cards()
+        self.assertEqual([card.name for card in cards], ["other"])
+        self.assertIsNone(discovery._lookup("website_builder_simple"))
+
+
+if __name__ == "__main__":
+    unittest.main()
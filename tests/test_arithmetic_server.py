@@ -0,0 +1,100 @@
+import unittest
+import importlib.util
+
+from pydantic import ValidationError
+
+spec = importlib.util.spec_from_file_location(
+    "streamable_http_server", "mcp/servers/streamable_http_server.py"
+)
+arithmetic_server = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(arithmetic_server)
+
+
+class EvaluateExpressionTest(unittest.IsolatedAsyncioTestCase):
+
+    async def evaluate(self, expression: str, **variables):
+        return await arithmetic_server.evaluate_expression(
+            arithmetic_server.ExpressionInput(expression=expression, variables=variables)
+        )
+
+    async def test_max_and_min_of_several_arguments_compare_element_wise(self):
+        self.assertEqual((await self.evaluate("max(a, b)", a=[1, 5, 3], b=[4, 2, 6])).values, [4, 5, 6])
+        self.assertEqual((await self.evaluate("min(a, b)", a=[1, 5, 3], b=[4, 2, 6])).values, [1, 2, 3])
+        self.assertEqual((await self.evaluate("max(2, 7, 3)")).result, 7)
+        self.assertEqual((await self.evaluate("min(a, 0)", a=[-1, 2])).values, [-1, 0])
+
+    async def test_reductions_take_one_array(self):
+        self.assertEqual((await self.evaluate("max(a)", a=[1, 5, 3])).result, 5)
+        self.assertEqual((await self.evaluate("sum(price * qty)", price=[2, 3], qty=[4, 5])).result, 23)
+
+        # A second argument would otherwise be read as the NumPy axis
+        for expression in ("sum(a, b)", "mean(a, 0)", "len(a, b)", "maximum(a)"):
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    await self.evaluate(expression, a=[1, 2], b=[3, 4])
+
+    async def test_unknown_names_are_rejected(self):
+        with self.assertRaises(ValueError):
+            await self.evaluate("open(a)", a=[1])
+        with self.assertRaises(ValueError):
+            await self.evaluate("x + 1")
+
+
+class BatchArithmeticTest(unittest.IsolatedAsyncioTestCase):
+
+    async def batch(self, operation: str, a, b):
+        return await arithmetic_server.batch_arithmetic(
+            arithmetic_server.BatchArithmeticInput(operation=operation, a=a, b=b)
+        )
+
+    async def test_element_wise_and_broadcast(self):
+        self.assertEqual((await self.batch("mul", [1, 2, 3], [4, 5, 6])).values, [4, 10, 18])
+        result = await self.batch("sub", [1, 2, 3], 1)
+        self.assertEqual(result.values, [0, 1, 2])
+        self.assertEqual(result.expression, "a[i] - 1.0 for 3 values")
+
+    async def test_division_by_zero_is_null(self):
+        result = await self.batch("div", [1, 0, 4], [0, 0, 2])
+        self.assertEqual(result.values, [None, None, 2])
+        self.assertEqual(result.count, 3)
+
+    async def test_mismatched_lengths_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "a has 3 values but b has 2"):
+            await self.batch("add", [1, 2, 3], [1, 2])
+
+    async def test_empty_input(self):
+        result = await self.batch("add", [], [])
+        self.assertEqual((result.values, result.count), ([], 0))
+
+    async def test_both_operands_are_bounded(self):
+        too_many = [1.0] * (arithmetic_server.MAX_BATCH_SIZE + 1)
+        for a, b in ((too_many, 1.0), ([1.0], too_many)):
+            with self.assertRaises(ValidationError):
+                arithmetic_server.BatchArithmeticInput(operation="add", a=a, b=b)
+
+
+class ReduceNumbersTest(unittest.IsolatedAsyncioTestCase):
+
+    async def reduce(self, values, operations):
+        return await arithmetic_server.reduce_numbers(
+            arithmetic_server.ReduceInput(values=values, operations=operations)
+        )
+
+    async def test_reductions(self):
+        result = await self.reduce([3, 1, 2, 6], ["sum", "mean", "median", "min", "max", "prod", "count"])
+        self.assertEqual(result.results, {
+            "sum": 12, "mean": 3, "median": 2.5, "min": 1, "max": 6, "prod": 36, "count": 4,
+        })
+        self.assertEqual(result.count, 4)
+
+    async def test_undefined_results_are_null(self):
+        result = await self.reduce([1e308, 1e308], ["sum", "prod"])
+        self.assertEqual(result.results, {"sum": None, "prod": None})
+
+    async def test_empty_input_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            arithmetic_server.ReduceInput(values=[], operations=["sum"])
+
+
+if __name__ == "__main__":
+    unittest.main()
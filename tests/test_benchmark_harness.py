@@ -0,0 +1,28 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks.harness import BenchmarkSettings, OrchestrationBenchmark
+
+
+class OrchestrationBenchmarkTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_round_trip_keeps_state_out_of_the_home_directory(self):
+        with tempfile.TemporaryDirectory() as home, mock.patch.dict(os.environ, {"HOME": home}):
+            benchmark = OrchestrationBenchmark(BenchmarkSettings(requests=1, warmup=0))
+            await benchmark.start()
+            try:
+                await benchmark.host_round_trip(0)
+                await benchmark.executor_events()(0)
+                workdir = benchmark._workdir.name
+                self.assertTrue(any(name.endswith("_sessions.db") for name in os.listdir(workdir)))
+            finally:
+                await benchmark.stop()
+
+            self.assertFalse(os.path.exists(workdir))
+            self.assertFalse(os.path.exists(os.path.join(home, ".cache", "mcp_a2a_project")))
+
+
+if __name__ == "__main__":
+    unittest.main()
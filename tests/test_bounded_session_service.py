@@ -0,0 +1,125 @@
+import os
+import time
+import asyncio
+import tempfile
+import unittest
+
+from google.adk.events import Event
+from google.genai import types
+
+from utilities.adk.bounded_session_service import BoundedSessionService
+from utilities.common.telemetry import REGISTRY
+
+APP = "app"
+USER = "user"
+
+
+def text_event(text: str) -> Event:
+    return Event(
+        author="user",
+        content=types.Content(role="user", parts=[types.Part(text=text)]),
+    )
+
+
+class BoundedSessionServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "sessions.db")
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    def service(self, **kwargs) -> BoundedSessionService:
+        service = BoundedSessionService(spill_path=self.path, **kwargs)
+        self.addAsyncCleanup(service.close)
+        return service
+
+    async def create(self, service: BoundedSessionService, session_id: str, text: str = "hi"):
+        session = await service.create_session(app_name=APP, user_id=USER, session_id=session_id)
+        await service.append_event(session, text_event(text))
+        return session
+
+    async def test_evicted_sessions_are_revived_with_their_events(self):
+        service = self.service(max_sessions=2)
+        for index in range(3):
+            await self.create(service, f"s{index}", text=f"turn {index}")
+
+        self.assertEqual(service.metrics()["sessions"], 2)
+        self.assertEqual(service.metrics()["spilled_sessions"], 1)
+
+        session = await service.get_session(app_name=APP, user_id=USER, session_id="s0")
+        self.assertEqual(session.events[0].content.parts[0].text, "turn 0")
+        self.assertEqual(service.metrics()["revivals"], 1)
+        self.assertEqual(service.metrics()["spilled_sessions"], 0)
+
+    async def test_without_spill_file_evicted_sessions_are_dropped(self):
+        service = BoundedSessionService(max_sessions=1)
+        await self.create(service, "s0")
+        await self.create(service, "s1")
+
+        self.assertIsNone(await service.get_session(app_name=APP, user_id=USER, session_id="s0"))
+        self.assertEqual(service.metrics()["spilled_sessions"], 0)
+
+    async def test_spill_count_survives_restart(self):
+        service = self.service(max_sessions=1)
+        for index in range(3):
+            await self.create(service, f"s{index}")
+        await service.close()
+
+        self.assertEqual(self.service().metrics()["spilled_sessions"], 2)
+
+    async def test_sweep_applies_row_cap_and_ttl(self):
+        service = self.service(max_sessions=1, max_spilled=2, sweep_interval=0)
+        for index in range(5):
+            await self.create(service, f"s{index}")
+
+        # Only the two most recently spilled sessions are kept
+        self.assertEqual(service.metrics()["spilled_sessions"], 2)
+        listed = await service.list_sessions(app_name=APP, user_id=USER)
+        self.assertEqual(sorted(session.id for session in listed.sessions), ["s2", "s3", "s4"])
+
+        # Everything spilled is older than a zero TTL
+        service.spill_ttl = 0
+        time.sleep(0.01)
+        await self.create(service, "s5")
+        self.assertEqual(service.metrics()["spilled_sessions"], 0)
+        self.assertIsNone(await service.get_session(app_name=APP, user_id=USER, session_id="s3"))
+
+    async def test_delete_updates_spill_count(self):
+        service = self.service(max_sessions=1)
+        await self.create(service, "s0")
+        await self.create(service, "s1")
+
+        await service.delete_session(app_name=APP, user_id=USER, session_id="s0")
+        self.assertEqual(service.metrics()["spilled_sessions"], 0)
+
+    async def test_idle_sessions_are_evicted_without_new_activity(self):
+        service = self.service(idle_ttl=0.05, evict_interval=0.02)
+        await self.create(service, "s0")
+
+        await asyncio.sleep(0.2)
+        self.assertEqual(service.metrics()["sessions"], 0)
+        self.assertEqual(service.metrics()["spilled_sessions"], 1)
+
+    async def test_metrics_are_served_on_the_metrics_route(self):
+        service = self.service(max_sessions=1)
+        service.export_metrics("test_agent")
+        await self.create(service, "s0")
+        await self.create(service, "s1")
+
+        lines = REGISTRY.render().splitlines()
+        self.assertIn('agent_sessions{agent="test_agent"} 1', lines)
+        self.assertIn('agent_session_evictions_total{agent="test_agent"} 1', lines)
+        self.assertIn("# TYPE agent_session_evictions_total counter", lines)
+
+    async def test_close_releases_the_file(self):
+        service = self.service()
+        await service.close()
+        self.assertIsNone(service._db)
+        # Closing twice is harmless
+        await service.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
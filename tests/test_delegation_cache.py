@@ -0,0 +1,152 @@
+import asyncio
+import unittest
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+
+from utilities.a2a.delegation_cache import DelegationCache
+
+
+def make_card(name: str = "agent", tags: list[str] | None = None) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=f"{name} agent",
+        url=f"http://localhost/{name}",
+        version="1.0.0",
+        capabilities=AgentCapabilities(streaming=True),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[AgentSkill(id="skill", name="skill", description="skill", tags=tags or [])],
+    )
+
+
+class Recorder:
+    def __init__(self, fail: bool = False):
+        self.events = []
+        self.fail = fail
+
+    async def __call__(self, agent_name, event):
+        self.events.append(event)
+        if self.fail:
+            raise RuntimeError("Task is already in a terminal state")
+
+
+class DelegationCacheTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_coalesced_callers_all_receive_events(self):
+        cache = DelegationCache()
+        release = asyncio.Event()
+        calls = 0
+
+        async def send(emit):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            await emit("agent", "working")
+            return "done"
+
+        first, second = Recorder(), Recorder()
+        waiters = [
+            asyncio.create_task(cache.run(make_card(), "hello", send, listener=first)),
+            asyncio.create_task(cache.run(make_card(), " hello ", send, listener=second)),
+        ]
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual(await asyncio.gather(*waiters), ["done", "done"])
+        self.assertEqual(calls, 1)
+        self.assertEqual(first.events, ["working"])
+        self.assertEqual(second.events, ["working"])
+        self.assertEqual(cache.stats()["coalesced"], 1)
+
+    async def test_failing_listener_does_not_fail_the_shared_call(self):
+        cache = DelegationCache()
+
+        async def send(emit):
+            await asyncio.sleep(0)
+            await emit("agent", "working")
+            return "done"
+
+        broken, healthy = Recorder(fail=True), Recorder()
+        results = await asyncio.gather(
+            cache.run(make_card(), "hello", send, listener=broken),
+            cache.run(make_card(), "hello", send, listener=healthy),
+        )
+        self.assertEqual(results, ["done", "done"])
+        self.assertEqual(healthy.events, ["working"])
+
+    async def test_cancelled_caller_stops_receiving_events(self):
+        cache = DelegationCache()
+        step = asyncio.Event()
+
+        async def send(emit):
+            await step.wait()
+            await emit("agent", "late")
+            return "done"
+
+        leaving, staying = Recorder(), Recorder()
+        left = asyncio.create_task(cache.run(make_card(), "hello", send, listener=leaving))
+        stays = asyncio.create_task(cache.run(make_card(), "hello", send, listener=staying))
+        await asyncio.sleep(0)
+
+        left.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await left
+
+        # The call goes on for the remaining caller
+        step.set()
+        self.assertEqual(await stays, "done")
+        self.assertEqual(leaving.events, [])
+        self.assertEqual(staying.events, ["late"])
+
+    async def test_call_is_cancelled_when_every_caller_is(self):
+        cache = DelegationCache()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def send(emit):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(cache.run(make_card(), "hello", send))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        self.assertEqual(cache.stats()["in_flight"], 0)
+
+    async def test_results_of_deterministic_agents_are_memoized(self):
+        cache = DelegationCache()
+        calls = 0
+
+        async def send(emit):
+            nonlocal calls
+            calls += 1
+            return f"answer {calls}"
+
+        deterministic = make_card("calc", tags=["deterministic"])
+        self.assertEqual(await cache.run(deterministic, "1+1", send), "answer 1")
+        self.assertEqual(await cache.run(deterministic, "1+1", send), "answer 1")
+
+        # Other agents are only coalesced by default
+        self.assertEqual(await cache.run(make_card(), "1+1", send), "answer 2")
+        self.assertEqual(await cache.run(make_card(), "1+1", send), "answer 3")
+
+    async def test_failures_are_not_memoized(self):
+        cache = DelegationCache(default_ttl=60)
+
+        async def fail(emit):
+            raise RuntimeError("remote error")
+
+        async def succeed(emit):
+            return "ok"
+
+        with self.assertRaises(RuntimeError):
+            await cache.run(make_card(), "hello", fail)
+        self.assertEqual(await cache.run(make_card(), "hello", succeed), "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
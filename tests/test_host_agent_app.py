@@ -0,0 +1,34 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from agents.host_agent.__main__ import build_app
+from agents.host_agent.agent import HostAgent
+
+
+class LifespanTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_shutdown_waits_for_a_cancelled_warm_up(self):
+        order = []
+
+        async def warm_up(agent):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                await asyncio.sleep(0.01)
+                order.append("warm-up stopped")
+                raise
+
+        async def close(agent):
+            order.append("closed")
+
+        with mock.patch.object(HostAgent, "warm_up", warm_up), mock.patch.object(HostAgent, "close", close):
+            app = build_app("localhost", 0, task_db="memory")
+            async with app.router.lifespan_context(app):
+                await asyncio.sleep(0.01)
+
+        self.assertEqual(order, ["warm-up stopped", "closed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
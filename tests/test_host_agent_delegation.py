@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from a2a.types import Task, TaskState, TaskStatus
+
+from agents.host_agent.agent import HostAgent
+
+
+class FakeConnector:
+    """Streams one task after `delay` seconds and records cancellations"""
+
+    def __init__(self, delay: float):
+        self.agent_card = SimpleNamespace(name="remote")
+        self.delay = delay
+        self.remote_task_id = None
+        self.cancelled = asyncio.Event()
+        self.cancelled_ids = []
+
+    async def stream_task(self, message: str, session_id: str):
+        await asyncio.sleep(self.delay)
+        self.remote_task_id = "remote-task"
+        yield Task(id="remote-task", context_id="ctx", status=TaskStatus(state=TaskState.working))
+        await asyncio.Event().wait()
+
+    async def cancel_task(self, task_id: str) -> bool:
+        self.cancelled_ids.append(task_id)
+        self.cancelled.set()
+        return True
+
+
+class StreamDelegationTest(unittest.IsolatedAsyncioTestCase):
+
+    def host(self) -> HostAgent:
+        host = HostAgent.__new__(HostAgent)
+        host._background = set()
+        return host
+
+    async def cancel_after(self, connector: FakeConnector, seconds: float):
+        host = self.host()
+        delegation = asyncio.create_task(host._stream_delegation(connector, "hi"))
+        await asyncio.sleep(seconds)
+        delegation.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await delegation
+        await asyncio.wait_for(connector.cancelled.wait(), 5)
+        self.assertEqual(connector.cancelled_ids, ["remote-task"])
+
+    async def test_cancel_after_the_task_id_arrived(self):
+        await self.cancel_after(FakeConnector(delay=0), 0.05)
+
+    async def test_cancel_while_the_request_is_in_flight(self):
+        await self.cancel_after(FakeConnector(delay=0.1), 0.01)
+
+    async def test_stream_errors_reach_the_caller(self):
+        class FailingConnector(FakeConnector):
+            async def stream_task(self, message: str, session_id: str):
+                raise RuntimeError("remote error")
+                yield
+
+        with self.assertRaisesRegex(RuntimeError, "remote error"):
+            await self.host()._stream_delegation(FailingConnector(delay=0), "hi")
+
+
+if __name__ == "__main__":
+    unittest.main()
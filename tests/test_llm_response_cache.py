@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from utilities.adk.llm_response_cache import LLMResponseCache, request_key
+
+
+def tool(name: str) -> types.Tool:
+    return types.Tool(function_declarations=[
+        types.FunctionDeclaration(name=name, description=f"The {name} tool")
+    ])
+
+
+def make_request(
+    text: str = "hello",
+    call_id: str = "call-1",
+    tools: tuple[str, ...] = ("add", "sub"),
+    labels: dict | None = None,
+    model: str = "gemini-2.5-flash",
+) -> LlmRequest:
+    return LlmRequest(
+        model=model,
+        contents=[
+            types.Content(role="user", parts=[types.Part(text=text)]),
+            types.Content(role="model", parts=[types.Part(
+                function_call=types.FunctionCall(id=call_id, name="add", args={"a": 1, "b": 2})
+            )]),
+            types.Content(role="user", parts=[types.Part(
+                function_response=types.FunctionResponse(id=call_id, name="add", response={"result": 3})
+            )]),
+        ],
+        config=types.GenerateContentConfig(
+            system_instruction="Be brief",
+            temperature=0.2,
+            labels=labels,
+            tools=[tool(name) for name in tools],
+        ),
+    )
+
+
+def answer(text: str = "3", call_id: str | None = None) -> LlmResponse:
+    parts = [types.Part(text=text)]
+    if call_id:
+        parts.append(types.Part(function_call=types.FunctionCall(id=call_id, name="add", args={})))
+    return LlmResponse(content=types.Content(role="model", parts=parts))
+
+
+class RequestKeyTest(unittest.TestCase):
+
+    def test_per_invocation_details_do_not_change_the_key(self):
+        key = request_key(make_request())
+
+        self.assertEqual(request_key(make_request(call_id="call-2")), key)
+        self.assertEqual(request_key(make_request(tools=("sub", "add"))), key)
+        self.assertEqual(request_key(make_request(labels={"run": "42"})), key)
+
+    def test_what_the_model_sees_changes_the_key(self):
+        key = request_key(make_request())
+
+        self.assertNotEqual(request_key(make_request(text="hello!")), key)
+        self.assertNotEqual(request_key(make_request(tools=("add",))), key)
+        self.assertNotEqual(request_key(make_request(model="gemini-2.5-pro")), key)
+
+
+class LLMResponseCacheTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_answers_are_replayed_without_function_call_ids(self):
+        cache = LLMResponseCache()
+        context = SimpleNamespace(invocation_id="inv-1")
+        request = make_request()
+
+        self.assertIsNone(await cache.before_model(context, request))
+        await cache.after_model(context, answer(call_id="call-9"))
+
+        # Same conversation in a later invocation, with fresh call ids
+        cached = await cache.before_model(SimpleNamespace(invocation_id="inv-2"), make_request(call_id="x"))
+        self.assertEqual(cached.content.parts[0].text, "3")
+        self.assertIsNone(cached.content.parts[1].function_call.id)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    async def test_partial_and_failed_answers_are_not_cached(self):
+        cache = LLMResponseCache()
+        context = SimpleNamespace(invocation_id="inv-1")
+
+        await cache.before_model(context, make_request())
+        partial = answer()
+        partial.partial = True
+        await cache.after_model(context, partial)
+        failed = answer()
+        failed.error_code = "RESOURCE_EXHAUSTED"
+        await cache.after_model(context, failed)
+
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    async def test_expired_and_least_recently_used_entries_are_dropped(self):
+        cache = LLMResponseCache(max_entries=2)
+        await cache.put("a", answer("a"))
+        await cache.put("b", answer("b"))
+        cache.get("a")
+        await cache.put("c", answer("c"))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+
+        cache.ttl = -1
+        self.assertIsNone(cache.get("a"))
+
+    async def test_entries_and_hits_survive_a_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache", "llm.db")
+
+            cache = LLMResponseCache(cache_file=path)
+            await cache.put("key", answer("kept"))
+            cache.get("key")
+            await cache.close()
+
+            reopened = LLMResponseCache(cache_file=path)
+            self.assertEqual(reopened.stats()["entry_hits"], [{"key": "key", "hits": 1}])
+            self.assertEqual(reopened.get("key").content.parts[0].text, "kept")
+            await reopened.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import asyncio
+import math
+import unittest
+from collections import Counter
+
+from app.cmd.load_test import LoadTest, LoadTestReport, LoadTestSettings
+from utilities.a2a.agent_connector import SendResult
+
+
+class FakeConnector:
+    """Answers prompts with the final state named in them"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.in_flight = Counter()
+        self.overlapping = 0
+
+    async def send_task_result(self, message: str, session_id: str) -> SendResult:
+        self.sent.append((message, session_id))
+        self.in_flight[session_id] += 1
+        self.overlapping += self.in_flight[session_id] > 1
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight[session_id] -= 1
+        if message == "raise":
+            raise ConnectionError("connection reset\nwith details")
+        return SendResult(text="answer", task_id="task", state=message)
+
+
+class LoadTestReportTest(unittest.TestCase):
+
+    def test_statistics(self):
+        report = LoadTestReport(
+            settings=LoadTestSettings(),
+            latencies=[0.1, 0.2, 0.3, 0.4],
+            errors=Counter({"task failed": 1}),
+            elapsed=2.0,
+        )
+        summary = report.to_dict()
+
+        self.assertEqual(summary["requests"], 5)
+        self.assertEqual(summary["succeeded"], 4)
+        self.assertEqual(summary["failed"], 1)
+        self.assertAlmostEqual(summary["throughput_rps"], 2.0)
+        self.assertAlmostEqual(summary["latency_ms"]["mean"], 250.0)
+        self.assertAlmostEqual(summary["latency_ms"]["p50"], 250.0)
+        self.assertAlmostEqual(summary["latency_ms"]["max"], 400.0)
+
+    def test_histogram_spans_used_buckets(self):
+        report = LoadTestReport(settings=LoadTestSettings(), latencies=[0.1, 0.1, 0.4, 120.0])
+        histogram = report.histogram()
+
+        self.assertEqual(histogram[0], ("0.1", 2))
+        self.assertEqual(histogram[-1], ("+Inf", 1))
+        self.assertEqual(sum(count for _, count in histogram), 4)
+        self.assertIn(("0.5", 1), histogram)
+
+    def test_empty_report(self):
+        report = LoadTestReport(settings=LoadTestSettings())
+        self.assertEqual(report.histogram(), [])
+        self.assertEqual(report.throughput, 0.0)
+        self.assertIsNone(report.to_dict()["latency_ms"]["p95"])
+        report.render()
+
+
+class LoadTestTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_failed_task_states_count_as_errors(self):
+        prompts = ["completed", "failed", "rejected", "canceled", "raise"]
+        settings = LoadTestSettings(sessions=1, requests=len(prompts))
+        report = await LoadTest(FakeConnector(), prompts, settings).run()
+
+        self.assertEqual(len(report.latencies), 1)
+        self.assertEqual(report.errors, Counter({
+            "task failed": 1,
+            "task rejected": 1,
+            "task canceled": 1,
+            "ConnectionError: connection reset": 1,
+        }))
+
+    async def test_closed_loop_sends_the_requested_count(self):
+        connector = FakeConnector(delay=0.01)
+        settings = LoadTestSettings(sessions=4, requests=10)
+        report = await LoadTest(connector, ["completed"], settings).run()
+
+        self.assertEqual(report.total, 10)
+        self.assertEqual(len(connector.sent), 10)
+        self.assertEqual(len({session_id for _, session_id in connector.sent}), 4)
+
+    async def test_warmup_requests_are_not_measured(self):
+        settings = LoadTestSettings(sessions=1, requests=3, warmup=0.05)
+        report = await LoadTest(FakeConnector(delay=0.02), ["completed"], settings).run()
+
+        self.assertEqual(report.total, 3)
+        self.assertGreater(report.warmup_requests, 0)
+
+    async def test_open_loop_never_overlaps_turns_of_a_session(self):
+        connector = FakeConnector(delay=0.05)
+        settings = LoadTestSettings(sessions=2, requests=8, rate=200, arrival="constant")
+        report = await LoadTest(connector, ["completed"], settings).run()
+
+        self.assertEqual(report.total, 8)
+        self.assertEqual(len({session_id for _, session_id in connector.sent}), 2)
+        self.assertEqual(connector.overlapping, 0)
+
+    async def test_open_loop_arrivals_follow_the_ramp_up(self):
+        settings = LoadTestSettings(rate=10, ramp_up=2, arrival="constant")
+        load_test = LoadTest(FakeConnector(), ["completed"], settings)
+
+        # 10 requests arrive while the rate rises to 10/s over 2s
+        self.assertAlmostEqual(load_test._arrival_time(10), 2.0)
+        self.assertAlmostEqual(load_test._arrival_time(2.5), 1.0)
+        self.assertAlmostEqual(load_test._arrival_time(20), 3.0)
+        self.assertTrue(math.isclose(load_test._arrival_time(0), 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPConnectionParams
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from utilities.mcp import mcp_cancellation
+
+
+class MCPCancellationTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_installed_mcp_is_supported(self):
+        # Fails when mcp is upgraded past the checked releases: re-check the
+        # session patch, then extend SUPPORTED_MCP_VERSIONS
+        self.assertTrue(mcp_cancellation.cancellation_supported())
+
+    async def test_cancelled_call_is_cancelled_on_the_server(self):
+        server = FastMCP("slow")
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        @server.tool()
+        async def wait_forever() -> str:
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return "never"
+
+        async with create_connected_server_and_client_session(server._mcp_server) as session:
+            session = mcp_cancellation._cancellable(session)
+            call = asyncio.create_task(session.call_tool("wait_forever", {}))
+            await asyncio.wait_for(started.wait(), 5)
+
+            call.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await call
+            await asyncio.wait_for(cancelled.wait(), 5)
+
+    async def test_unsupported_version_leaves_toolset_unchanged(self):
+        toolset = MCPToolset(connection_params=StreamableHTTPConnectionParams(url="http://localhost:1/mcp"))
+        create_session = toolset._mcp_session_manager.create_session
+
+        with mock.patch.object(mcp_cancellation, "_SUPPORTED", False):
+            self.assertIs(mcp_cancellation.propagate_cancellation(toolset), toolset)
+        self.assertEqual(toolset._mcp_session_manager.create_session, create_session)
+
+    async def test_version_parsing(self):
+        with mock.patch.object(mcp_cancellation, "version", return_value="1.21.1"):
+            self.assertEqual(mcp_cancellation._mcp_version(), (1, 21))
+        with mock.patch.object(mcp_cancellation, "version", return_value="2.0.0rc1"):
+            self.assertEqual(mcp_cancellation._mcp_version(), (2, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
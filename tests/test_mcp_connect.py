@@ -0,0 +1,67 @@
+import os
+import json
+import runpy
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks.harness import ARITHMETIC_SERVER, LocalServer
+from utilities.a2a.multi_worker import _free_port
+from utilities.mcp.mcp_connect import MCPConnect
+from utilities.mcp.mcp_manifest_cache import MCPManifestCache
+
+
+class MCPConnectManifestTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+        arithmetic = runpy.run_path(ARITHMETIC_SERVER)["mcp"]
+        self.server = LocalServer(arithmetic.streamable_http_app(), _free_port("127.0.0.1"))
+        await self.server.start()
+        self.addAsyncCleanup(self.server.stop)
+
+        self.config_file = os.path.join(self.directory.name, "mcp_config.json")
+        with open(self.config_file, "w") as f:
+            json.dump({"mcpServers": {"arithmetic_server": {
+                "command": "streamable_http",
+                "args": [f"{self.server.url}{arithmetic.settings.streamable_http_path}"],
+            }}}, f)
+        self.manifest_file = os.path.join(self.directory.name, "manifest.json")
+
+    async def load(self) -> MCPConnect:
+        connector = MCPConnect(
+            config_file=self.config_file,
+            manifest_cache=MCPManifestCache(cache_file=self.manifest_file),
+        )
+        reports = await connector.load_all_tools()
+        self.assertIsNone(reports[0].error)
+        return connector
+
+    async def test_cold_load_records_the_server_version(self):
+        connector = await self.load()
+        entry = connector.manifest_cache.entries["arithmetic_server"]
+
+        server = connector.discovery.list_servers()["arithmetic_server"]
+        version, tools = await connector._probe_server(server)
+        self.assertIsNotNone(entry["server_version"])
+        self.assertTrue(connector.manifest_cache.is_current(entry, version, tools))
+
+    async def test_warm_load_validates_without_rewriting(self):
+        await self.load()
+
+        connector = MCPConnect(
+            config_file=self.config_file,
+            manifest_cache=MCPManifestCache(cache_file=self.manifest_file),
+        )
+        with mock.patch.object(MCPManifestCache, "put") as put:
+            reports = await connector.load_all_tools()
+            await connector.validation_task
+
+        self.assertTrue(reports[0].cached)
+        put.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
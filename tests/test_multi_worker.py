@@ -0,0 +1,212 @@
+import os
+import json
+import tempfile
+import unittest
+
+import httpx
+from a2a.types import Task, TaskState, TaskStatus
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from utilities.a2a.multi_worker import AffinityRouter
+from utilities.a2a.sqlite_task_store import SQLiteTaskStore
+
+WORKERS = [f"http://worker{index}" for index in range(4)]
+
+
+def make_task(task_id: str, context_id: str, state: TaskState = TaskState.working) -> Task:
+    return Task(id=task_id, context_id=context_id, status=TaskStatus(state=state))
+
+
+class FakeWorkers:
+    """Answers like A2A workers and records which one got each request"""
+
+    def __init__(self):
+        self.calls = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        worker = f"{request.url.scheme}://{request.url.host}"
+        payload = json.loads(request.content)
+        self.calls.append((worker, payload["method"]))
+
+        if payload["method"] == "message/stream":
+            context_id = payload["params"]["message"]["contextId"]
+            events = [
+                {"kind": "task", "id": "streamed", "contextId": context_id},
+                {"kind": "status-update", "taskId": "streamed", "contextId": context_id},
+            ]
+            body = "".join(
+                f"data: {json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': event})}\r\n\r\n"
+                for event in events
+            )
+            return self.respond(body.encode("utf-8"), "text/event-stream")
+
+        if payload["method"] == "message/send":
+            context_id = payload["params"]["message"]["contextId"]
+            result = {"kind": "task", "id": "sent", "contextId": context_id}
+            return self.respond(json.dumps({"jsonrpc": "2.0", "id": 1, "result": result}).encode())
+
+        return self.respond(json.dumps({"jsonrpc": "2.0", "id": 1, "result": {"worker": worker}}).encode())
+
+    @staticmethod
+    def respond(body: bytes, content_type: str = "application/json") -> httpx.Response:
+        # Streamed like a real upstream, so the router can relay it with aiter_raw
+        return httpx.Response(200, stream=httpx.ByteStream(body), headers={"content-type": content_type})
+
+
+class AffinityRouterTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.workers = FakeWorkers()
+        self.router = AffinityRouter(WORKERS)
+        self.router._client = httpx.AsyncClient(transport=httpx.MockTransport(self.workers.handler))
+        app = Starlette(routes=[Route("/{path:path}", self.router.proxy, methods=["GET", "POST"])])
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://router")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await self.router.aclose()
+
+    async def call(self, method: str, params: dict) -> httpx.Response:
+        return await self.client.post(
+            "/", json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+        )
+
+    async def test_tasks_follow_their_context(self):
+        for method, task_id in [("message/send", "sent"), ("message/stream", "streamed")]:
+            with self.subTest(method=method):
+                message = {"messageId": "m", "role": "user", "parts": [], "contextId": "ctx-7"}
+                await self.call(method, {"message": message})
+                owner = self.workers.calls[-1][0]
+
+                await self.call("tasks/cancel", {"id": task_id})
+                self.assertEqual(self.workers.calls[-1], (owner, "tasks/cancel"))
+                self.assertEqual(owner, WORKERS[self.router.worker_for_context("ctx-7")])
+
+    async def test_new_conversations_get_a_context(self):
+        message = {"messageId": "m", "role": "user", "parts": []}
+        body = (await self.call("message/send", {"message": message})).json()
+
+        context_id = body["result"]["contextId"]
+        self.assertTrue(context_id)
+        self.assertEqual(self.router._task_contexts["sent"], context_id)
+
+    async def test_unknown_task_is_not_guessed(self):
+        body = (await self.call("tasks/cancel", {"id": "unknown"})).json()
+
+        self.assertEqual(body["error"]["code"], -32001)
+        self.assertEqual(self.workers.calls, [])
+
+    async def test_task_from_database_is_routed_to_its_context(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tasks.db")
+            store = SQLiteTaskStore(path, shared=True)
+            await store.save(make_task("stored", "ctx-3"))
+            await store.close()
+
+            self.router.task_db = path
+            await self.call("tasks/get", {"id": "stored"})
+
+        self.assertEqual(
+            self.workers.calls[-1],
+            (WORKERS[self.router.worker_for_context("ctx-3")], "tasks/get"),
+        )
+
+    async def test_tracked_tasks_are_bounded(self):
+        self.router.max_tracked_tasks = 2
+        for index in range(3):
+            self.router.record_task(f"task-{index}", "ctx")
+        self.assertEqual(list(self.router._task_contexts), ["task-1", "task-2"])
+
+
+class ProbeTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.ready = {"http://worker0": True, "http://worker1": True}
+        self.router = AffinityRouter(["http://worker0", "http://worker1", "http://worker2"])
+        self.router._client = httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+        app = Starlette(routes=self.router.routes())
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://router")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await self.router.aclose()
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        worker = f"{request.url.scheme}://{request.url.host}"
+        if worker not in self.ready:
+            raise httpx.ConnectError("refused", request=request)
+        if request.url.path == "/ready":
+            return httpx.Response(200 if self.ready[worker] else 503)
+        return httpx.Response(200, text=(
+            "# HELP a2a_requests_total Requests\n"
+            "# TYPE a2a_requests_total counter\n"
+            'a2a_requests_total{method="send"} 3\n'
+            "# HELP a2a_sessions Sessions\n"
+            "# TYPE a2a_sessions gauge\n"
+            "a2a_sessions 2\n"
+        ))
+
+    async def test_ready_only_when_every_worker_is(self):
+        response = await self.client.get("/ready")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["workers"], [True, True, False])
+
+        self.ready["http://worker2"] = True
+        self.assertEqual((await self.client.get("/ready")).status_code, 200)
+
+        self.ready["http://worker1"] = False
+        self.assertEqual((await self.client.get("/ready")).status_code, 503)
+
+    async def test_metrics_of_every_worker_are_labelled_and_grouped(self):
+        lines = (await self.client.get("/metrics")).text.splitlines()
+
+        self.assertIn('a2a_worker_up{worker="2"} 0', lines)
+        self.assertEqual(lines.count("# TYPE a2a_requests_total counter"), 1)
+        start = lines.index("# TYPE a2a_requests_total counter")
+        self.assertEqual(lines[start + 1:start + 3], [
+            'a2a_requests_total{worker="0",method="send"} 3',
+            'a2a_requests_total{worker="1",method="send"} 3',
+        ])
+        self.assertIn('a2a_sessions{worker="1"} 2', lines)
+
+
+class SharedTaskStoreTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tasks.db")
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    async def test_new_tasks_are_visible_to_other_workers_at_once(self):
+        # A long flush interval: only the immediate write can make it visible
+        first = SQLiteTaskStore(self.path, shared=True, flush_interval=60)
+        second = SQLiteTaskStore(self.path, shared=True, flush_interval=60)
+        try:
+            await first.save(make_task("t1", "ctx"))
+            task = await second.get("t1")
+            self.assertIsNotNone(task)
+            self.assertEqual(task.context_id, "ctx")
+        finally:
+            await first.close()
+            await second.close()
+
+    async def test_tasks_of_other_workers_are_not_served_from_cache(self):
+        first = SQLiteTaskStore(self.path, shared=True)
+        second = SQLiteTaskStore(self.path, shared=True)
+        try:
+            await first.save(make_task("t1", "ctx"))
+            self.assertEqual((await second.get("t1")).status.state, TaskState.working)
+
+            await first.save(make_task("t1", "ctx", TaskState.completed))
+            await first.flush()
+            self.assertEqual((await second.get("t1")).status.state, TaskState.completed)
+        finally:
+            await first.close()
+            await second.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
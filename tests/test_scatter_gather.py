@@ -0,0 +1,101 @@
+import asyncio
+import unittest
+
+from utilities.a2a.scatter_gather import scatter_gather
+
+
+def reply(value, delay: float = 0.0):
+    async def branch():
+        await asyncio.sleep(delay)
+        return value
+    return branch
+
+
+def fail(message: str, delay: float = 0.0):
+    async def branch():
+        await asyncio.sleep(delay)
+        raise RuntimeError(message)
+    return branch
+
+
+class ScatterGatherTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_all_waits_for_every_branch_in_input_order(self):
+        result = await scatter_gather([
+            ("slow", reply("a", 0.05)),
+            ("broken", fail("unreachable")),
+            ("fast", reply("b")),
+        ])
+
+        self.assertEqual(result.required, 3)
+        self.assertFalse(result.satisfied)
+        self.assertEqual([r.name for r in result.results], ["slow", "broken", "fast"])
+        self.assertEqual([r.status for r in result.results], ["ok", "error", "ok"])
+        self.assertEqual(result.results[0].response, "a")
+        self.assertEqual(result.results[1].error, "unreachable")
+
+    async def test_first_cancels_the_losing_branches(self):
+        cancelled = asyncio.Event()
+
+        async def hang():
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        result = await scatter_gather(
+            [("broken", fail("down")), ("slow", hang), ("fast", reply("won", 0.01))],
+            strategy="first",
+        )
+
+        self.assertTrue(result.satisfied)
+        self.assertEqual([r.status for r in result.results], ["error", "cancelled", "ok"])
+        self.assertTrue(cancelled.is_set())
+
+    async def test_quorum_skips_failures_and_is_capped_by_branch_count(self):
+        result = await scatter_gather(
+            [("a", fail("down")), ("b", reply(1, 0.01)), ("c", reply(2, 0.02)), ("d", reply(3, 1))],
+            strategy="quorum",
+            quorum=2,
+        )
+        self.assertTrue(result.satisfied)
+        self.assertEqual([r.status for r in result.results], ["error", "ok", "ok", "cancelled"])
+
+        result = await scatter_gather([("a", reply(1))], strategy="quorum", quorum=5)
+        self.assertEqual(result.required, 1)
+        self.assertTrue(result.satisfied)
+
+    async def test_branch_timeout(self):
+        result = await scatter_gather([("slow", reply("late", 1))], timeout=0.01)
+
+        self.assertFalse(result.satisfied)
+        self.assertEqual(result.results[0].status, "timeout")
+        self.assertEqual(result.to_dict()["results"][0]["error"], "no response within 0.01s")
+
+    async def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            await scatter_gather([("a", reply(1))], strategy="majority")
+
+    async def test_cancelling_the_caller_cancels_every_branch(self):
+        cancelled = []
+
+        def hang(name):
+            async def branch():
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(name)
+                    raise
+            return branch
+
+        gather = asyncio.create_task(scatter_gather([("a", hang("a")), ("b", hang("b"))]))
+        await asyncio.sleep(0.01)
+        gather.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await gather
+        self.assertEqual(sorted(cancelled), ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+
+from agents.website_builder_simple.__main__ import build_agent_card
+from utilities.a2a.skill_router import SkillIndex, SkillRouter, tokenize
+
+
+def make_card(name: str, description: str, tags: list[str], examples: list[str]) -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=description,
+        url=f"http://localhost/{name}",
+        version="1.0.0",
+        capabilities=AgentCapabilities(streaming=True),
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        skills=[
+            AgentSkill(
+                id=f"{name}_skill",
+                name=f"{name}_skill",
+                description=description,
+                tags=tags,
+                examples=examples,
+            )
+        ],
+    )
+
+
+class FakeDiscovery:
+    def __init__(self, cards: list[AgentCard]):
+        self.cards = cards
+        self.calls = 0
+
+    async def list_agent_cards(self, force_refresh: bool = False) -> list[AgentCard]:
+        self.calls += 1
+        return self.cards
+
+
+WEBSITE_BUILDER = build_agent_card("localhost", 10000)
+
+DATABASE_AGENT = make_card(
+    "database_designer",
+    "Designs relational database schemas and writes SQL migrations",
+    ["database", "sql", "schema", "postgres"],
+    ["Create a database schema for an online shop"],
+)
+
+
+class TokenizeTest(unittest.TestCase):
+
+    def test_folds_plurals_and_drops_generic_words(self):
+        self.assertEqual(tokenize("Please create some websites"), ["website"])
+        self.assertEqual(tokenize("website_builder_simple"), ["website", "builder"])
+
+    def test_stopwords_are_dropped_before_folding(self):
+        self.assertEqual(tokenize("building a website"), ["build", "website"])
+        self.assertEqual(tokenize("build a website"), ["website"])
+
+
+class SkillRouterTest(unittest.IsolatedAsyncioTestCase):
+
+    async def pick(self, task: str, cards: list[AgentCard]):
+        router = SkillRouter(FakeDiscovery(cards))
+        return router.pick(await router.route(task))
+
+    async def test_website_tasks_route_to_website_builder(self):
+        for task in [
+            "make me a homepage for my cafe",
+            "Build a landing page for my bakery",
+            "create a website",
+            "building a website",
+            "make an html page with some css",
+        ]:
+            with self.subTest(task=task):
+                best = await self.pick(task, [WEBSITE_BUILDER])
+                self.assertIsNotNone(best)
+                self.assertEqual(best.agent_name, "website_builder_simple")
+
+    async def test_unrelated_tasks_are_not_routed(self):
+        for task in [
+            "create a database schema for users",
+            "create a folder named test",
+            "building a folder named test",
+            "write a haiku about rain",
+            "add 5 and 3",
+        ]:
+            with self.subTest(task=task):
+                self.assertIsNone(await self.pick(task, [WEBSITE_BUILDER]))
+
+    async def test_example_wording_alone_is_not_enough(self):
+        # "product" and "button" appear only in the website builder's examples
+        matches = SkillIndex([WEBSITE_BUILDER]).search("rate this product button")
+        self.assertTrue(matches)
+        self.assertFalse(matches[0].described)
+        self.assertIsNone(SkillRouter(FakeDiscovery([])).pick(matches))
+
+    async def test_picks_the_agent_whose_skills_match(self):
+        cards = [WEBSITE_BUILDER, DATABASE_AGENT]
+
+        best = await self.pick("create a database schema for users", cards)
+        self.assertEqual(best.agent_name, "database_designer")
+
+        best = await self.pick("make me a homepage for my cafe", cards)
+        self.assertEqual(best.agent_name, "website_builder_simple")
+
+    async def test_close_scores_are_not_confident(self):
+        twin = make_card(
+            "website_builder_pro",
+            "A website builder that can create web pages",
+            ["website", "html", "css", "javascript"],
+            ["Create a website with header and footer"],
+        )
+        self.assertIsNone(await self.pick("create an html website", [WEBSITE_BUILDER, twin]))
+
+    async def test_index_is_rebuilt_when_cards_change(self):
+        discovery = FakeDiscovery([WEBSITE_BUILDER])
+        router = SkillRouter(discovery)
+        self.assertIsNone(router.pick(await router.route("design a sql database schema")))
+
+        discovery.cards = [WEBSITE_BUILDER, DATABASE_AGENT]
+        best = router.pick(await router.route("design a sql database schema"))
+        self.assertEqual(best.agent_name, "database_designer")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import asyncio
+import tempfile
+import unittest
+
+from a2a.types import Task, TaskState, TaskStatus
+
+from utilities.a2a.sqlite_task_store import SQLiteTaskStore
+
+
+def make_task(task_id: str, context_id: str = "ctx", state: TaskState = TaskState.working) -> Task:
+    return Task(id=task_id, context_id=context_id, status=TaskStatus(state=state))
+
+
+class SQLiteTaskStoreTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tasks", "tasks.db")
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+
+    async def test_saves_are_batched_and_survive_a_restart(self):
+        store = SQLiteTaskStore(self.path, flush_interval=60)
+        await store.save(make_task("a"))
+        await store.save(make_task("a", state=TaskState.completed))
+
+        # Served from memory before the batch is written
+        self.assertEqual((await store.get("a")).status.state, TaskState.completed)
+        self.assertIsNone(await store._run(store._read, "a"))
+
+        await store.close()
+
+        reopened = SQLiteTaskStore(self.path)
+        self.assertEqual((await reopened.get("a")).status.state, TaskState.completed)
+        self.assertIsNone(await reopened.get("missing"))
+        await reopened.close()
+
+    async def test_full_batch_is_written_without_waiting(self):
+        store = SQLiteTaskStore(self.path, flush_interval=60, max_batch=2)
+        await store.save(make_task("a"))
+        await store.save(make_task("b"))
+
+        for _ in range(100):
+            if not store._pending:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(store._pending, {})
+        self.assertIsNotNone(await store._run(store._read, "b"))
+        await store.close()
+
+    async def test_hot_set_is_bounded(self):
+        store = SQLiteTaskStore(self.path, hot_set_size=2)
+        for task_id in ("a", "b", "c"):
+            await store.save(make_task(task_id))
+        await store.flush()
+
+        self.assertEqual(list(store._hot), ["b", "c"])
+        # Evicted tasks are read back from the database
+        self.assertEqual((await store.get("a")).id, "a")
+        self.assertEqual(list(store._hot), ["c", "a"])
+        await store.close()
+
+    async def test_list_by_context_and_delete(self):
+        store = SQLiteTaskStore(self.path, flush_interval=60)
+        await store.save(make_task("a", context_id="one"))
+        await store.save(make_task("b", context_id="two"))
+        await store.save(make_task("c", context_id="one"))
+
+        self.assertEqual([task.id for task in await store.list_by_context("one")], ["a", "c"])
+
+        await store.delete("a")
+        self.assertIsNone(await store.get("a"))
+        self.assertEqual([task.id for task in await store.list_by_context("one")], ["c"])
+        await store.close()
+
+    async def test_sweep_removes_only_expired_finished_tasks(self):
+        store = SQLiteTaskStore(self.path, retention=3600)
+        await store.save(make_task("running"))
+        await store.save(make_task("done", state=TaskState.completed))
+        await store.flush()
+
+        await store.sweep()
+        self.assertIsNotNone(await store.get("done"))
+
+        store.retention = -1
+        await store.sweep()
+        self.assertIsNone(await store.get("done"))
+        self.assertNotIn("done", store._hot)
+        self.assertIsNotNone(await store._run(store._read, "running"))
+        await store.close()
+
+    async def test_idle_flusher_sleeps(self):
+        store = SQLiteTaskStore(self.path, flush_interval=0.01)
+        flushes = 0
+        flush = store.flush
+
+        async def counting_flush():
+            nonlocal flushes
+            flushes += 1
+            await flush()
+
+        store.flush = counting_flush
+        await store.save(make_task("a"))
+        await asyncio.sleep(0.3)
+        self.assertEqual(flushes, 1)
+        self.assertIsNotNone(await store._run(store._read, "a"))
+
+        # A new save wakes it up again
+        await store.save(make_task("b"))
+        await asyncio.sleep(0.05)
+        self.assertEqual(flushes, 2)
+        await store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import contextlib
+import io
+import unittest
+
+from a2a.types import TaskState
+
+from utilities.a2a.status_channel import StatusChannel
+
+
+class FakeUpdater:
+    """Records working updates, optionally failing like a closed queue"""
+
+    def __init__(self, fail: bool = False):
+        self.task_id = "task"
+        self.context_id = "context"
+        self.fail = fail
+        self.updates = []
+
+    async def update_status(self, state, message=None, **kwargs):
+        if self.fail:
+            raise RuntimeError("Queue is closed")
+        self.updates.append((state, message.parts[0].root.text))
+
+
+class StatusChannelTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_updates_within_the_interval_are_merged(self):
+        updater = FakeUpdater()
+        channel = StatusChannel(updater, interval=0.05)
+
+        await channel.update("step 1")
+        await channel.update("step 2")
+        await channel.update("step 2")
+        await channel.update("step 3")
+        self.assertEqual(len(updater.updates), 1)
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(len(updater.updates), 2)
+        state, text = updater.updates[1]
+        self.assertEqual(state, TaskState.working)
+        self.assertTrue(text.startswith("step 2; step 3 ("))
+        self.assertEqual(channel.merged, 1)
+
+    async def test_discard_drops_pending_deltas(self):
+        updater = FakeUpdater()
+        channel = StatusChannel(updater, interval=0.05)
+
+        await channel.update("step 1")
+        await channel.update("step 2")
+        channel.discard()
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(len(updater.updates), 1)
+
+    async def test_failed_delayed_send_is_reported(self):
+        updater = FakeUpdater()
+        channel = StatusChannel(updater, interval=0.01)
+        await channel.update("step 1")
+
+        updater.fail = True
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            await channel.update("step 2")
+            await asyncio.sleep(0.05)
+
+        self.assertIn("Delayed status update of task task failed", output.getvalue())
+        self.assertIn("RuntimeError: Queue is closed", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import asyncio
+import unittest
+from uuid import uuid4
+
+from a2a.server.agent_execution import RequestContext
+from a2a.server.events import EventQueue
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore
+from a2a.types import (
+    Artifact,
+    Message,
+    MessageSendParams,
+    Part,
+    Role,
+    Task,
+    TaskArtifactUpdateEvent,
+    TaskIdParams,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+from a2a.utils import new_agent_text_message
+
+from utilities.a2a.streaming_executor import StreamingAgentExecutor
+
+
+class ScriptedAgent:
+    """Yields a fixed list of items, optionally failing or hanging at the end"""
+
+    def __init__(self, items: list[dict], end: str = "done"):
+        self.items = items
+        self.end = end
+        self.started = asyncio.Event()
+
+    async def invoke(self, query: str, session_id: str, **kwargs):
+        self.started.set()
+        for item in self.items:
+            yield item
+        if self.end == "fail":
+            raise RuntimeError("model unavailable")
+        if self.end == "hang":
+            await asyncio.Event().wait()
+
+
+class RelayingExecutor(StreamingAgentExecutor):
+    """Relays two remote events before the agent's own items, like the host"""
+
+    def _invoke(self, query, task, updater, status):
+        relay = self.delegation_relay(updater, status)
+
+        async def items():
+            await relay("remote", TaskStatusUpdateEvent(
+                task_id="remote-task",
+                context_id="remote-context",
+                final=False,
+                status=TaskStatus(
+                    state=TaskState.working,
+                    message=new_agent_text_message("drafting"),
+                ),
+            ))
+            await relay("remote", TaskArtifactUpdateEvent(
+                task_id="remote-task",
+                context_id="remote-context",
+                artifact=Artifact(artifact_id="page", parts=[Part(root=TextPart(text="<html>"))]),
+            ))
+            async for item in self.agent.invoke(query, task.context_id):
+                yield item
+
+        return items()
+
+
+def send_params(text: str = "hello") -> MessageSendParams:
+    return MessageSendParams(message=Message(
+        message_id=uuid4().hex,
+        role=Role.user,
+        parts=[Part(root=TextPart(text=text))],
+    ))
+
+
+def describe(event) -> str:
+    if isinstance(event, Task):
+        return "task"
+    if isinstance(event, TaskArtifactUpdateEvent):
+        parts = event.artifact.parts
+        return f"artifact:{parts[0].root.text if parts else ''}"
+    text = event.status.message.parts[0].root.text if event.status.message else ""
+    return f"{event.status.state.value}:{text.split(' (')[0]}"
+
+
+class StreamingAgentExecutorTest(unittest.IsolatedAsyncioTestCase):
+
+    async def stream(self, executor: StreamingAgentExecutor) -> list[str]:
+        handler = DefaultRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore())
+        return [describe(event) async for event in handler.on_message_send_stream(send_params())]
+
+    async def test_items_become_status_and_artifact_events(self):
+        agent = ScriptedAgent([
+            {"is_task_complete": False, "updates": "thinking"},
+            {"is_task_complete": False, "partial": "Hel"},
+            {"is_task_complete": False, "partial": "lo"},
+            {"is_task_complete": True, "content": "Hello"},
+        ])
+        events = await self.stream(StreamingAgentExecutor(agent, "scripted", status_interval=0))
+
+        self.assertEqual(events, [
+            "task",
+            "working:thinking",
+            "artifact:Hel",
+            "artifact:lo",
+            "artifact:",
+            "completed:Hello",
+        ])
+
+    async def test_failure_marks_the_task_failed(self):
+        agent = ScriptedAgent([], end="fail")
+        events = await self.stream(StreamingAgentExecutor(agent, "scripted"))
+
+        self.assertEqual(events[-1], "failed:An error occurred: model unavailable")
+
+    async def test_delegation_events_are_relayed(self):
+        agent = ScriptedAgent([{"is_task_complete": True, "content": "done"}])
+        events = await self.stream(RelayingExecutor(agent, "relaying", status_interval=0))
+
+        self.assertEqual(events, [
+            "task",
+            "working:[remote] drafting",
+            "artifact:<html>",
+            "completed:done",
+        ])
+
+    async def test_cancel_stops_the_running_execution(self):
+        agent = ScriptedAgent([{"is_task_complete": False, "updates": "working"}], end="hang")
+        executor = StreamingAgentExecutor(agent, "scripted", status_interval=0)
+        handler = DefaultRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore())
+
+        stream = handler.on_message_send_stream(send_params())
+        task = await anext(stream)
+        await agent.started.wait()
+
+        canceled = await handler.on_cancel_task(TaskIdParams(id=task.id))
+        self.assertEqual(canceled.status.state, TaskState.canceled)
+        self.assertEqual(executor._running, {})
+
+        # The stream ends with the cancellation
+        rest = [describe(event) async for event in stream]
+        self.assertEqual(rest[-1].split(":")[0], "canceled")
+
+    async def test_cancel_of_a_running_task_reports_once(self):
+        agent = ScriptedAgent([], end="hang")
+        executor = StreamingAgentExecutor(agent, "scripted")
+        queue = EventQueue()
+        context = RequestContext(send_params(), task_id="task", context_id="context")
+        running = asyncio.create_task(executor.execute(context, queue))
+        await agent.started.wait()
+
+        cancel_queue = EventQueue()
+        await executor.cancel(RequestContext(None, task_id="task", context_id="context"), cancel_queue)
+
+        self.assertTrue(running.cancelled())
+        self.assertTrue(cancel_queue.queue.empty())
+        events = []
+        while not queue.queue.empty():
+            events.append(describe(queue.queue.get_nowait()))
+        self.assertEqual([event for event in events if event.startswith("canceled")], ["canceled:"])
+
+    async def test_cancel_without_current_task(self):
+        executor = StreamingAgentExecutor(ScriptedAgent([]), "scripted")
+        queue = EventQueue()
+
+        await executor.cancel(RequestContext(None, task_id="task", context_id="context"), queue)
+
+        event = queue.queue.get_nowait()
+        self.assertEqual((event.task_id, event.context_id), ("task", "context"))
+        self.assertEqual(event.status.state, TaskState.canceled)
+
+
+if __name__ == "__main__":
+    unittest.main()
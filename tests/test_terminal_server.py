@@ -0,0 +1,112 @@
+import time
+import asyncio
+import tempfile
+import unittest
+import importlib.util
+from unittest import mock
+
+spec = importlib.util.spec_from_file_location(
+    "terminal_server", "mcp/servers/terminal_server/terminal_server.py"
+)
+terminal_server = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(terminal_server)
+
+
+class FakeClient:
+    """Stands in for an MCP ServerSession (only its identity is used)"""
+
+
+class FakeContext:
+    def __init__(self, client: FakeClient):
+        self.session = client
+
+
+class RunCommandTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.workspace = tempfile.TemporaryDirectory()
+        terminal_server.DEFAULT_WORKSPACE = self.workspace.name
+        terminal_server.shell_pool = terminal_server.ShellSessionPool(8, 600)
+        self.ctx = FakeContext(FakeClient())
+
+    async def asyncTearDown(self):
+        for session in list(terminal_server.shell_pool.sessions.values()):
+            await session.close()
+        self.workspace.cleanup()
+
+    async def run_command(self, command: str, ctx=None, **kwargs):
+        return await terminal_server.run_command(command, ctx or self.ctx, **kwargs)
+
+    async def test_commands_without_session_run_concurrently(self):
+        started = time.monotonic()
+        results = await asyncio.gather(*(
+            self.run_command("sleep 1; echo hi") for _ in range(4)
+        ))
+        self.assertLess(time.monotonic() - started, 2.5)
+        self.assertEqual([result.stdout for result in results], ["hi\n"] * 4)
+        self.assertEqual(len(terminal_server.shell_pool.sessions), 1)
+
+    async def test_commands_without_session_share_the_default_shell(self):
+        await self.run_command("export GREETING=hello")
+        result = await self.run_command("echo $GREETING")
+        self.assertEqual(result.stdout, "hello\n")
+
+    async def test_pooled_commands_start_no_process(self):
+        await self.run_command("true", session_id="s")
+
+        spawned = []
+        create = asyncio.create_subprocess_exec
+
+        async def counting(*args, **kwargs):
+            spawned.append(args)
+            return await create(*args, **kwargs)
+
+        with mock.patch.object(terminal_server.asyncio, "create_subprocess_exec", counting):
+            result = await self.run_command("echo one; echo two", session_id="s")
+            await self.run_command('echo "oops', session_id="s")
+
+        self.assertEqual(result.stdout, "one\ntwo\n")
+        self.assertEqual(spawned, [])
+
+    async def test_session_keeps_state(self):
+        await self.run_command("mkdir -p sub && cd sub && export GREETING=hello", session_id="s")
+        result = await self.run_command('basename "$PWD"; echo $GREETING', session_id="s")
+        self.assertEqual(result.stdout, "sub\nhello\n")
+
+    async def test_same_session_id_of_other_client_is_separate(self):
+        await self.run_command("export GREETING=hello", session_id="s")
+        other = FakeContext(FakeClient())
+        result = await self.run_command("echo \"[$GREETING]\"", ctx=other, session_id="s")
+        self.assertEqual(result.stdout, "[]\n")
+
+    async def test_busy_session_falls_back_to_one_off_process(self):
+        started = time.monotonic()
+        results = await asyncio.gather(*(
+            self.run_command("sleep 1; echo hi", session_id="s") for _ in range(3)
+        ))
+        self.assertLess(time.monotonic() - started, 2.5)
+        self.assertTrue(all(result.exit_code == 0 for result in results))
+
+    async def test_unterminated_quote_is_rejected_without_hanging(self):
+        result = await self.run_command('echo "oops', session_id="s", timeout=5)
+        self.assertFalse(result.timed_out)
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertIn("nterminated", result.stderr)
+
+        # The session's shell is still usable
+        result = await self.run_command("echo fine", session_id="s", timeout=5)
+        self.assertEqual(result.stdout, "fine\n")
+
+    async def test_unterminated_heredoc_does_not_swallow_the_sentinel(self):
+        result = await self.run_command("cat <<EOF\nline", session_id="s", timeout=5)
+        self.assertFalse(result.timed_out)
+        self.assertEqual(result.stdout.strip(), "line")
+
+    async def test_exit_code_and_stderr(self):
+        result = await self.run_command("echo bad >&2; exit 3", session_id="s")
+        self.assertEqual(result.exit_code, 3)
+        self.assertEqual(result.stderr, "bad\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
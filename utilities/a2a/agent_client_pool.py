@@ -0,0 +1,111 @@
+import asyncio
+import importlib.util
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from a2a.types import AgentCard
+from a2a.client import A2AClient
+
+
+class AgentClientPool:
+    """
+    Process-wide pool of keep-alive HTTP connections for A2A delegation.
+
+    One httpx.AsyncClient is kept per remote origin so that connection and
+    keep-alive limits apply per host, and one A2AClient is cached per agent
+    card so repeated delegations skip both the TCP/TLS handshake and the
+    client construction. Call `aclose()` on shutdown to release sockets.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 20,
+        max_keepalive_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 300.0,
+        http2: bool = False,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+
+        # HTTP/2 needs the optional `h2` package
+        if http2 and importlib.util.find_spec("h2") is None:
+            print("HTTP/2 requested but 'h2' is not installed; falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._a2a_clients: Dict[Tuple[str, str, str], A2AClient] = {}
+        self._closed = False
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def get_httpx_client(self, url: str) -> httpx.AsyncClient:
+        """
+        Returns the pooled HTTP client for the origin of `url`.
+
+        Args:
+            url (str): Any URL on the remote host
+
+        Returns:
+            httpx.AsyncClient: Shared client for that host
+        """
+        if self._closed:
+            raise RuntimeError("AgentClientPool is closed")
+
+        origin = self._origin(url)
+        client = self._clients.get(origin)
+
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+            )
+            self._clients[origin] = client
+
+        return client
+
+    def get_a2a_client(self, agent_card: AgentCard) -> A2AClient:
+        """
+        Returns the cached A2AClient for an agent card, building it on first use.
+
+        Args:
+            agent_card (AgentCard): Card of the remote agent
+
+        Returns:
+            A2AClient: Client bound to the pooled connection for the agent's host
+        """
+        key = (agent_card.name, agent_card.version, agent_card.url)
+        a2a_client = self._a2a_clients.get(key)
+
+        if a2a_client is None:
+            a2a_client = A2AClient(
+                httpx_client=self.get_httpx_client(agent_card.url),
+                agent_card=agent_card,
+            )
+            self._a2a_clients[key] = a2a_client
+
+        return a2a_client
+
+    async def aclose(self):
+        """
+        Closes every pooled connection.
+        """
+        self._closed = True
+        clients = list(self._clients.values())
+        self._clients.clear()
+        self._a2a_clients.clear()
+
+        await asyncio.gather(
+            *(client.aclose() for client in clients),
+            return_exceptions=True,
+        )
@@ -1,8 +1,70 @@
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
 from uuid import uuid4
-from a2a.types import AgentCard, SendMessageRequest, MessageSendParams
+from a2a.types import (
+    AgentCard,
+    SendMessageRequest,
+    SendStreamingMessageRequest,
+    CancelTaskRequest,
+    TaskIdParams,
+    MessageSendParams,
+    JSONRPCErrorResponse,
+    Message,
+    Task,
+    TaskStatusUpdateEvent,
+    TaskArtifactUpdateEvent,
+)
 import httpx
 from a2a.client import A2AClient
+from opentelemetry.trace import SpanKind
+
+from utilities.a2a.agent_client_pool import AgentClientPool
+from utilities.common.telemetry import DELEGATION_SECONDS, timed, trace_headers
+
+
+# Events yielded by a streaming delegation
+StreamEvent = Task | Message | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
+
+
+@dataclass
+class SendResult:
+    """
+    Outcome of a non-streaming delegation.
+
+    Attributes:
+        text (str): The agent's answer
+        task_id (str, optional): Id of the remote task, if the agent created one
+        state (str, optional): Final state of the remote task, e.g. "completed"
+    """
+    text: str
+    task_id: Optional[str] = None
+    state: Optional[str] = None
+
+
+def event_text(event: StreamEvent) -> str:
+    """
+    Extract the concatenated text parts carried by a streaming event.
+
+    Args:
+        event (StreamEvent): Event received from a remote agent
+
+    Returns:
+        str: Text of the event's message or artifact, or "" if it has none
+    """
+    parts = []
+    if isinstance(event, TaskStatusUpdateEvent) and event.status.message:
+        parts = event.status.message.parts
+    elif isinstance(event, TaskArtifactUpdateEvent):
+        parts = event.artifact.parts
+    elif isinstance(event, Message):
+        parts = event.parts
+    elif isinstance(event, Task) and event.status.message:
+        parts = event.status.message.parts
+
+    return "".join(
+        part.root.text for part in parts
+        if getattr(part.root, "text", None)
+    )
 
 
 class AgentConnector:
@@ -10,8 +72,18 @@ class AgentConnector:
     Connects to a remote A2A agent and provides a uniform way to delegate tasks
     """
 
-    def __init__(self, agent_card: AgentCard):
+    def __init__(self, agent_card: AgentCard, pool: AgentClientPool | None = None):
         self.agent_card = agent_card
+        self.pool = pool
+        # Id of the remote task created by the last stream_task call
+        self.remote_task_id: str | None = None
+
+    def _span_attributes(self, **extra: Any) -> dict[str, Any]:
+        return {
+            "a2a.agent": self.agent_card.name,
+            "url.full": self.agent_card.url,
+            **extra,
+        }
 
     async def send_task(
         self,
@@ -24,17 +96,44 @@ class AgentConnector:
 
         Args:
             message (str): The message to send to the agent
-            session_id (str): The session ID for tracking the task
+            session_id (str): The session (A2A context) the message belongs to
             httpx_client (httpx.AsyncClient, optional): Shared HTTP client
 
         Returns:
             str: The response from the agent
         """
+        result = await self.send_task_result(message, session_id, httpx_client)
+        return result.text
 
-        # Use provided client or create a new one
+    async def send_task_result(
+        self,
+        message: str,
+        session_id: str,
+        httpx_client: httpx.AsyncClient | None = None
+    ) -> SendResult:
+        """
+        Like `send_task`, but also returns the remote task's id and state
+
+        Args:
+            message (str): The message to send to the agent
+            session_id (str): The session (A2A context) the message belongs to
+            httpx_client (httpx.AsyncClient, optional): Shared HTTP client
+
+        Returns:
+            SendResult: The response text, task id and task state
+        """
+
+        # Use provided client, then the shared pool, or create a new one
         if httpx_client:
             return await self._send_with_client(httpx_client, message, session_id)
 
+        if self.pool:
+            return await self._send(
+                self.pool.get_a2a_client(self.agent_card),
+                message,
+                session_id
+            )
+
         async with httpx.AsyncClient(timeout=300.0) as new_client:
             return await self._send_with_client(new_client, message, session_id)
 
@@ -43,16 +142,22 @@ class AgentConnector:
         client: httpx.AsyncClient,
         message: str,
         session_id: str
-    ) -> str:
+    ) -> SendResult:
         a2a_client = A2AClient(
             httpx_client=client,
             agent_card=self.agent_card,
         )
 
-        # ✅ Corrected payload structure
+        return await self._send(a2a_client, message, session_id)
+
+    @staticmethod
+    def _message_params(message: str, session_id: str) -> MessageSendParams:
+        # ✅ Corrected payload structure; the session is the A2A context,
+        # so follow-up messages continue the same conversation
         send_message_payload: dict[str, Any] = {
             "message": {
                 "messageId": str(uuid4()),
+                "contextId": session_id,
                 "role": "user",
                 "parts": [
                     {
@@ -62,20 +167,181 @@ class AgentConnector:
             }
         }
 
+        return MessageSendParams(**send_message_payload)
+
+    async def stream_task(
+        self,
+        message: str,
+        session_id: str,
+        httpx_client: httpx.AsyncClient | None = None
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Send a task to the agent over the A2A streaming endpoint and yield
+        status and artifact events as the remote agent produces them
+
+        Args:
+            message (str): The message to send to the agent
+            session_id (str): The session (A2A context) the message belongs to
+            httpx_client (httpx.AsyncClient, optional): Shared HTTP client
+
+        Yields:
+            StreamEvent: Task, Message, TaskStatusUpdateEvent or TaskArtifactUpdateEvent
+
+        Raises:
+            RuntimeError: If the remote agent answers with a JSON-RPC error
+        """
+
+        if httpx_client:
+            a2a_client = A2AClient(
+                httpx_client=httpx_client,
+                agent_card=self.agent_card,
+            )
+            async for event in self._stream(a2a_client, message, session_id):
+                yield event
+            return
+
+        if self.pool:
+            a2a_client = self.pool.get_a2a_client(self.agent_card)
+            async for event in self._stream(a2a_client, message, session_id):
+                yield event
+            return
+
+        async with httpx.AsyncClient(timeout=300.0) as new_client:
+            a2a_client = A2AClient(
+                httpx_client=new_client,
+                agent_card=self.agent_card,
+            )
+            async for event in self._stream(a2a_client, message, session_id):
+                yield event
+
+    async def _stream(
+        self,
+        a2a_client: A2AClient,
+        message: str,
+        session_id: str
+    ) -> AsyncIterator[StreamEvent]:
+        request = SendStreamingMessageRequest(
+            id=str(uuid4()),
+            params=self._message_params(message, session_id)
+        )
+
+        # Not attached: the consumer may close this generator from elsewhere
+        with timed(
+            DELEGATION_SECONDS,
+            "a2a.stream_message",
+            kind=SpanKind.CLIENT,
+            attributes=self._span_attributes(),
+            attach=False,
+            agent=self.agent_card.name,
+            method="stream",
+        ) as span:
+            async for response in a2a_client.send_message_streaming(
+                request=request,
+                http_kwargs={"headers": trace_headers(span)}
+            ):
+                if isinstance(response.root, JSONRPCErrorResponse):
+                    raise RuntimeError(
+                        f"Agent '{self.agent_card.name}' returned an error: "
+                        f"{response.root.error.message}"
+                    )
+
+                event = response.root.result
+                if isinstance(event, Task):
+                    self.remote_task_id = event.id
+                elif isinstance(event, (TaskStatusUpdateEvent, TaskArtifactUpdateEvent)):
+                    self.remote_task_id = event.task_id
+                if self.remote_task_id:
+                    span.set_attribute("a2a.task_id", self.remote_task_id)
+                yield event
+
+    async def cancel_task(
+        self,
+        task_id: str,
+        httpx_client: httpx.AsyncClient | None = None
+    ) -> bool:
+        """
+        Ask the remote agent to cancel one of its tasks
+
+        Args:
+            task_id (str): Id of the remote task
+            httpx_client (httpx.AsyncClient, optional): Shared HTTP client
+
+        Returns:
+            bool: True if the agent accepted the cancellation
+        """
+        request = CancelTaskRequest(
+            id=str(uuid4()),
+            params=TaskIdParams(id=task_id)
+        )
+
+        with timed(
+            DELEGATION_SECONDS,
+            "a2a.cancel_task",
+            kind=SpanKind.CLIENT,
+            attributes=self._span_attributes(**{"a2a.task_id": task_id}),
+            agent=self.agent_card.name,
+            method="cancel",
+        ):
+            http_kwargs = {"headers": trace_headers()}
+
+            if httpx_client:
+                a2a_client = A2AClient(httpx_client=httpx_client, agent_card=self.agent_card)
+                response = await a2a_client.cancel_task(request=request, http_kwargs=http_kwargs)
+            elif self.pool:
+                a2a_client = self.pool.get_a2a_client(self.agent_card)
+                response = await a2a_client.cancel_task(request=request, http_kwargs=http_kwargs)
+            else:
+                async with httpx.AsyncClient(timeout=30.0) as new_client:
+                    a2a_client = A2AClient(httpx_client=new_client, agent_card=self.agent_card)
+                    response = await a2a_client.cancel_task(request=request, http_kwargs=http_kwargs)
+
+        if isinstance(response.root, JSONRPCErrorResponse):
+            print(
+                f"Agent '{self.agent_card.name}' refused to cancel task "
+                f"{task_id}: {response.root.error.message}"
+            )
+            return False
+        return True
+
+    async def _send(
+        self,
+        a2a_client: A2AClient,
+        message: str,
+        session_id: str
+    ) -> SendResult:
         # ✅ Build request
         request = SendMessageRequest(
             id=str(uuid4()),
-            params=MessageSendParams(
-                **send_message_payload
-            )
+            params=self._message_params(message, session_id)
         )
 
-        # ✅ Send message
-        response = await a2a_client.send_message(request=request)
+        # ✅ Send message (continuing our trace on the remote agent)
+        with timed(
+            DELEGATION_SECONDS,
+            "a2a.send_message",
+            kind=SpanKind.CLIENT,
+            attributes=self._span_attributes(),
+            agent=self.agent_card.name,
+            method="send",
+        ):
+            response = await a2a_client.send_message(
+                request=request,
+                http_kwargs={"headers": trace_headers()}
+            )
+
+            if isinstance(response.root, JSONRPCErrorResponse):
+                raise RuntimeError(
+                    f"Agent '{self.agent_card.name}' returned an error: "
+                    f"{response.root.error.message}"
+                )
 
         # ✅ Convert response to JSON
         response_data = response.model_dump(mode="json", exclude_none=True)
 
+        result = response.root.result
+        task_id = result.id if isinstance(result, Task) else result.task_id
+        state = result.status.state.value if isinstance(result, Task) else None
+
         # ✅ Safely extract text
         try:
             agent_response = (
@@ -102,4 +368,4 @@ class AgentConnector:
         except (KeyError, IndexError, TypeError) as e:
             agent_response = f"Error parsing agent response: {str(e)}"
 
-        return agent_response
\ No newline at end of file
+        return SendResult(text=agent_response, task_id=task_id, state=state)
\ No newline at end of file
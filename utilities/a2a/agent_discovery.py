@@ -1,19 +1,88 @@
 import os
 import json
-from typing import List
+import time
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 from a2a.types import AgentCard
-from a2a.client import A2ACardResolver
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from opentelemetry.trace import SpanKind
 
 import httpx
 
+from utilities.common.telemetry import DISCOVERY_FETCH_SECONDS, tracer
+
+
+@dataclass
+class CachedAgentCard:
+    """
+    An agent card together with the validators needed to revalidate it.
+    """
+    card: AgentCard
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class DiscoveryStatus:
+    """
+    Outcome of resolving a single registry URL.
+
+    Attributes:
+        url (str): Registry base URL
+        status (str): "ok", "timeout" or "error"
+        latency (float): Seconds spent on the fetch
+        error (str, optional): Error description when status is not "ok"
+    """
+    url: str
+    status: str
+    latency: float
+    error: Optional[str] = None
+
+
+@dataclass
+class DiscoveryResult:
+    """
+    Cards resolved by a discovery pass plus the per-URL status report.
+    Cards are partial when some URLs failed or missed the deadline.
+    """
+    cards: List[AgentCard]
+    statuses: List[DiscoveryStatus] = field(default_factory=list)
+
 
 class AgentDiscovery:
     """
     Discovers A2A Agents by reading a registry file of URLs and
-    querying each one's /.well-known/agent.json endpoint to retrieve an AgentCard.
+    querying each one's /.well-known/agent-card.json endpoint to retrieve an AgentCard.
+
+    Cards are cached per base URL for `cache_ttl` seconds. Once a card is older
+    than that it is still served for up to `stale_ttl` more seconds while a
+    background refresh revalidates it with ETag / Last-Modified headers.
+    Each card expires on its own: the card of an agent that stays down is
+    dropped after `cache_ttl + stale_ttl` seconds even while others answer.
+
+    A lookup of an unknown name forces a refresh at most once every
+    `min_refresh_interval` seconds, so names that match no agent cannot
+    turn every lookup into a discovery pass.
+
+    Refreshes fan out to at most `max_concurrency` agents at a time. Each fetch
+    is bounded by `connect_timeout` / `read_timeout`, and the whole pass by
+    `deadline`; agents that miss it are reported as timed out and their
+    previously cached card (if any) is kept.
     """
 
-    def __init__(self, registry_file: str = None):
+    def __init__(
+        self,
+        registry_file: str = None,
+        cache_ttl: float = 60.0,
+        stale_ttl: float = 300.0,
+        max_concurrency: int = 10,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 5.0,
+        deadline: float = 10.0,
+        min_refresh_interval: float = 10.0,
+    ):
         # Set registry file path
         if registry_file:
             self.registry_file = registry_file
@@ -26,6 +95,28 @@ class AgentDiscovery:
         # Load base URLs
         self.base_urls = self._load_registry()
 
+        # Card cache
+        self.cache_ttl = cache_ttl
+        self.stale_ttl = stale_ttl
+        self._cache: Dict[str, CachedAgentCard] = {}
+        # lowercase agent name -> base URL of its cached card
+        self._name_index: Dict[str, str] = {}
+        self._refreshed_at: Optional[float] = None
+        self._attempted_at: Optional[float] = None
+        self.min_refresh_interval = min_refresh_interval
+        self._forced_at: Optional[float] = None
+        self._refresh_lock = asyncio.Lock()
+        self._background_refresh: Optional[asyncio.Task] = None
+
+        # Discovery limits
+        self.max_concurrency = max_concurrency
+        self.timeout = httpx.Timeout(
+            read_timeout,
+            connect=connect_timeout,
+        )
+        self.deadline = deadline
+        self.last_statuses: Dict[str, DiscoveryStatus] = {}
+
     def _load_registry(self) -> List[str]:
         """
         Load and parse the registry JSON file into a list of URLs
@@ -52,25 +143,267 @@ class AgentDiscovery:
             print(f"Error loading registry file: {e}")
             return []
 
-    async def list_agent_cards(self) -> List[AgentCard]:
+    # ---------------- CACHE STATE ---------------- #
+
+    def _age(self) -> Optional[float]:
+        """
+        Seconds since the last refresh that reached at least one agent, or
+        None if there was none.
+        """
+        if self._refreshed_at is None:
+            return None
+        return time.monotonic() - self._refreshed_at
+
+    def _is_fresh(self) -> bool:
+        age = self._age()
+        return age is not None and age < self.cache_ttl
+
+    def _is_servable(self) -> bool:
+        age = self._age()
+        return age is not None and age < self.cache_ttl + self.stale_ttl
+
+    def _card_servable(self, cached: CachedAgentCard) -> bool:
+        """True until the card has gone unconfirmed for the whole stale window"""
+        return time.monotonic() - cached.fetched_at < self.cache_ttl + self.stale_ttl
+
+    def _cached_cards(self) -> List[AgentCard]:
+        return [
+            self._cache[url].card
+            for url in self.base_urls
+            if url in self._cache and self._card_servable(self._cache[url])
+        ]
+
+    def _rebuild_index(self) -> None:
+        self._name_index = {
+            self._cache[url].card.name.lower(): url
+            for url in self.base_urls
+            if url in self._cache
+        }
+
+    def _lookup(self, agent_name: str) -> Optional[AgentCard]:
+        url = self._name_index.get(agent_name.lower())
+        cached = self._cache.get(url) if url else None
+        if cached is None or not self._card_servable(cached):
+            return None
+        return cached.card
+
+    def invalidate(self) -> None:
         """
-        Query each base URL to retrieve its agent card.
+        Drops every cached card so the next lookup goes back to the network.
         """
+        self._cache.clear()
+        self._name_index.clear()
+        self._refreshed_at = None
+        self._attempted_at = None
+        self._forced_at = None
 
-        cards: List[AgentCard] = []
+    # ---------------- FETCHING ---------------- #
 
-        async with httpx.AsyncClient(timeout=300.0) as httpx_client:
-            for base_url in self.base_urls:   # ✅ FIXED name
-                try:
-                    resolver = A2ACardResolver(
-                        base_url=base_url.rstrip("/"),
-                        httpx_client=httpx_client
+    async def _fetch_card(
+        self,
+        httpx_client: httpx.AsyncClient,
+        base_url: str
+    ) -> None:
+        """
+        Fetch (or revalidate) the card for one base URL and update the cache.
+        """
+        cached = self._cache.get(base_url)
+        headers = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+        response = await httpx_client.get(
+            f"{base_url.rstrip('/')}{AGENT_CARD_WELL_KNOWN_PATH}",
+            headers=headers,
+        )
+
+        if response.status_code == 304 and cached:
+            cached.fetched_at = time.monotonic()
+            return
+
+        response.raise_for_status()
+
+        self._cache[base_url] = CachedAgentCard(
+            card=AgentCard.model_validate(response.json()),
+            fetched_at=time.monotonic(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    async def _resolve(
+        self,
+        httpx_client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        base_url: str
+    ) -> DiscoveryStatus:
+        """
+        Fetch one card under the concurrency limit and report how it went.
+        """
+        async with semaphore:
+            with tracer.start_as_current_span(
+                "a2a.discovery.fetch",
+                kind=SpanKind.CLIENT,
+                attributes={"url.full": base_url},
+            ) as span:
+                status = await self._timed_fetch(httpx_client, base_url)
+                span.set_attribute("a2a.discovery.status", status.status)
+
+            DISCOVERY_FETCH_SECONDS.observe(status.latency, status=status.status)
+            return status
+
+    async def _timed_fetch(
+        self,
+        httpx_client: httpx.AsyncClient,
+        base_url: str
+    ) -> DiscoveryStatus:
+        started = time.monotonic()
+        try:
+            await self._fetch_card(httpx_client, base_url)
+            return DiscoveryStatus(
+                url=base_url,
+                status="ok",
+                latency=time.monotonic() - started,
+            )
+        except httpx.TimeoutException as e:
+            return DiscoveryStatus(
+                url=base_url,
+                status="timeout",
+                latency=time.monotonic() - started,
+                error=str(e) or type(e).__name__,
+            )
+        except Exception as e:
+            return DiscoveryStatus(
+                url=base_url,
+                status="error",
+                latency=time.monotonic() - started,
+                error=str(e) or type(e).__name__,
+            )
+
+    async def discover(self) -> DiscoveryResult:
+        """
+        Query every base URL concurrently to retrieve (or revalidate) its
+        agent card, rebuild the name index and return the per-URL report.
+
+        Callers that queue up behind an in-progress refresh reuse its result.
+        A pass in which every fetch failed does not make the cache fresh, so
+        the next lookup tries again instead of serving the empty result.
+        """
+
+        requested_at = time.monotonic()
+
+        async with self._refresh_lock:
+            if self._attempted_at is not None and self._attempted_at >= requested_at:
+                return DiscoveryResult(
+                    cards=self._cached_cards(),
+                    statuses=list(self.last_statuses.values()),
+                )
+
+            started = time.monotonic()
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async with httpx.AsyncClient(timeout=self.timeout) as httpx_client:
+                pending = {
+                    asyncio.create_task(
+                        self._resolve(httpx_client, semaphore, base_url)
+                    ): base_url
+                    for base_url in self.base_urls
+                }
+                done, not_done = (
+                    await asyncio.wait(pending, timeout=self.deadline)
+                    if pending else (set(), set())
+                )
+
+                for task in not_done:
+                    task.cancel()
+                if not_done:
+                    await asyncio.gather(*not_done, return_exceptions=True)
+
+            statuses: Dict[str, DiscoveryStatus] = {}
+            for task, base_url in pending.items():
+                if task in done:
+                    statuses[base_url] = task.result()
+                else:
+                    statuses[base_url] = DiscoveryStatus(
+                        url=base_url,
+                        status="timeout",
+                        latency=time.monotonic() - started,
+                        error=f"discovery deadline of {self.deadline}s exceeded",
+                    )
+
+            for status in statuses.values():
+                if status.status != "ok":
+                    print(
+                        f"Failed to fetch agent card from {status.url} "
+                        f"({status.status}): {status.error}"
                     )
 
-                    card = await resolver.get_agent_card()
-                    cards.append(card)
+            self.last_statuses = statuses
+            self._rebuild_index()
+            self._attempted_at = time.monotonic()
+            if not statuses or any(status.status == "ok" for status in statuses.values()):
+                self._refreshed_at = self._attempted_at
 
-                except Exception as e:
-                    print(f"Failed to fetch agent card from {base_url}: {e}")
+            return DiscoveryResult(
+                cards=self._cached_cards(),
+                statuses=list(statuses.values()),
+            )
+
+    async def refresh(self) -> List[AgentCard]:
+        """
+        Re-run discovery and return the cards that could be resolved.
+        """
+        result = await self.discover()
+        return result.cards
+
+    def _schedule_background_refresh(self) -> None:
+        if self._background_refresh and not self._background_refresh.done():
+            return
+        self._background_refresh = asyncio.create_task(self.refresh())
+
+    # ---------------- PUBLIC API ---------------- #
+
+    async def list_agent_cards(self, force_refresh: bool = False) -> List[AgentCard]:
+        """
+        Return the agent card of every registered agent.
+
+        Fresh cards are served from the cache without network traffic. Stale
+        cards are served immediately while a background refresh revalidates
+        them; anything older than the stale window is refetched inline.
+        """
+
+        if not force_refresh:
+            if self._is_fresh():
+                return self._cached_cards()
+
+            if self._is_servable():
+                self._schedule_background_refresh()
+                return self._cached_cards()
+
+        return await self.refresh()
+
+    async def get_agent_card(self, agent_name: str) -> Optional[AgentCard]:
+        """
+        Look up an agent card by (case-insensitive) name. A name missing
+        from the cache triggers one refresh (at most one per
+        `min_refresh_interval`), so newly registered or restarted agents
+        are found before their cached cards expire.
+
+        Args:
+            agent_name (str): Name advertised in the agent's card
+
+        Returns:
+            AgentCard | None: The matching card, or None if no agent has that name
+        """
+        await self.list_agent_cards()
+        card = self._lookup(agent_name)
 
-        return cards
\ No newline at end of file
+        now = time.monotonic()
+        if card is None and (
+            self._forced_at is None or now - self._forced_at >= self.min_refresh_interval
+        ):
+            self._forced_at = now
+            await self.list_agent_cards(force_refresh=True)
+            card = self._lookup(agent_name)
+        return card
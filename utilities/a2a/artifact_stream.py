@@ -0,0 +1,57 @@
+from typing import Optional
+from uuid import uuid4
+
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Part, TextPart
+
+
+class ArtifactStream:
+    """
+    Streams text into a single A2A artifact: the first chunk creates the
+    artifact, later chunks are appended to it, and `close()` marks the
+    last chunk.
+    """
+
+    def __init__(self, updater: TaskUpdater, name: str = "response"):
+        self.updater = updater
+        self.name = name
+        self.artifact_id: Optional[str] = None
+        self.closed = False
+
+    @property
+    def started(self) -> bool:
+        return self.artifact_id is not None
+
+    async def append(self, text: str):
+        """
+        Sends one text chunk as an artifact-update event.
+        """
+        if not text or self.closed:
+            return
+
+        append = self.started
+        if not append:
+            self.artifact_id = str(uuid4())
+
+        await self.updater.add_artifact(
+            [Part(root=TextPart(text=text))],
+            artifact_id=self.artifact_id,
+            name=self.name,
+            append=append,
+        )
+
+    async def close(self):
+        """
+        Marks the artifact complete (no-op if nothing was streamed).
+        """
+        if not self.started or self.closed:
+            return
+
+        self.closed = True
+        await self.updater.add_artifact(
+            [],
+            artifact_id=self.artifact_id,
+            name=self.name,
+            append=True,
+            last_chunk=True,
+        )
@@ -0,0 +1,206 @@
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from a2a.types import AgentCard
+
+# Skill tag an agent card uses to declare that equal requests get equal answers
+DETERMINISTIC_TAG = "deterministic"
+
+# Receives the events of an in-flight delegation, e.g. (agent_name, event)
+Listener = Callable[..., Awaitable[None]]
+
+
+@dataclass
+class _InFlight:
+    task: Optional[asyncio.Task] = None
+    waiters: int = 0
+    # Listeners of the callers currently waiting
+    listeners: list[Listener] = field(default_factory=list)
+
+    async def emit(self, *args: Any):
+        """
+        Passes an event to every waiting caller's listener. A failing
+        listener is reported and skipped, so it cannot fail the shared call.
+        """
+        for listener in list(self.listeners):
+            try:
+                await listener(*args)
+            except Exception as e:
+                print(f"Delegation listener failed: {e}")
+
+
+class DelegationCache:
+    """
+    Idempotency layer in front of A2A delegation.
+
+    Requests are keyed on the target agent's identity (card name, version
+    and url) and a hash of the message.
+
+    - Concurrent identical requests are coalesced: one call is sent and
+      every caller receives its result. The call is only cancelled once
+      every caller waiting on it has been cancelled.
+    - Events the call streams are passed to the listener of every caller
+      while it waits (a caller that joins late misses earlier events).
+    - Successful results are memoized for the agent's TTL: the entry in
+      `agent_ttls` if there is one, `deterministic_ttl` if any skill on the
+      agent's card is tagged "deterministic", otherwise `default_ttl`
+      (0 disables memoization, coalescing still applies).
+    """
+
+    def __init__(
+        self,
+        default_ttl: float = 0.0,
+        deterministic_ttl: float = 3600.0,
+        agent_ttls: Optional[dict[str, float]] = None,
+        max_entries: int = 1000
+    ):
+        self.default_ttl = default_ttl
+        self.deterministic_ttl = deterministic_ttl
+        self.agent_ttls = dict(agent_ttls or {})
+        self.max_entries = max_entries
+
+        # key -> (result, expires_at)
+        self._results: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._inflight: dict[str, _InFlight] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def key(card: AgentCard, message: str) -> str:
+        """
+        Identity of a delegation: agent name, version and url plus a hash
+        of the (whitespace-trimmed) message.
+        """
+        message_hash = hashlib.sha256(message.strip().encode("utf-8")).hexdigest()
+        return f"{card.name}|{card.version}|{card.url}|{message_hash}"
+
+    def ttl_for(self, card: AgentCard) -> float:
+        """
+        Returns how long results from an agent may be reused.
+        """
+        if card.name in self.agent_ttls:
+            return self.agent_ttls[card.name]
+
+        deterministic = any(
+            DETERMINISTIC_TAG in (skill.tags or [])
+            for skill in card.skills or []
+        )
+        return self.deterministic_ttl if deterministic else self.default_ttl
+
+    def _cached(self, key: str) -> Optional[str]:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+
+        result, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._results[key]
+            return None
+
+        self._results.move_to_end(key)
+        return result
+
+    def _store(self, key: str, result: str, ttl: float):
+        self._results[key] = (result, time.monotonic() + ttl)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    async def run(
+        self,
+        card: AgentCard,
+        message: str,
+        send: Callable[[Listener], Awaitable[str]],
+        listener: Optional[Listener] = None
+    ) -> str:
+        """
+        Returns the result of delegating `message` to `card`, calling
+        `send(emit)` only if no cached or in-flight result can be reused.
+
+        Args:
+            card (AgentCard): Target agent
+            message (str): Message to delegate
+            send (Callable): Performs the actual delegation, passing the
+                events it receives to `emit`
+            listener (Listener, optional): Receives those events while this
+                caller waits
+
+        Returns:
+            str: The agent's answer
+        """
+        key = self.key(card, message)
+
+        cached = self._cached(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            self.misses += 1
+            inflight = _InFlight()
+            inflight.task = asyncio.create_task(self._send(key, card, send, inflight))
+            self._inflight[key] = inflight
+        else:
+            self.coalesced += 1
+
+        inflight.waiters += 1
+        if listener:
+            inflight.listeners.append(listener)
+        try:
+            return await asyncio.shield(inflight.task)
+        except asyncio.CancelledError:
+            # Abandon the call once nobody is waiting for it any more
+            if inflight.waiters == 1 and not inflight.task.done():
+                inflight.task.cancel()
+            raise
+        finally:
+            inflight.waiters -= 1
+            if listener:
+                inflight.listeners.remove(listener)
+
+    async def _send(
+        self,
+        key: str,
+        card: AgentCard,
+        send: Callable[[Listener], Awaitable[str]],
+        inflight: _InFlight
+    ) -> str:
+        try:
+            result = await send(inflight.emit)
+            ttl = self.ttl_for(card)
+            if ttl > 0:
+                self._store(key, result, ttl)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def invalidate(self, agent_name: Optional[str] = None):
+        """
+        Drops memoized results for one agent, or for all agents.
+        """
+        if agent_name is None:
+            self._results.clear()
+            return
+
+        prefix = f"{agent_name}|"
+        for key in [key for key in self._results if key.startswith(prefix)]:
+            del self._results[key]
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns hit, miss and coalescing counters.
+        """
+        return {
+            "entries": len(self._results),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+        }
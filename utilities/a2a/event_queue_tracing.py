@@ -0,0 +1,49 @@
+import time
+
+from opentelemetry import trace
+from a2a.server.events import Event, EventQueue
+from a2a.types import Task, TaskArtifactUpdateEvent, TaskStatusUpdateEvent
+
+from utilities.common.telemetry import EVENT_ENQUEUE_SECONDS
+
+
+def event_kind(event: Event) -> str:
+    """
+    Short label for an executor event, e.g. "status:working" or "artifact".
+    """
+    if isinstance(event, TaskStatusUpdateEvent):
+        return f"status:{event.status.state.value}"
+    if isinstance(event, TaskArtifactUpdateEvent):
+        return "artifact"
+    if isinstance(event, Task):
+        return "task"
+    return "message"
+
+
+def trace_event_queue(event_queue: EventQueue, agent_name: str) -> EventQueue:
+    """
+    Times every event an executor enqueues: the duration goes to
+    `a2a_event_enqueue_seconds` and each event is added to the current
+    span, so a trace shows when every update left the executor.
+    """
+    if getattr(event_queue, "_traced", False):
+        return event_queue
+
+    enqueue_event = event_queue.enqueue_event
+
+    async def traced_enqueue_event(event: Event):
+        started = time.perf_counter()
+        try:
+            await enqueue_event(event)
+        finally:
+            elapsed = time.perf_counter() - started
+            kind = event_kind(event)
+            EVENT_ENQUEUE_SECONDS.observe(elapsed, agent=agent_name, event=kind)
+
+            span = trace.get_current_span()
+            if span.is_recording():
+                span.add_event("enqueue", {"a2a.event": kind, "duration_ms": elapsed * 1000})
+
+    event_queue.enqueue_event = traced_enqueue_event
+    event_queue._traced = True
+    return event_queue
@@ -0,0 +1,563 @@
+import re
+import time
+import uuid
+import json
+import socket
+import asyncio
+import hashlib
+import sqlite3
+import itertools
+import multiprocessing
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Optional
+
+import httpx
+import uvicorn
+from uvicorn.importer import import_from_string
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+# JSON-RPC methods that address an existing task by id
+TASK_METHODS = {
+    "tasks/get",
+    "tasks/cancel",
+    "tasks/resubscribe",
+    "tasks/pushNotificationConfig/set",
+    "tasks/pushNotificationConfig/get",
+    "tasks/pushNotificationConfig/list",
+    "tasks/pushNotificationConfig/delete",
+}
+
+# JSON-RPC methods whose responses create tasks
+MESSAGE_METHODS = {"message/send", "message/stream"}
+
+# A2A error code for an unknown task id
+TASK_NOT_FOUND = -32001
+
+# Seconds the router waits for a worker's /ready or /metrics answer
+PROBE_TIMEOUT = 5.0
+
+# Metric name at the start of a Prometheus sample line
+METRIC_NAME = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+
+# Headers that describe a single hop and must not be forwarded
+HOP_HEADERS = {
+    "host",
+    "connection",
+    "keep-alive",
+    "content-length",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+def _merge_metrics(
+    families: OrderedDict[str, tuple[list[str], list[str]]],
+    text: str,
+    worker: str
+):
+    """
+    Adds one worker's Prometheus text to `families` (name -> (HELP/TYPE
+    lines, samples)), labelling its samples with the worker. Samples stay
+    grouped under their family, as the exposition format requires.
+    """
+    family = ""
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+
+        if line.startswith("#"):
+            fields = line.split(None, 3)
+            if len(fields) >= 3 and fields[1] in ("HELP", "TYPE"):
+                family = fields[2]
+                meta, _ = families.setdefault(family, ([], []))
+                if line not in meta:
+                    meta.append(line)
+            continue
+
+        match = METRIC_NAME.match(line)
+        if not match:
+            continue
+        name, rest = match.group(0), line[match.end():]
+        if rest.startswith("{}"):
+            rest = rest[2:]
+        if rest.startswith("{"):
+            labelled = f'{name}{{worker="{worker}",{rest[1:]}'
+        else:
+            labelled = f'{name}{{worker="{worker}"}}{rest}'
+
+        # Series of an undeclared family are grouped under their own name
+        key = family if name.startswith(family) and family else name
+        families.setdefault(key, ([], []))[1].append(labelled)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+AppFactory = Callable[..., Starlette]
+
+
+def _resolve_factory(app_factory: AppFactory | str) -> AppFactory:
+    if isinstance(app_factory, str):
+        return import_from_string(app_factory)
+    return app_factory
+
+
+def _run_worker(
+    app_factory: AppFactory | str,
+    factory_kwargs: dict[str, Any],
+    host: str,
+    port: int
+):
+    """
+    Entry point of a worker process: builds the agent app and serves it.
+    """
+    app = _resolve_factory(app_factory)(**factory_kwargs)
+    uvicorn.run(app, host=host, port=port, log_level="warning")
+
+
+class AffinityRouter:
+    """
+    Front-end that spreads A2A JSON-RPC requests over several worker
+    processes while keeping every conversation on one worker.
+
+    - message/send and message/stream are routed by a stable hash of the
+      message's contextId. Messages without one get a contextId assigned
+      here, so follow-ups land on the worker that holds the ADK session.
+    - tasks/* requests are routed by the context of the task. The router
+      records the context of every task id in the message responses it
+      relays, before the client sees the id; tasks it has not seen (e.g.
+      created before a restart) are looked up in the shared SQLite task
+      database the workers write to. A task found in neither is answered
+      with "task not found" here rather than guessed at, as a worker that
+      does not run a task cannot cancel or resubscribe to it.
+    - /ready and /metrics describe the whole server: /ready is answered
+      here (ready once every worker is) and /metrics merges the metrics of
+      all workers, each series labelled with its worker.
+    - Everything else (agent card, other probes) is spread round-robin.
+
+    Responses, including SSE streams, are relayed as they arrive.
+    """
+
+    def __init__(
+        self,
+        worker_urls: list[str],
+        task_db: Optional[str] = None,
+        lookup_retries: int = 3,
+        lookup_delay: float = 0.05,
+        max_tracked_tasks: int = 100_000
+    ):
+        self.worker_urls = worker_urls
+        self.task_db = task_db
+        self.lookup_retries = lookup_retries
+        self.lookup_delay = lookup_delay
+        self.max_tracked_tasks = max_tracked_tasks
+        self._round_robin = itertools.cycle(range(len(worker_urls)))
+        self._client: Optional[httpx.AsyncClient] = None
+        # task id -> context id, most recently created last
+        self._task_contexts: OrderedDict[str, str] = OrderedDict()
+
+    # ---------------- ROUTING ---------------- #
+
+    def worker_for_context(self, context_id: str) -> int:
+        """
+        Returns the index of the worker that owns a context.
+        """
+        digest = hashlib.sha1(context_id.encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % len(self.worker_urls)
+
+    def record_task(self, task_id: str, context_id: str):
+        """
+        Remembers the context of a task, so requests for it reach the
+        worker running it.
+        """
+        self._task_contexts[task_id] = context_id
+        self._task_contexts.move_to_end(task_id)
+        while len(self._task_contexts) > self.max_tracked_tasks:
+            self._task_contexts.popitem(last=False)
+
+    def _record_result(self, result: Any, context_id: str):
+        """Records the task of a JSON-RPC result or streamed event"""
+        if not isinstance(result, dict):
+            return
+        task_id = result.get("id") if result.get("kind") == "task" else result.get("taskId")
+        if isinstance(task_id, str) and task_id not in self._task_contexts:
+            self.record_task(task_id, result.get("contextId") or context_id)
+
+    async def _tap_tasks(self, chunks, context_id: str, streaming: bool):
+        """
+        Relays a message response while recording the tasks it names.
+        SSE events are parsed as they pass; a plain JSON body once complete.
+        """
+        buffer = b""
+        async for chunk in chunks:
+            buffer += chunk
+            if streaming:
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    line = line.strip()
+                    if line.startswith(b"data:"):
+                        try:
+                            self._record_result(json.loads(line[5:]).get("result"), context_id)
+                        except (ValueError, AttributeError):
+                            pass
+            yield chunk
+
+        if not streaming:
+            try:
+                self._record_result(json.loads(buffer).get("result"), context_id)
+            except (ValueError, AttributeError):
+                pass
+
+    def _read_task_context(self, task_id: str) -> Optional[str]:
+        try:
+            conn = sqlite3.connect(f"file:{self.task_db}?mode=ro", uri=True)
+        except sqlite3.Error:
+            return None
+
+        try:
+            row = conn.execute(
+                "SELECT context_id FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+        finally:
+            conn.close()
+
+    async def _task_context(self, task_id: str) -> Optional[str]:
+        """
+        Looks up the context of a task: first among the tasks relayed by
+        this router, then in the task database, waiting briefly in case a
+        worker's write has not landed yet.
+        """
+        if task_id in self._task_contexts:
+            return self._task_contexts[task_id]
+        if not self.task_db:
+            return None
+
+        for attempt in range(self.lookup_retries):
+            context_id = await asyncio.to_thread(self._read_task_context, task_id)
+            if context_id:
+                return context_id
+            if attempt + 1 < self.lookup_retries:
+                await asyncio.sleep(self.lookup_delay)
+        return None
+
+    async def _route(self, payload: Any) -> tuple[Optional[int], bool, Optional[str]]:
+        """
+        Picks a worker for a JSON-RPC payload.
+
+        Returns:
+            tuple[int | None, bool, str | None]: Worker index (None for a
+            task whose worker is unknown), whether the payload was modified,
+            and the context the payload was routed by
+        """
+        if not isinstance(payload, dict) or not isinstance(payload.get("params"), dict):
+            return next(self._round_robin), False, None
+
+        method = payload.get("method")
+        params = payload["params"]
+
+        if method in TASK_METHODS:
+            task_id = params.get("id") or params.get("taskId")
+            context_id = await self._task_context(task_id) if task_id else None
+            if context_id is None:
+                return None, False, None
+            return self.worker_for_context(context_id), False, context_id
+
+        message = params.get("message")
+        if not isinstance(message, dict):
+            return next(self._round_robin), False, None
+
+        modified = False
+        context_id = message.get("contextId")
+        if not context_id and message.get("taskId"):
+            context_id = await self._task_context(message["taskId"])
+        if not context_id:
+            # Pin new conversations to a context before any worker sees them
+            context_id = uuid.uuid4().hex
+        if message.get("contextId") != context_id:
+            message["contextId"] = context_id
+            modified = True
+
+        return self.worker_for_context(context_id), modified, context_id
+
+    # ---------------- PROXY ---------------- #
+
+    async def proxy(self, request: Request) -> Response:
+        body = await request.body()
+        payload = None
+        index = None
+        context_id = None
+
+        if request.method == "POST" and body:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                payload = None
+
+            if payload is not None:
+                index, modified, context_id = await self._route(payload)
+                if index is None:
+                    return JSONResponse({
+                        "jsonrpc": "2.0",
+                        "id": payload.get("id"),
+                        "error": {"code": TASK_NOT_FOUND, "message": "Task not found"},
+                    })
+                if modified:
+                    body = json.dumps(payload).encode("utf-8")
+
+        if index is None:
+            index = next(self._round_robin)
+
+        url = self.worker_urls[index] + request.url.path
+        if request.url.query:
+            url += "?" + request.url.query
+
+        headers = [
+            (key, value) for key, value in request.headers.items()
+            if key.lower() not in HOP_HEADERS
+        ]
+        upstream = self._client.build_request(
+            request.method,
+            url,
+            headers=headers,
+            content=body
+        )
+
+        try:
+            response = await self._client.send(upstream, stream=True)
+        except httpx.TransportError as e:
+            return JSONResponse(
+                {"error": f"Worker {index} is unavailable: {e}"},
+                status_code=502
+            )
+
+        content = response.aiter_raw()
+        if isinstance(payload, dict) and payload.get("method") in MESSAGE_METHODS and context_id:
+            content = self._tap_tasks(
+                content,
+                context_id,
+                streaming=payload["method"] == "message/stream",
+            )
+
+        return StreamingResponse(
+            content,
+            status_code=response.status_code,
+            headers={
+                key: value for key, value in response.headers.items()
+                if key.lower() not in HOP_HEADERS
+            },
+            background=BackgroundTask(response.aclose),
+        )
+
+    # ---------------- PROBES ---------------- #
+
+    async def _get_all(self, path: str) -> list[Optional[httpx.Response]]:
+        """GET `path` from every worker; None for a worker that did not answer"""
+
+        async def get(url: str) -> Optional[httpx.Response]:
+            try:
+                return await self._client.get(url + path, timeout=PROBE_TIMEOUT)
+            except httpx.HTTPError:
+                return None
+
+        return await asyncio.gather(*(get(url) for url in self.worker_urls))
+
+    async def ready(self, request: Request) -> JSONResponse:
+        """Readiness probe: 200 once every worker is ready, 503 before"""
+        responses = await self._get_all("/ready")
+        workers = [response is not None and response.status_code == 200 for response in responses]
+        return JSONResponse(
+            {"ready": all(workers), "workers": workers},
+            status_code=200 if all(workers) else 503
+        )
+
+    async def metrics(self, request: Request) -> PlainTextResponse:
+        """
+        Prometheus scrape endpoint: the metrics of every worker, each series
+        labelled worker="<index>", plus a2a_worker_up per worker.
+        """
+        families: OrderedDict[str, tuple[list[str], list[str]]] = OrderedDict()
+        up = []
+
+        for index, response in enumerate(await self._get_all("/metrics")):
+            ok = response is not None and response.status_code == 200
+            up.append(f'a2a_worker_up{{worker="{index}"}} {int(ok)}')
+            if ok:
+                _merge_metrics(families, response.text, str(index))
+
+        lines = [
+            "# HELP a2a_worker_up Whether the worker answered the metrics scrape",
+            "# TYPE a2a_worker_up gauge",
+            *up,
+        ]
+        for meta, samples in families.values():
+            lines.extend(meta)
+            lines.extend(samples)
+
+        return PlainTextResponse(
+            "\n".join(lines) + "\n",
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    def routes(self) -> list[Route]:
+        """Routes of the front-end app: the probes, then the proxy"""
+        methods = ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "HEAD"]
+        return [
+            Route("/ready", self.ready, methods=["GET"]),
+            Route("/metrics", self.metrics, methods=["GET"]),
+            Route("/{path:path}", self.proxy, methods=methods),
+        ]
+
+    async def open(self):
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(None, connect=5.0),
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+        )
+
+    async def aclose(self):
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+
+class WorkerSupervisor:
+    """
+    Starts the worker processes, waits until they accept connections and
+    restarts any that die while the router is running.
+    """
+
+    def __init__(
+        self,
+        app_factory: AppFactory | str,
+        factory_kwargs: dict[str, Any],
+        ports: list[int],
+        host: str = "127.0.0.1",
+        startup_timeout: float = 60.0
+    ):
+        self.app_factory = app_factory
+        self.factory_kwargs = factory_kwargs
+        self.ports = ports
+        self.host = host
+        self.startup_timeout = startup_timeout
+        self._context = multiprocessing.get_context("spawn")
+        self.processes: list[Optional[multiprocessing.Process]] = [None] * len(ports)
+        self._monitor: Optional[asyncio.Task] = None
+
+    def _spawn(self, index: int):
+        process = self._context.Process(
+            target=_run_worker,
+            args=(self.app_factory, self.factory_kwargs, self.host, self.ports[index]),
+            name=f"a2a-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[index] = process
+
+    async def _wait_listening(self, port: int):
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                _, writer = await asyncio.open_connection(self.host, port)
+                writer.close()
+                await writer.wait_closed()
+                return
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Worker on port {port} did not start")
+                await asyncio.sleep(0.1)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(1.0)
+            for index, process in enumerate(self.processes):
+                if process is not None and not process.is_alive():
+                    print(
+                        f"Worker {index} exited with code {process.exitcode}, restarting"
+                    )
+                    self._spawn(index)
+
+    async def start(self):
+        for index in range(len(self.ports)):
+            self._spawn(index)
+        await asyncio.gather(*(self._wait_listening(port) for port in self.ports))
+        self._monitor = asyncio.create_task(self._watch())
+
+    async def stop(self, timeout: float = 10.0):
+        if self._monitor:
+            self._monitor.cancel()
+            self._monitor = None
+
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+
+        for process in self.processes:
+            if process is not None:
+                await asyncio.to_thread(process.join, timeout)
+                if process.is_alive():
+                    process.kill()
+
+
+def serve(
+    app_factory: AppFactory | str,
+    host: str,
+    port: int,
+    workers: int = 1,
+    shared_task_db: Optional[str] = None,
+    **factory_kwargs
+):
+    """
+    Serves an A2A agent app on `host:port`.
+
+    With one worker the app is served directly. With more, `workers` copies
+    of the app run in separate processes on loopback ports behind an
+    AffinityRouter on `host:port`.
+
+    Args:
+        app_factory (Callable | str): Function building the Starlette app,
+            or its "module:function" import path. Worker processes are
+            spawned, so pass the import path when the factory lives in a
+            `__main__` module.
+        host (str): Public host
+        port (int): Public port
+        workers (int): Number of worker processes
+        shared_task_db (str, optional): SQLite task database the workers
+            share, used to route tasks/* requests to the worker owning the task
+        **factory_kwargs: Passed to `app_factory`
+    """
+    factory_kwargs = {"host": host, "port": port, **factory_kwargs}
+
+    if workers <= 1:
+        app = _resolve_factory(app_factory)(**factory_kwargs)
+        uvicorn.run(app, host=host, port=port)
+        return
+
+    worker_host = "127.0.0.1"
+    ports = [_free_port(worker_host) for _ in range(workers)]
+    supervisor = WorkerSupervisor(app_factory, factory_kwargs, ports, host=worker_host)
+    router = AffinityRouter(
+        [f"http://{worker_host}:{worker_port}" for worker_port in ports],
+        task_db=shared_task_db,
+    )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await router.open()
+        await supervisor.start()
+        print(f"Serving {workers} workers on ports {', '.join(map(str, ports))}")
+        yield
+        await supervisor.stop()
+        await router.aclose()
+
+    app = Starlette(routes=router.routes(), lifespan=lifespan)
+    uvicorn.run(app, host=host, port=port)
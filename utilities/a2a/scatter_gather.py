@@ -0,0 +1,150 @@
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, List, Optional
+
+STRATEGIES = ("all", "first", "quorum")
+
+
+@dataclass
+class BranchResult:
+    """
+    Outcome of one scatter-gather branch.
+
+    Attributes:
+        name (str): Branch label (the target agent name)
+        status (str): "ok", "error", "timeout" or "cancelled"
+        latency (float): Seconds the branch ran for
+        response (Any, optional): Branch return value when status is "ok"
+        error (str, optional): Error description otherwise
+    """
+    name: str
+    status: str
+    latency: float
+    response: Any = None
+    error: Optional[str] = None
+
+
+@dataclass
+class GatherResult:
+    """
+    Combined result of a scatter-gather call.
+
+    Attributes:
+        strategy (str): Strategy that was applied
+        required (int): Successful branches needed to satisfy the strategy
+        satisfied (bool): Whether that many branches succeeded
+        results (List[BranchResult]): One entry per branch, in input order
+    """
+    strategy: str
+    required: int
+    satisfied: bool
+    results: List[BranchResult]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+async def _run_branch(
+    name: str,
+    factory: Callable[[], Awaitable[Any]],
+    timeout: float
+) -> BranchResult:
+    started = time.monotonic()
+    try:
+        response = await asyncio.wait_for(factory(), timeout=timeout)
+        return BranchResult(
+            name=name,
+            status="ok",
+            latency=time.monotonic() - started,
+            response=response,
+        )
+    except asyncio.TimeoutError:
+        return BranchResult(
+            name=name,
+            status="timeout",
+            latency=time.monotonic() - started,
+            error=f"no response within {timeout}s",
+        )
+    except Exception as e:
+        return BranchResult(
+            name=name,
+            status="error",
+            latency=time.monotonic() - started,
+            error=str(e) or type(e).__name__,
+        )
+
+
+async def scatter_gather(
+    branches: List[tuple[str, Callable[[], Awaitable[Any]]]],
+    strategy: str = "all",
+    quorum: int = 1,
+    timeout: float = 120.0,
+) -> GatherResult:
+    """
+    Run several awaitables at once and combine their results.
+
+    Args:
+        branches: (name, factory) pairs; each factory starts one branch
+        strategy (str): "all" waits for every branch, "first" returns on the
+            first success and "quorum" returns once `quorum` branches succeed.
+            Branches still running at that point are cancelled.
+        quorum (int): Successes required by the "quorum" strategy
+        timeout (float): Per-branch timeout in seconds
+
+    Returns:
+        GatherResult: Per-branch outcomes plus whether the strategy was satisfied
+
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown strategy '{strategy}', expected one of {', '.join(STRATEGIES)}"
+        )
+
+    if strategy == "all":
+        required = len(branches)
+    elif strategy == "first":
+        required = 1
+    else:
+        required = max(1, min(quorum, len(branches)))
+
+    started = time.monotonic()
+    tasks = [
+        asyncio.create_task(_run_branch(name, factory, timeout))
+        for name, factory in branches
+    ]
+
+    successes = 0
+    pending = set(tasks)
+    try:
+        while pending and successes < required:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            successes += sum(1 for task in done if task.result().status == "ok")
+    finally:
+        # Cancel losing branches (or all of them if we were cancelled)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    results = []
+    for task, (name, _) in zip(tasks, branches):
+        if task.cancelled():
+            results.append(BranchResult(
+                name=name,
+                status="cancelled",
+                latency=time.monotonic() - started,
+            ))
+        else:
+            results.append(task.result())
+
+    return GatherResult(
+        strategy=strategy,
+        required=required,
+        satisfied=successes >= required,
+        results=results,
+    )
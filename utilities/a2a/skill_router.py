@@ -0,0 +1,270 @@
+import re
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from a2a.types import AgentCard
+
+from utilities.a2a.agent_discovery import AgentDiscovery
+
+# Words that say nothing about which agent should do a task, including
+# generic verbs that fit almost any request ("create a folder")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "could", "do", "for",
+    "from", "i", "in", "is", "it", "me", "my", "of", "on", "or", "please", "that",
+    "the", "this", "to", "us", "we", "with", "you", "your", "want", "would", "like",
+    "build", "create", "make", "generate", "write", "get", "give", "need", "help",
+    "new", "some", "named", "called", "simple", "basic",
+}
+
+# Term weights of the parts of a skill: what it is called and tagged with
+# says more than the wording of its examples
+FIELD_WEIGHTS = {"name": 3, "tags": 3, "description": 2, "examples": 1}
+
+# Shortest indexed term a compound query word is mapped to ("homepage" -> "page")
+MIN_COMPOUND_PART = 4
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens without stopwords, with plurals and "-ing"
+    forms folded ("websites" -> "website", "building" -> "build").
+    Identifiers are split, so "website_builder" gives two tokens.
+
+    Stopwords are dropped before folding: only the bare generic verb is
+    noise, so "build" is dropped while "building" and "builds" are kept.
+    """
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 5 and word.endswith("ing"):
+            word = word[:-3]
+        elif len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+@dataclass
+class RouteMatch:
+    """
+    An agent that matches a task.
+
+    Attributes:
+        agent_name (str): Name from the agent's card
+        score (float): BM25 score of the agent's best matching document
+        skill (str, optional): Name of the matching skill, None if the
+            card's own description matched best
+        terms (List[str]): Distinct task terms found in the agent's card
+        coverage (float): Share of the task's terms found in the card
+        described (bool): Whether a term matched a skill name, tag or
+            description (not only example text)
+    """
+    agent_name: str
+    score: float
+    skill: Optional[str] = None
+    terms: List[str] = field(default_factory=list)
+    coverage: float = 0.0
+    described: bool = False
+
+
+class SkillIndex:
+    """
+    BM25 index over agent cards. Each skill is one document (its name,
+    tags, description and examples, weighted by FIELD_WEIGHTS) and each
+    card one more (its name and description). An agent scores as its best
+    document.
+    """
+
+    def __init__(self, cards: List[AgentCard], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+        # (agent name, skill name or None) per document
+        self._documents: List[Tuple[str, Optional[str]]] = []
+        self._lengths: List[float] = []
+        # term -> [(document, weighted frequency, found outside examples)]
+        self._postings: Dict[str, List[Tuple[int, float, bool]]] = {}
+
+        for card in cards:
+            self._add(card.name, None, {
+                "name": [card.name],
+                "description": [card.description],
+            })
+            for skill in card.skills:
+                self._add(card.name, skill.name, {
+                    "name": [skill.name],
+                    "tags": skill.tags or [],
+                    "description": [skill.description],
+                    "examples": skill.examples or [],
+                })
+
+        count = len(self._documents)
+        self._average_length = sum(self._lengths) / count if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def _add(self, agent_name: str, skill: Optional[str], fields: Dict[str, List[str]]):
+        document = len(self._documents)
+        weights: Dict[str, float] = {}
+        described = set()
+
+        for name, texts in fields.items():
+            for term in tokenize(" ".join(text for text in texts if text)):
+                weights[term] = weights.get(term, 0.0) + FIELD_WEIGHTS[name]
+                if name != "examples":
+                    described.add(term)
+
+        self._documents.append((agent_name, skill))
+        self._lengths.append(sum(weights.values()))
+        for term, weight in weights.items():
+            self._postings.setdefault(term, []).append((document, weight, term in described))
+
+    def _index_term(self, word: str) -> Optional[str]:
+        """
+        The indexed term for a query word: the word itself, or for a
+        compound word the longest indexed term it starts or ends with
+        """
+        if word in self._postings:
+            return word
+
+        parts = [
+            term for term in self._postings
+            if len(term) >= MIN_COMPOUND_PART and (word.startswith(term) or word.endswith(term))
+        ]
+        return max(parts, key=len) if parts else None
+
+    def search(self, query: str, limit: int = 3) -> List[RouteMatch]:
+        """
+        Agents ranked by how well their skills match `query`.
+
+        Args:
+            query (str): Task description
+            limit (int): Most matches to return
+
+        Returns:
+            List[RouteMatch]: Best match first; agents matching no query term are left out
+        """
+        words = set(tokenize(query))
+        scores: Dict[int, float] = {}
+        # agent -> (matched words, words matched outside example text)
+        found: Dict[str, Tuple[set, set]] = {}
+
+        for word in words:
+            term = self._index_term(word)
+            if term is None:
+                continue
+
+            idf = self._idf[term]
+            for document, frequency, described in self._postings[term]:
+                norm = 1 - self.b + self.b * self._lengths[document] / self._average_length
+                scores[document] = scores.get(document, 0.0) + (
+                    idf * frequency * (self.k1 + 1) / (frequency + self.k1 * norm)
+                )
+
+                matched, matched_described = found.setdefault(
+                    self._documents[document][0], (set(), set())
+                )
+                matched.add(word)
+                if described:
+                    matched_described.add(word)
+
+        # Best document per agent
+        best: Dict[str, RouteMatch] = {}
+        for document, score in scores.items():
+            agent_name, skill = self._documents[document]
+            if agent_name not in best or score > best[agent_name].score:
+                matched, matched_described = found[agent_name]
+                best[agent_name] = RouteMatch(
+                    agent_name,
+                    score,
+                    skill,
+                    terms=sorted(matched),
+                    coverage=len(matched) / len(words),
+                    described=bool(matched_described),
+                )
+
+        ranked = sorted(best.values(), key=lambda match: match.score, reverse=True)
+        return ranked[:limit]
+
+
+def card_summary(card: AgentCard) -> Dict[str, Any]:
+    """
+    The parts of a card needed to choose an agent: name, description and
+    skill names, without examples, capabilities or endpoints.
+    """
+    return {
+        "name": card.name,
+        "description": card.description,
+        "skills": [skill.name for skill in card.skills],
+    }
+
+
+class SkillRouter:
+    """
+    Picks target agents for a task from the skills in their cards,
+    without a model call. The index is rebuilt when discovery returns a
+    different set of cards.
+
+    A match is confident when some task term is in a skill's name, tags
+    or description (not only in its examples), the card matches at least
+    two distinct task terms or a `min_coverage` share of them, and it
+    beats the runner-up's score by the factor `margin`.
+    """
+
+    def __init__(
+        self,
+        discovery: AgentDiscovery,
+        min_coverage: float = 0.5,
+        margin: float = 1.25
+    ):
+        self.discovery = discovery
+        self.min_coverage = min_coverage
+        self.margin = margin
+
+        self._index: Optional[SkillIndex] = None
+        self._indexed: Optional[Tuple[Tuple[str, str, str], ...]] = None
+
+    async def _current_index(self) -> SkillIndex:
+        cards = await self.discovery.list_agent_cards()
+        key = tuple((card.name, card.version, card.url) for card in cards)
+
+        if self._index is None or key != self._indexed:
+            self._index = SkillIndex(cards)
+            self._indexed = key
+        return self._index
+
+    async def route(self, task: str, limit: int = 3) -> List[RouteMatch]:
+        """
+        Agents ranked by how well their skills match `task`.
+
+        Args:
+            task (str): Task description
+            limit (int): Most matches to return
+
+        Returns:
+            List[RouteMatch]: Best match first
+        """
+        index = await self._current_index()
+        return index.search(task, limit)
+
+    def pick(self, matches: List[RouteMatch]) -> Optional[RouteMatch]:
+        """
+        The best match if it is confident, else None.
+        """
+        if not matches:
+            return None
+
+        best = matches[0]
+        if not best.described:
+            return None
+        if len(best.terms) < 2 and best.coverage < self.min_coverage:
+            return None
+        if len(matches) > 1 and matches[0].score < matches[1].score * self.margin:
+            return None
+        return matches[0]
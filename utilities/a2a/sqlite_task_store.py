@@ -0,0 +1,322 @@
+import os
+import time
+import asyncio
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import TaskStore
+from a2a.types import Task, TaskState
+
+# States after which a task no longer changes
+FINISHED_STATES = {
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+}
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    Durable A2A TaskStore backed by a local SQLite database in WAL mode.
+
+    - The `hot_set_size` most recently used tasks are kept in an in-memory LRU,
+      so active tasks are served without touching the database.
+    - Saves are coalesced per task and written in batches every
+      `flush_interval` seconds (or as soon as `max_batch` tasks are pending).
+    - Finished tasks older than `retention` seconds are deleted periodically.
+    - With `shared`, several worker processes use the database: a new task
+      is written at once so the others can look it up, and tasks another
+      worker saved are always read from the database, never from the hot set.
+
+    All database access happens on a single worker thread, so the event loop
+    never blocks on disk I/O. Call `close()` on shutdown to flush pending writes.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        hot_set_size: int = 1000,
+        flush_interval: float = 0.05,
+        max_batch: int = 256,
+        retention: float = 24 * 3600.0,
+        sweep_interval: float = 300.0,
+        shared: bool = False,
+    ):
+        self.db_path = db_path
+        self.hot_set_size = hot_set_size
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.retention = retention
+        self.sweep_interval = sweep_interval
+        self.shared = shared
+
+        self._hot: OrderedDict[str, Task] = OrderedDict()
+        self._pending: dict[str, Task] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="sqlite-task-store"
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        # Set when a save is queued, so an idle flusher sleeps
+        self._queued = asyncio.Event()
+        self._last_sweep = time.monotonic()
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._executor.submit(self._open).result()
+
+    # ---------------- DATABASE (worker thread) ---------------- #
+
+    def _open(self):
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id TEXT PRIMARY KEY,
+                context_id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_context_id ON tasks (context_id)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_finished_at ON tasks (finished_at)"
+        )
+        self._conn.commit()
+
+    def _write_batch(self, tasks: list[Task]):
+        now = time.time()
+        rows = [
+            (
+                task.id,
+                task.context_id,
+                task.status.state.value,
+                task.model_dump_json(exclude_none=True),
+                now,
+                now if task.status.state in FINISHED_STATES else None,
+            )
+            for task in tasks
+        ]
+        with self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO tasks (id, context_id, state, data, updated_at, finished_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    context_id = excluded.context_id,
+                    state = excluded.state,
+                    data = excluded.data,
+                    updated_at = excluded.updated_at,
+                    finished_at = COALESCE(tasks.finished_at, excluded.finished_at)
+                """,
+                rows,
+            )
+
+    def _read(self, task_id: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT data FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _read_context(self, context_id: str) -> list[str]:
+        rows = self._conn.execute(
+            "SELECT data FROM tasks WHERE context_id = ? ORDER BY updated_at",
+            (context_id,),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _delete(self, task_id: str):
+        with self._conn:
+            self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def _sweep(self, cutoff: float) -> list[str]:
+        """Deletes tasks finished before `cutoff` and returns their ids"""
+        with self._conn:
+            task_ids = [
+                row[0] for row in self._conn.execute(
+                    "SELECT id FROM tasks WHERE finished_at IS NOT NULL AND finished_at < ?",
+                    (cutoff,),
+                )
+            ]
+            self._conn.executemany(
+                "DELETE FROM tasks WHERE id = ?",
+                [(task_id,) for task_id in task_ids],
+            )
+        return task_ids
+
+    def _close_db(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    # ---------------- HOT SET ---------------- #
+
+    def _remember(self, task: Task):
+        self._hot[task.id] = task
+        self._hot.move_to_end(task.id)
+        while len(self._hot) > self.hot_set_size:
+            self._hot.popitem(last=False)
+
+    # ---------------- WRITE BATCHING ---------------- #
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            # Sleep until a save is queued or the next sweep is due
+            if not self._pending:
+                self._queued.clear()
+                next_sweep = self._last_sweep + self.sweep_interval - time.monotonic()
+                try:
+                    await asyncio.wait_for(self._queued.wait(), timeout=max(next_sweep, 0))
+                except asyncio.TimeoutError:
+                    pass
+
+            # Gather the saves of one flush interval, unless the batch fills first
+            if self._pending:
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        timeout=self.flush_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+
+            try:
+                await self.flush()
+
+                if time.monotonic() - self._last_sweep >= self.sweep_interval:
+                    self._last_sweep = time.monotonic()
+                    await self.sweep()
+            except Exception as e:
+                print(f"Task store flush failed: {e}")
+
+    async def sweep(self):
+        """
+        Deletes tasks that finished more than `retention` seconds ago, from
+        the database and from the hot set.
+        """
+        removed = await self._run(self._sweep, time.time() - self.retention)
+        for task_id in removed:
+            # A task saved again since is pending and stays
+            if task_id not in self._pending:
+                self._hot.pop(task_id, None)
+        if removed:
+            print(f"Task store removed {len(removed)} expired tasks")
+
+    async def flush(self):
+        """
+        Writes every pending save to the database.
+        """
+        if not self._pending:
+            return
+
+        batch = list(self._pending.values())
+        self._pending = {}
+
+        try:
+            await self._run(self._write_batch, batch)
+        except Exception:
+            # Put the batch back (without overwriting newer saves) and retry later
+            for task in batch:
+                self._pending.setdefault(task.id, task)
+            raise
+
+    async def close(self):
+        """
+        Stops the background flusher, writes pending saves and closes the database.
+        """
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        await self.flush()
+        await self._run(self._close_db)
+        self._executor.shutdown(wait=True)
+
+    # ---------------- TaskStore API ---------------- #
+
+    async def save(
+        self, task: Task, context: ServerCallContext | None = None
+    ) -> None:
+        """
+        Saves or updates a task; the write is batched, except for the first
+        save of a task in a shared database.
+        """
+        new = task.id not in self._hot and task.id not in self._pending
+        self._remember(task)
+
+        if self.shared and new:
+            try:
+                await self._run(self._write_batch, [task])
+                return
+            except Exception as e:
+                print(f"Task store write failed, batching instead: {e}")
+
+        self._pending[task.id] = task
+        self._queued.set()
+
+        self._ensure_flusher()
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    async def get(
+        self, task_id: str, context: ServerCallContext | None = None
+    ) -> Task | None:
+        """
+        Retrieves a task from the hot set, or from the database. In a shared
+        database the hot set only holds tasks this process saved.
+        """
+        task = self._hot.get(task_id) or self._pending.get(task_id)
+        if task is not None:
+            self._remember(task)
+            return task
+
+        data = await self._run(self._read, task_id)
+        if data is None:
+            return None
+
+        task = Task.model_validate_json(data)
+        if not self.shared:
+            self._remember(task)
+        return task
+
+    async def delete(
+        self, task_id: str, context: ServerCallContext | None = None
+    ) -> None:
+        """Deletes a task from memory and from the database."""
+        self._hot.pop(task_id, None)
+        self._pending.pop(task_id, None)
+        await self._run(self._delete, task_id)
+
+    async def list_by_context(self, context_id: str) -> list[Task]:
+        """
+        Returns every stored task of a context (conversation), oldest first.
+        """
+        await self.flush()
+        rows = await self._run(self._read_context, context_id)
+        return [Task.model_validate_json(data) for data in rows]
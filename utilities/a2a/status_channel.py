@@ -0,0 +1,126 @@
+import time
+import asyncio
+from typing import Optional
+
+from a2a.server.tasks import TaskUpdater
+from a2a.types import TaskState
+from a2a.utils import new_agent_text_message
+
+
+class StatusChannel:
+    """
+    Rate-limited channel for the `working` status updates of one task.
+
+    Updates arriving less than `interval` seconds after the last one sent
+    are merged: consecutive duplicates are dropped and the remaining
+    deltas (at most `max_deltas`, newest kept) are sent together once the
+    interval has passed. Every update carries the task's elapsed time.
+    """
+
+    def __init__(
+        self,
+        updater: TaskUpdater,
+        interval: float = 1.0,
+        max_deltas: int = 5
+    ):
+        self.updater = updater
+        self.interval = interval
+        self.max_deltas = max_deltas
+
+        self._deltas: list[str] = []
+        self._started = time.monotonic()
+        self._last_sent: Optional[float] = None
+        self._timer: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.merged = 0
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    async def update(self, text: str):
+        """
+        Queues a progress delta, sending it now if the interval allows.
+        """
+        if not text:
+            return
+
+        if self._deltas and self._deltas[-1] == text:
+            self.merged += 1
+        else:
+            self._deltas.append(text)
+            if len(self._deltas) > self.max_deltas:
+                self.merged += len(self._deltas) - self.max_deltas
+                del self._deltas[:-self.max_deltas]
+
+        if self._last_sent is None:
+            wait = 0.0
+        else:
+            wait = self._last_sent + self.interval - time.monotonic()
+
+        if wait <= 0:
+            await self._send()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._send_later(wait))
+            self._timer.add_done_callback(self._timer_done)
+
+    async def _send_later(self, delay: float):
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self._send()
+
+    def _timer_done(self, timer: asyncio.Task):
+        # Nobody awaits the timer, so report what a delayed send raised
+        if not timer.cancelled() and timer.exception() is not None:
+            error = timer.exception()
+            print(
+                f"Delayed status update of task {self.updater.task_id} failed: "
+                f"{type(error).__name__}: {error}"
+            )
+
+    async def _send(self):
+        if not self._deltas:
+            return
+
+        text = "; ".join(self._deltas)
+        self._deltas = []
+        self._last_sent = time.monotonic()
+        self.sent += 1
+
+        await self.updater.update_status(
+            TaskState.working,
+            new_agent_text_message(
+                f"{text} ({self.elapsed:.1f}s elapsed)",
+                self.updater.context_id,
+                self.updater.task_id
+            )
+        )
+
+    def _stop_timer(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+    async def flush(self):
+        """
+        Sends any merged deltas immediately.
+        """
+        self._stop_timer()
+        await self._send()
+
+    def discard(self):
+        """
+        Drops pending deltas (e.g. before a final status supersedes them).
+        """
+        self._stop_timer()
+        self._deltas = []
+
+    async def drain(self, timeout: float = 5.0):
+        """
+        Waits until every event enqueued so far has been consumed, so the
+        final status reaches the client before the executor returns.
+        """
+        try:
+            await asyncio.wait_for(self.updater.event_queue.queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            print(f"Event queue of task {self.updater.task_id} not drained after {timeout}s")
@@ -0,0 +1,209 @@
+import asyncio
+from typing import Any, AsyncIterable, Awaitable, Callable
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import Task, TaskArtifactUpdateEvent, TaskState, TaskStatusUpdateEvent
+from a2a.utils import new_agent_text_message, new_task
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.trace import Status, StatusCode
+
+from utilities.a2a.agent_connector import StreamEvent, event_text
+from utilities.a2a.artifact_stream import ArtifactStream
+from utilities.a2a.event_queue_tracing import trace_event_queue
+from utilities.a2a.status_channel import StatusChannel
+from utilities.common.telemetry import tracer
+
+# Receives the events streamed by a delegated agent: (agent name, event)
+DelegationRelay = Callable[[str, StreamEvent], Awaitable[None]]
+
+
+class StreamingAgentExecutor(AgentExecutor):
+    """
+    Runs an agent whose `invoke(query, session_id)` yields dicts and
+    streams its output to A2A clients:
+
+    - {"updates": str} while working: rate-limited working statuses
+    - {"partial": str}: chunks appended to one answer artifact
+    - {"is_task_complete": True, "content": str}: the completed status
+
+    Each execution runs in its own span and is tracked by task id, so
+    cancel() can stop it. Subclasses pass the agent and override
+    `_invoke` to give it more than the query.
+    """
+
+    def __init__(self, agent: Any, agent_name: str, status_interval: float = 1.0):
+        self.agent = agent
+        self.agent_name = agent_name
+
+        # Minimum seconds between two working updates of a task
+        self.status_interval = status_interval
+
+        # Running executions by task id, so cancel() can stop them
+        self._running: dict[str, asyncio.Task] = {}
+
+    def _invoke(
+        self,
+        query: str,
+        task: Task,
+        updater: TaskUpdater,
+        status: StatusChannel
+    ) -> AsyncIterable[dict]:
+        """Starts the agent run for one task"""
+        return self.agent.invoke(query, task.context_id)
+
+    @staticmethod
+    def delegation_relay(updater: TaskUpdater, status: StatusChannel) -> DelegationRelay:
+        """
+        Forwards events streamed by a delegated agent to this task's client:
+        remote artifacts become artifacts of this task and remote status
+        messages become its progress updates.
+        """
+
+        async def relay(agent_name: str, event: StreamEvent) -> None:
+            if isinstance(event, TaskArtifactUpdateEvent):
+                await updater.add_artifact(
+                    event.artifact.parts,
+                    artifact_id=event.artifact.artifact_id,
+                    name=event.artifact.name,
+                    append=event.append,
+                    last_chunk=event.last_chunk,
+                )
+
+            elif isinstance(event, TaskStatusUpdateEvent):
+                text = event_text(event)
+                if text:
+                    await status.update(f"[{agent_name}] {text}")
+
+        return relay
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        """
+        Main executor method.
+        Takes user context and streams events back.
+        """
+
+        # Get the user's query text
+        query = context.get_user_input()
+
+        # Time every event we enqueue (metrics and trace events)
+        event_queue = trace_event_queue(event_queue, self.agent_name)
+
+        # Get current task if it exists
+        task = context.current_task
+
+        # Create a new task if one does not exist
+        if not task:
+            task = new_task(context.message)
+            await event_queue.enqueue_event(task)
+
+        # Create task updater to stream updates
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+        status = StatusChannel(updater, interval=self.status_interval)
+        answer = ArtifactStream(updater)
+        self._running[task.id] = asyncio.current_task()
+
+        # Span of this execution: the agent run and its events nest under it
+        span = tracer.start_span(
+            "a2a.execute",
+            attributes={
+                "a2a.agent": self.agent_name,
+                "a2a.task_id": task.id,
+                "a2a.context_id": task.context_id,
+            }
+        )
+        span_token = otel_context.attach(trace.set_span_in_context(span))
+
+        try:
+            # Stream agent responses
+            async for item in self._invoke(query, task, updater, status):
+
+                is_task_complete = item.get("is_task_complete", False)
+
+                # Streamed answer chunks are appended to one artifact
+                if not is_task_complete and "partial" in item:
+                    await answer.append(item["partial"])
+
+                # If task is still running (updates are merged and throttled)
+                elif not is_task_complete:
+                    await status.update(item.get("updates", ""))
+
+                # If task is complete
+                else:
+                    final_result = item.get("content", "No result received")
+
+                    # The final status supersedes pending progress
+                    status.discard()
+                    await answer.close()
+                    await updater.update_status(
+                        TaskState.completed,
+                        new_agent_text_message(
+                            final_result,
+                            task.context_id,
+                            task.id
+                        )
+                    )
+
+                    # Make sure the client has received everything
+                    await status.drain()
+                    break
+
+        except asyncio.CancelledError:
+            # Stopped by cancel(): tell clients still streaming this task
+            span.set_attribute("a2a.cancelled", True)
+            status.discard()
+            try:
+                await updater.cancel()
+            except RuntimeError:
+                pass  # Already in a terminal state
+            raise
+
+        except Exception as e:
+            # Handle failures
+            span.record_exception(e)
+            span.set_status(Status(StatusCode.ERROR, str(e)))
+            status.discard()
+            error_message = f"An error occurred: {str(e)}"
+
+            await updater.update_status(
+                TaskState.failed,
+                new_agent_text_message(
+                    error_message,
+                    task.context_id,
+                    task.id
+                )
+            )
+            raise
+
+        finally:
+            self._running.pop(task.id, None)
+            otel_context.detach(span_token)
+            span.end()
+
+    async def cancel(self, request: RequestContext, event_queue: EventQueue):
+        """
+        Cancel a running task.
+
+        Cancels the agent run (model call, tool calls and delegations, which
+        cancel their remote tasks), waits briefly for it to unwind and marks
+        the task as canceled, unless the unwinding run already did.
+        """
+        task = request.current_task
+        running = self._running.get(request.task_id)
+
+        if running and not running.done():
+            running.cancel()
+            await asyncio.wait([running], timeout=5)
+
+            # execute() reported the cancellation while unwinding
+            if running.cancelled():
+                return
+
+        updater = TaskUpdater(
+            trace_event_queue(event_queue, self.agent_name),
+            request.task_id,
+            task.context_id if task else request.context_id
+        )
+        await updater.cancel()
@@ -0,0 +1,397 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+from google.adk.sessions.base_session_service import (
+    GetSessionConfig,
+    ListSessionsResponse,
+)
+
+from utilities.common.telemetry import SESSION_METRICS
+
+SessionKey = tuple[str, str, str]
+
+
+class BoundedSessionService(InMemorySessionService):
+    """
+    InMemorySessionService with a bounded footprint.
+
+    Sessions are tracked in LRU order together with an estimate of their
+    serialized size. A session is evicted when it has been idle for
+    `idle_ttl` seconds, or (least recently used first) when the service holds
+    more than `max_sessions` sessions or more than `memory_budget` bytes.
+
+    With a `spill_path`, evicted sessions are written to a local SQLite file
+    and transparently revived the next time they are read or appended to;
+    without one they are dropped. Spilled sessions older than `spill_ttl`
+    seconds, and the oldest beyond `max_spilled`, are deleted every
+    `sweep_interval` seconds.
+
+    Limits are enforced whenever a session is created or grows, and every
+    `evict_interval` seconds by a background task, so an idle process
+    releases its stale sessions too. Call `close()` on shutdown.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        idle_ttl: float = 1800.0,
+        memory_budget: int = 64 * 1024 * 1024,
+        spill_path: Optional[str] = None,
+        spill_ttl: float = 7 * 24 * 3600.0,
+        max_spilled: int = 100_000,
+        sweep_interval: float = 300.0,
+        evict_interval: float = 60.0,
+    ):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.memory_budget = memory_budget
+        self.spill_path = spill_path
+        self.spill_ttl = spill_ttl
+        self.max_spilled = max_spilled
+        self.sweep_interval = sweep_interval
+        self.evict_interval = evict_interval
+
+        # key -> (approximate bytes, last access time)
+        self._lru: OrderedDict[SessionKey, list] = OrderedDict()
+        self._bytes = 0
+        self._evictions = 0
+        self._revivals = 0
+        # Sessions evicted but not yet written to the spill store
+        self._spilling: dict[SessionKey, Session] = {}
+        # Rows in the spill store, kept here so metrics() needs no query
+        self._spilled = 0
+        self._last_sweep = time.monotonic()
+        self._evictor: Optional[asyncio.Task] = None
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if spill_path:
+            os.makedirs(os.path.dirname(os.path.abspath(spill_path)), exist_ok=True)
+            self._db = sqlite3.connect(spill_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    app_name TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    session_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    spilled_at REAL NOT NULL,
+                    PRIMARY KEY (app_name, user_id, session_id)
+                )
+                """
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_spilled_at ON sessions (spilled_at)"
+            )
+            self._db.commit()
+            self._spilled = self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    # ---------------- SPILL STORE (worker threads) ---------------- #
+
+    def _spill_write(self, rows: list[tuple[str, str, str, str, float]]):
+        with self._db_lock, self._db:
+            replaced = self._db.executemany(
+                "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                [row[:3] for row in rows],
+            ).rowcount
+            self._db.executemany(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._spilled += len(rows) - replaced
+
+    def _spill_take(self, key: SessionKey) -> Optional[str]:
+        with self._db_lock, self._db:
+            row = self._db.execute(
+                "SELECT data FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).fetchone()
+            if row:
+                self._db.execute(
+                    "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                    key,
+                )
+                self._spilled -= 1
+            return row[0] if row else None
+
+    def _spill_delete(self, key: SessionKey):
+        with self._db_lock, self._db:
+            self._spilled -= self._db.execute(
+                "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).rowcount
+
+    def _spill_sweep(self, cutoff: float) -> int:
+        """
+        Deletes sessions spilled before `cutoff`, then the oldest ones
+        beyond `max_spilled`.
+        """
+        with self._db_lock, self._db:
+            removed = self._db.execute(
+                "DELETE FROM sessions WHERE spilled_at < ?",
+                (cutoff,),
+            ).rowcount
+            removed += self._db.execute(
+                """
+                DELETE FROM sessions WHERE rowid IN (
+                    SELECT rowid FROM sessions ORDER BY spilled_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_spilled,),
+            ).rowcount
+            self._spilled -= removed
+        return removed
+
+    def _spill_list(self, app_name: str, user_id: Optional[str]) -> list[str]:
+        with self._db_lock:
+            if user_id is None:
+                rows = self._db.execute(
+                    "SELECT data FROM sessions WHERE app_name = ?",
+                    (app_name,),
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT data FROM sessions WHERE app_name = ? AND user_id = ?",
+                    (app_name, user_id),
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    # ---------------- BOOKKEEPING ---------------- #
+
+    def _stored(self, key: SessionKey) -> Optional[Session]:
+        app_name, user_id, session_id = key
+        return self.sessions.get(app_name, {}).get(user_id, {}).get(session_id)
+
+    def _track(self, key: SessionKey, added_bytes: int):
+        entry = self._lru.get(key)
+        if entry is None:
+            entry = [0, 0.0]
+            self._lru[key] = entry
+        entry[0] += added_bytes
+        entry[1] = time.monotonic()
+        self._bytes += added_bytes
+        self._lru.move_to_end(key)
+
+    def _untrack(self, key: SessionKey):
+        entry = self._lru.pop(key, None)
+        if entry:
+            self._bytes -= entry[0]
+
+    async def _revive(self, key: SessionKey):
+        """
+        Loads a spilled session back into memory if it is not already there.
+        """
+        if self._db is None or self._stored(key) is not None:
+            return
+
+        session = self._spilling.get(key)
+        if session is not None:
+            data = session.model_dump_json()
+        else:
+            data = await asyncio.to_thread(self._spill_take, key)
+            if data is None or self._stored(key) is not None:
+                return
+            session = Session.model_validate_json(data)
+
+        app_name, user_id, session_id = key
+        self.sessions.setdefault(app_name, {}).setdefault(user_id, {})[session_id] = session
+        self._revivals += 1
+        self._track(key, len(data))
+
+    async def _enforce_limits(self, keep: Optional[SessionKey] = None):
+        """
+        Evicts idle sessions, then least recently used ones until the session
+        count and memory budget are respected. `keep` is never evicted.
+        """
+        self._ensure_evictor()
+        now = time.monotonic()
+        victims = {
+            key for key, (_, last_access) in self._lru.items()
+            if key != keep and now - last_access > self.idle_ttl
+        }
+
+        remaining = len(self._lru) - len(victims)
+        remaining_bytes = self._bytes - sum(self._lru[key][0] for key in victims)
+        for key, (size, _) in self._lru.items():
+            if remaining <= self.max_sessions and remaining_bytes <= self.memory_budget:
+                break
+            if key == keep or key in victims:
+                continue
+            victims.add(key)
+            remaining -= 1
+            remaining_bytes -= size
+
+        if self._db is not None and time.monotonic() - self._last_sweep >= self.sweep_interval:
+            self._last_sweep = time.monotonic()
+            removed = await asyncio.to_thread(self._spill_sweep, time.time() - self.spill_ttl)
+            if removed:
+                print(f"Session store removed {removed} expired spilled sessions")
+
+        if not victims:
+            return
+
+        rows = []
+        for key in victims:
+            app_name, user_id, session_id = key
+            session = self.sessions.get(app_name, {}).get(user_id, {}).pop(session_id, None)
+            self._untrack(key)
+            self._evictions += 1
+            if session is not None and self._db is not None:
+                self._spilling[key] = session
+                rows.append((*key, session.model_dump_json(), time.time()))
+
+        if rows:
+            try:
+                await asyncio.to_thread(self._spill_write, rows)
+            finally:
+                for row in rows:
+                    self._spilling.pop(row[:3], None)
+
+            # Drop rows for sessions revived while the write was in flight
+            revived = [row[:3] for row in rows if self._stored(row[:3]) is not None]
+            for key in revived:
+                await asyncio.to_thread(self._spill_delete, key)
+
+    def _ensure_evictor(self):
+        if self._evictor is None or self._evictor.done():
+            self._evictor = asyncio.create_task(self._evict_loop())
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(self.evict_interval)
+            try:
+                await self._enforce_limits()
+            except Exception as e:
+                print(f"Session eviction failed: {e}")
+
+    # ---------------- SessionService API ---------------- #
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        if session_id:
+            await self._revive((app_name, user_id, session_id))
+
+        session = await super().create_session(
+            app_name=app_name,
+            user_id=user_id,
+            state=state,
+            session_id=session_id,
+        )
+
+        key = (app_name, user_id, session.id)
+        self._track(key, len(session.model_dump_json()))
+        await self._enforce_limits(keep=key)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        await self._revive(key)
+
+        session = await super().get_session(
+            app_name=app_name,
+            user_id=user_id,
+            session_id=session_id,
+            config=config,
+        )
+        if session is not None:
+            self._track(key, 0)
+        return session
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        response = await super().list_sessions(app_name=app_name, user_id=user_id)
+
+        if self._db is not None:
+            for data in await asyncio.to_thread(self._spill_list, app_name, user_id):
+                session = Session.model_validate_json(data)
+                session.events = []
+                response.sessions.append(session)
+
+        return response
+
+    async def delete_session(
+        self, *, app_name: str, user_id: str, session_id: str
+    ) -> None:
+        key = (app_name, user_id, session_id)
+        await super().delete_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        self._untrack(key)
+        if self._db is not None:
+            await asyncio.to_thread(self._spill_delete, key)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        key = (session.app_name, session.user_id, session.id)
+        # A running session may have been evicted between turns
+        await self._revive(key)
+
+        event = await super().append_event(session=session, event=event)
+
+        if self._stored(key) is not None:
+            self._track(key, len(event.model_dump_json(exclude_none=True)))
+            await self._enforce_limits(keep=key)
+        return event
+
+    # ---------------- METRICS ---------------- #
+
+    def metrics(self) -> dict[str, int]:
+        """
+        Returns session counts and the estimated bytes held in memory.
+        """
+        return {
+            "sessions": len(self._lru),
+            "bytes": self._bytes,
+            "spilled_sessions": self._spilled,
+            "evictions": self._evictions,
+            "revivals": self._revivals,
+        }
+
+    def export_metrics(self, agent: str):
+        """
+        Serves metrics() on the /metrics route, labelled with the agent name.
+        """
+        for name, metric in SESSION_METRICS.items():
+            metric.set_function(lambda name=name: self.metrics()[name], agent=agent)
+
+    async def close(self):
+        """
+        Stops the background eviction and closes the spill database.
+        """
+        if self._evictor:
+            self._evictor.cancel()
+            try:
+                await self._evictor
+            except asyncio.CancelledError:
+                pass
+            self._evictor = None
+
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
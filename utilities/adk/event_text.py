@@ -0,0 +1,16 @@
+from google.adk.events import Event
+
+
+def partial_text(event: Event) -> str:
+    """
+    Returns the answer text carried by a partial (streamed) ADK event,
+    skipping thought parts.
+    """
+    if not event.partial or not event.content or not event.content.parts:
+        return ""
+
+    return "".join(
+        part.text
+        for part in event.content.parts
+        if part.text and not part.thought
+    )
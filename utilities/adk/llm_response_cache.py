@@ -0,0 +1,312 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+# Request config fields that do not change what the model answers
+IGNORED_CONFIG_FIELDS = {"labels", "http_options"}
+
+
+def _normalize_contents(contents: list[dict]) -> list[dict]:
+    """
+    Drops the per-invocation ids ADK gives function calls and responses,
+    so identical conversations hash identically.
+    """
+    for content in contents:
+        for part in content.get("parts", []):
+            for field in ("function_call", "function_response"):
+                if field in part:
+                    part[field].pop("id", None)
+    return contents
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """
+    Normalized hash of everything that determines a model answer: model
+    name, system instruction and generation config, tool schemas (in name
+    order) and conversation contents.
+    """
+    config = {}
+    if llm_request.config:
+        config = llm_request.config.model_dump(
+            mode="json",
+            exclude_none=True,
+            exclude=IGNORED_CONFIG_FIELDS,
+        )
+
+    declarations = []
+    for tool in config.pop("tools", []):
+        declarations.extend(tool.pop("function_declarations", []))
+        if tool:
+            declarations.append(tool)
+
+    encoded = json.dumps(
+        {
+            "model": llm_request.model,
+            "config": config,
+            "tools": sorted(declarations, key=lambda tool: json.dumps(tool, sort_keys=True)),
+            "contents": _normalize_contents([
+                content.model_dump(mode="json", exclude_none=True)
+                for content in llm_request.contents
+            ]),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """
+    One cached model answer.
+
+    Attributes:
+        data (str): The LlmResponse serialized as JSON
+        created_at (float): Wall-clock time the answer was stored
+        hits (int): Times the entry has been served
+    """
+    data: str
+    created_at: float
+    hits: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+
+class LLMResponseCache:
+    """
+    Exact-match cache of model answers, plugged into an LlmAgent through
+    its before/after model callbacks:
+
+        LlmAgent(..., before_model_callback=cache.before_model,
+                 after_model_callback=cache.after_model)
+
+    Entries expire after `ttl` seconds and are evicted least recently used
+    first once the cache holds more than `max_entries` entries or
+    `max_bytes` bytes. With a `cache_file`, entries are also kept in a
+    SQLite file and loaded again on startup.
+
+    Only complete, error-free answers are cached. Cached function calls are
+    replayed without their ids, so ADK still runs the tools with fresh ids.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl: float = 3600.0,
+        max_bytes: int = 32 * 1024 * 1024,
+        cache_file: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.cache_file = cache_file
+
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        # invocation id -> key of the model call awaiting its answer
+        self._pending: OrderedDict[str, str] = OrderedDict()
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if cache_file:
+            self._open(cache_file)
+
+    # ---------------- PERSISTENCE ---------------- #
+
+    def _open(self, cache_file: str):
+        os.makedirs(os.path.dirname(os.path.abspath(cache_file)), exist_ok=True)
+        self._db = sqlite3.connect(cache_file, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._db.execute(
+            "DELETE FROM responses WHERE created_at < ?",
+            (time.time() - self.ttl,),
+        )
+        self._db.commit()
+
+        rows = self._db.execute(
+            "SELECT key, data, created_at, hits FROM responses ORDER BY created_at"
+        ).fetchall()
+        for key, data, created_at, hits in rows:
+            self._insert(key, CachedResponse(data, created_at, hits))
+
+    def _db_write(self, key: str, entry: CachedResponse, evicted: list[str]):
+        with self._db_lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, entry.data, entry.created_at, entry.hits),
+            )
+            self._db.executemany(
+                "DELETE FROM responses WHERE key = ?",
+                [(evicted_key,) for evicted_key in evicted],
+            )
+
+    def _db_save_hits(self, rows: list[tuple[int, str]]):
+        with self._db_lock, self._db:
+            self._db.executemany("UPDATE responses SET hits = ? WHERE key = ?", rows)
+
+    # ---------------- STORAGE ---------------- #
+
+    def _insert(self, key: str, entry: CachedResponse) -> list[str]:
+        """
+        Adds an entry and evicts until the limits hold. Returns evicted keys.
+        """
+        self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        evicted = []
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            evicted.append(oldest)
+        return evicted
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry.size
+
+    def get(self, key: str) -> Optional[LlmResponse]:
+        """
+        Returns the cached answer for a request key, counting the hit.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if time.time() - entry.created_at > self.ttl:
+            self._remove(key)
+            return None
+
+        entry.hits += 1
+        self._entries.move_to_end(key)
+        return LlmResponse.model_validate_json(entry.data)
+
+    async def put(self, key: str, llm_response: LlmResponse):
+        """
+        Stores a model answer under a request key.
+        """
+        response = llm_response.model_copy(deep=True)
+        if response.content:
+            for part in response.content.parts or []:
+                if part.function_call:
+                    part.function_call.id = None
+
+        entry = CachedResponse(
+            data=response.model_dump_json(exclude_none=True),
+            created_at=time.time(),
+        )
+        if entry.size > self.max_bytes:
+            return
+
+        evicted = self._insert(key, entry)
+        if self._db is not None:
+            try:
+                await asyncio.to_thread(self._db_write, key, entry, evicted)
+            except Exception as e:
+                print(f"Could not persist LLM cache entry: {e}")
+
+    # ---------------- ADK CALLBACKS ---------------- #
+
+    async def before_model(
+        self,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """
+        Answers the model call from the cache, or remembers its key so
+        `after_model` can store the answer.
+        """
+        key = request_key(llm_request)
+        response = self.get(key)
+        if response is not None:
+            self.hits += 1
+            return response
+
+        self.misses += 1
+        invocation_id = callback_context.invocation_id
+        self._pending[invocation_id] = key
+        self._pending.move_to_end(invocation_id)
+        # Calls that raised never reach after_model; don't let them pile up
+        while len(self._pending) > 1024:
+            self._pending.popitem(last=False)
+        return None
+
+    async def after_model(
+        self,
+        callback_context: CallbackContext,
+        llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """
+        Stores complete, successful model answers. Never alters them.
+        """
+        if llm_response.partial:
+            return None
+
+        key = self._pending.pop(callback_context.invocation_id, None)
+        if key and llm_response.content and not llm_response.error_code:
+            await self.put(key, llm_response)
+        return None
+
+    # ---------------- METRICS ---------------- #
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns cache-wide counters plus the hit count of every entry,
+        most used first.
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entry_hits": sorted(
+                ({"key": key, "hits": entry.hits} for key, entry in self._entries.items()),
+                key=lambda item: item["hits"],
+                reverse=True,
+            ),
+        }
+
+    async def close(self):
+        """
+        Persists hit counters and closes the cache file.
+        """
+        if self._db is None:
+            return
+
+        rows = [(entry.hits, key) for key, entry in self._entries.items() if entry.hits]
+        try:
+            if rows:
+                await asyncio.to_thread(self._db_save_hits, rows)
+        finally:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
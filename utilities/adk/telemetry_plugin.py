@@ -0,0 +1,172 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry.trace import Status, StatusCode
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.mcp_tool.mcp_tool import McpTool
+from google.adk.tools.tool_context import ToolContext
+
+from utilities.common.telemetry import LLM_TURN_SECONDS, TOOL_CALL_SECONDS, tracer
+
+# Calls whose end is never reported (e.g. answered by a cache) are dropped
+# once this many are pending
+MAX_PENDING = 1024
+
+
+class TelemetryPlugin(BasePlugin):
+    """
+    Runner plugin that times every model call and tool call.
+
+    Model calls are recorded in `agent_llm_turn_seconds` and traced as
+    "llm_turn" spans (from request to complete answer, with token counts).
+    Tool calls are recorded in `agent_tool_call_seconds`; ADK already traces
+    them as "execute_tool" spans. Model calls answered by a before-model
+    callback (the response cache) never reach the model and are not counted.
+    """
+
+    def __init__(self):
+        super().__init__(name="telemetry")
+
+        # invocation id -> (perf counter, wall clock ns, trace context, model)
+        self._model_calls: OrderedDict[str, tuple[float, int, Any, str]] = OrderedDict()
+        # function call id -> perf counter
+        self._tool_calls: OrderedDict[str, float] = OrderedDict()
+
+    @staticmethod
+    def _remember(pending: OrderedDict, key: str, value: Any):
+        pending[key] = value
+        pending.move_to_end(key)
+        while len(pending) > MAX_PENDING:
+            pending.popitem(last=False)
+
+    # ---------------- MODEL CALLS ---------------- #
+
+    def _finish_model_call(
+        self,
+        callback_context: CallbackContext,
+        llm_response: Optional[LlmResponse] = None,
+        error: Optional[Exception] = None
+    ):
+        started = self._model_calls.pop(callback_context.invocation_id, None)
+        if started is None:
+            return
+
+        started_at, started_ns, parent, model = started
+        status = "error" if error or (llm_response and llm_response.error_code) else "ok"
+        LLM_TURN_SECONDS.observe(
+            time.perf_counter() - started_at,
+            agent=callback_context.agent_name,
+            status=status,
+        )
+
+        span = tracer.start_span(
+            "llm_turn",
+            context=parent,
+            start_time=started_ns,
+            attributes={
+                "gen_ai.agent.name": callback_context.agent_name,
+                "gen_ai.request.model": model,
+            },
+        )
+        usage = llm_response.usage_metadata if llm_response else None
+        if usage:
+            span.set_attribute("gen_ai.usage.input_tokens", usage.prompt_token_count or 0)
+            span.set_attribute("gen_ai.usage.output_tokens", usage.candidates_token_count or 0)
+        if error:
+            span.record_exception(error)
+        if status == "error":
+            span.set_status(Status(StatusCode.ERROR, str(error or llm_response.error_message)))
+        span.end()
+
+    async def before_model_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        self._remember(
+            self._model_calls,
+            callback_context.invocation_id,
+            (time.perf_counter(), time.time_ns(), otel_context.get_current(), llm_request.model or ""),
+        )
+        return None
+
+    async def after_model_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        # A streamed answer is complete with its first non-partial response
+        if not llm_response.partial:
+            self._finish_model_call(callback_context, llm_response=llm_response)
+        return None
+
+    async def on_model_error_callback(
+        self,
+        *,
+        callback_context: CallbackContext,
+        llm_request: LlmRequest,
+        error: Exception
+    ) -> Optional[LlmResponse]:
+        self._finish_model_call(callback_context, error=error)
+        return None
+
+    # ---------------- TOOL CALLS ---------------- #
+
+    def _finish_tool_call(self, tool: BaseTool, tool_context: ToolContext, status: str):
+        started = self._tool_calls.pop(tool_context.function_call_id, None)
+        if started is None:
+            return
+
+        TOOL_CALL_SECONDS.observe(
+            time.perf_counter() - started,
+            agent=tool_context.agent_name,
+            tool=tool.name,
+            kind="mcp" if isinstance(tool, McpTool) else "function",
+            status=status,
+        )
+
+    async def before_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext
+    ) -> Optional[dict]:
+        self._remember(self._tool_calls, tool_context.function_call_id, time.perf_counter())
+        return None
+
+    async def after_tool_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        result: dict
+    ) -> Optional[dict]:
+        self._finish_tool_call(tool, tool_context, "ok")
+        return None
+
+    async def on_tool_error_callback(
+        self,
+        *,
+        tool: BaseTool,
+        tool_args: dict[str, Any],
+        tool_context: ToolContext,
+        error: Exception
+    ) -> Optional[dict]:
+        self._finish_tool_call(tool, tool_context, "error")
+        return None
+
+    async def after_run_callback(self, *, invocation_context: InvocationContext) -> None:
+        # Model calls answered from a cache never got an answer from the model
+        self._model_calls.pop(invocation_context.invocation_id, None)
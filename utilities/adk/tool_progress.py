@@ -0,0 +1,37 @@
+import time
+from typing import Optional
+
+from google.adk.events import Event
+
+
+class ToolProgress:
+    """
+    Turns ADK events into short progress deltas: which tools started and
+    which finished (with their duration). Events that carry no tool
+    activity produce no delta.
+    """
+
+    def __init__(self):
+        # function call id -> start time
+        self._started: dict[str, float] = {}
+
+    def describe(self, event: Event) -> Optional[str]:
+        """
+        Returns a progress line for an event, or None if there is nothing new.
+        """
+        deltas = []
+
+        for call in event.get_function_calls():
+            self._started[call.id] = time.monotonic()
+            deltas.append(f"Started tool {call.name}")
+
+        for response in event.get_function_responses():
+            started = self._started.pop(response.id, None)
+            if started is None:
+                deltas.append(f"Finished tool {response.name}")
+            else:
+                deltas.append(
+                    f"Finished tool {response.name} in {time.monotonic() - started:.1f}s"
+                )
+
+        return "; ".join(deltas) or None
@@ -0,0 +1,444 @@
+import os
+import time
+import asyncio
+import threading
+import importlib.util
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.trace import Span, SpanKind, Status, StatusCode
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+# Latency buckets (seconds) shared by every histogram
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Requests that would only add noise to traces
+UNTRACED_PATHS = {"/metrics", "/traces", "/ready"}
+
+# Instrumentation too fine-grained to keep in memory (a span per SDK method
+# call); still exported over OTLP
+UNBUFFERED_SCOPES = {"a2a-python-sdk"}
+
+tracer = trace.get_tracer("mcp_a2a_project")
+
+
+# ---------------- METRICS ---------------- #
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class Histogram:
+    """
+    Prometheus histogram with a fixed set of labels.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+
+        # label values -> (per-bucket counts incl. +Inf, sum)
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: Any):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            counts, total = self._series.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+
+        for key, counts, total in sorted(series):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": str(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """
+    Prometheus gauge or counter whose values are read from callbacks when
+    the metrics are rendered, one callback per set of label values.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str = "gauge",
+        labelnames: tuple[str, ...] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.labelnames = labelnames
+
+        # label values -> callback returning the current value
+        self._series: dict[tuple[str, ...], Callable[[], float]] = {}
+        self._lock = threading.Lock()
+
+    def set_function(self, function: Callable[[], float], **labels: Any):
+        """Reads the series with these labels from `function` (replacing any earlier one)"""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._series[key] = function
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+
+        for key, function in series:
+            try:
+                value = function()
+            except Exception:
+                continue
+            lines.append(f"{self.name}{_format_labels(dict(zip(self.labelnames, key)))} {value}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide set of metrics, rendered in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Histogram | CallbackMetric] = {}
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Returns the histogram called `name`, creating it on first use"""
+        if name not in self._metrics:
+            self._metrics[name] = Histogram(name, documentation, labelnames, buckets)
+        return self._metrics[name]
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str = "gauge",
+        labelnames: tuple[str, ...] = ()
+    ) -> CallbackMetric:
+        """Returns the callback gauge or counter called `name`, creating it on first use"""
+        if name not in self._metrics:
+            self._metrics[name] = CallbackMetric(name, documentation, metric_type, labelnames)
+        return self._metrics[name]
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_TURN_SECONDS = REGISTRY.histogram(
+    "agent_llm_turn_seconds",
+    "Duration of one model call made by an agent",
+    ("agent", "status"),
+)
+TOOL_CALL_SECONDS = REGISTRY.histogram(
+    "agent_tool_call_seconds",
+    "Duration of one tool call (kind is function or mcp)",
+    ("agent", "tool", "kind", "status"),
+)
+DISCOVERY_FETCH_SECONDS = REGISTRY.histogram(
+    "a2a_discovery_fetch_seconds",
+    "Duration of fetching one agent card",
+    ("status",),
+)
+DELEGATION_SECONDS = REGISTRY.histogram(
+    "a2a_delegation_seconds",
+    "Duration of one A2A request to a remote agent (method is send, stream or cancel)",
+    ("agent", "method", "status"),
+)
+EVENT_ENQUEUE_SECONDS = REGISTRY.histogram(
+    "a2a_event_enqueue_seconds",
+    "Time an agent executor spends enqueueing one task event",
+    ("agent", "event"),
+)
+
+# Read from each agent's BoundedSessionService.metrics() when scraped
+SESSION_METRICS = {
+    "sessions": REGISTRY.callback(
+        "agent_sessions",
+        "Sessions an agent holds in memory",
+        labelnames=("agent",),
+    ),
+    "bytes": REGISTRY.callback(
+        "agent_session_bytes",
+        "Estimated bytes of the sessions an agent holds in memory",
+        labelnames=("agent",),
+    ),
+    "spilled_sessions": REGISTRY.callback(
+        "agent_spilled_sessions",
+        "Evicted sessions kept in an agent's spill file",
+        labelnames=("agent",),
+    ),
+    "evictions": REGISTRY.callback(
+        "agent_session_evictions_total",
+        "Sessions evicted from memory",
+        "counter",
+        ("agent",),
+    ),
+    "revivals": REGISTRY.callback(
+        "agent_session_revivals_total",
+        "Spilled sessions loaded back into memory",
+        "counter",
+        ("agent",),
+    ),
+}
+
+
+@contextmanager
+def timed(
+    histogram: Histogram,
+    span_name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    attributes: Optional[dict[str, Any]] = None,
+    attach: bool = True,
+    **labels: Any
+) -> Iterator[Span]:
+    """
+    Traces a block as a span and records its duration in `histogram`,
+    labelled with `labels` plus status "ok", "error" or "cancelled".
+
+    Pass `attach=False` inside async generators: the span is then not made
+    current, since a generator may be closed from another context.
+    """
+    span = tracer.start_span(span_name, kind=kind, attributes=attributes)
+    token = otel_context.attach(trace.set_span_in_context(span)) if attach else None
+    started = time.perf_counter()
+    status = "ok"
+
+    try:
+        yield span
+    except (asyncio.CancelledError, GeneratorExit):
+        status = "cancelled"
+        raise
+    except BaseException as e:
+        status = "error"
+        span.record_exception(e)
+        span.set_status(Status(StatusCode.ERROR, str(e)))
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - started, status=status, **labels)
+        if token is not None:
+            otel_context.detach(token)
+        span.end()
+
+
+# ---------------- TRACING ---------------- #
+
+class RecentSpans(SpanProcessor):
+    """
+    Keeps the last `max_spans` finished spans in memory, so a request's
+    timeline can be read back from /traces without a tracing backend.
+
+    Spans of the A2A SDK's own instrumentation are not kept, so a kept
+    span's parent may be missing; order by start time to follow the trace.
+    """
+
+    def __init__(self, max_spans: int = 2048):
+        self._spans: deque[ReadableSpan] = deque(maxlen=max_spans)
+
+    def on_end(self, span: ReadableSpan):
+        scope = span.instrumentation_scope
+        if scope is None or scope.name not in UNBUFFERED_SCOPES:
+            self._spans.append(span)
+
+    def spans(self, trace_id: Optional[str] = None, limit: int = 200) -> list[dict[str, Any]]:
+        """
+        Returns recent spans, newest last, optionally only those of one
+        trace (32 hex digits).
+        """
+        selected = [
+            span for span in list(self._spans)
+            if trace_id is None or f"{span.context.trace_id:032x}" == trace_id
+        ]
+        return [self._to_dict(span) for span in selected[-limit:]]
+
+    @staticmethod
+    def _to_dict(span: ReadableSpan) -> dict[str, Any]:
+        return {
+            "name": span.name,
+            "service": span.resource.attributes.get("service.name"),
+            "trace_id": f"{span.context.trace_id:032x}",
+            "span_id": f"{span.context.span_id:016x}",
+            "parent_id": f"{span.parent.span_id:016x}" if span.parent else None,
+            "start": span.start_time / 1e9,
+            "duration_ms": (span.end_time - span.start_time) / 1e6,
+            "status": span.status.status_code.name,
+            "attributes": dict(span.attributes or {}),
+            "events": [
+                {"name": event.name, "time": event.timestamp / 1e9, **dict(event.attributes or {})}
+                for event in span.events
+            ],
+        }
+
+
+_recent_spans: Optional[RecentSpans] = None
+
+
+def setup_tracing(service_name: str, max_spans: int = 2048) -> RecentSpans:
+    """
+    Installs an OpenTelemetry tracer provider for this process (unless one
+    is set already) that keeps recent spans for /traces. Spans are also
+    exported over OTLP/HTTP when OTEL_EXPORTER_OTLP_ENDPOINT (or the traces
+    specific variable) is set.
+
+    ADK spans then join the same traces. Their copies of prompts and tool
+    arguments are off unless ADK_CAPTURE_MESSAGE_CONTENT_IN_SPANS is set.
+    """
+    global _recent_spans
+
+    os.environ.setdefault("ADK_CAPTURE_MESSAGE_CONTENT_IN_SPANS", "false")
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+
+        exporting = (
+            os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT") or
+            os.environ.get("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT")
+        )
+        if exporting:
+            if importlib.util.find_spec("opentelemetry.exporter.otlp.proto.http") is None:
+                print("OTLP endpoint set but 'opentelemetry-exporter-otlp-proto-http' is not installed")
+            else:
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+                provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+
+        trace.set_tracer_provider(provider)
+
+    if _recent_spans is None:
+        _recent_spans = RecentSpans(max_spans)
+        provider.add_span_processor(_recent_spans)
+    return _recent_spans
+
+
+def trace_headers(span: Optional[Span] = None) -> dict[str, str]:
+    """
+    W3C trace context headers (traceparent, tracestate) for an outgoing
+    request, continuing `span` or else the current span.
+    """
+    carrier: dict[str, str] = {}
+    context = trace.set_span_in_context(span) if span is not None else None
+    propagate.inject(carrier, context=context)
+    return carrier
+
+
+class TraceContextMiddleware:
+    """
+    ASGI middleware that continues the caller's trace (from the traceparent
+    header) in a server span around each HTTP request. Work the request
+    starts, including tasks it spawns, belongs to that span.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in UNTRACED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        with tracer.start_as_current_span(
+            f"{scope['method']} {scope['path']}",
+            context=propagate.extract(headers),
+            kind=SpanKind.SERVER,
+            attributes={
+                "http.request.method": scope["method"],
+                "url.path": scope["path"],
+            },
+        ):
+            await self.app(scope, receive, send)
+
+
+# ---------------- ROUTES ---------------- #
+
+async def metrics(request: Request) -> PlainTextResponse:
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+async def traces(request: Request) -> JSONResponse:
+    """Recent spans, optionally filtered with ?trace_id=<32 hex digits>"""
+    if _recent_spans is None:
+        return JSONResponse({"spans": []})
+
+    try:
+        limit = int(request.query_params.get("limit", 200))
+    except ValueError:
+        limit = 200
+
+    return JSONResponse({
+        "spans": _recent_spans.spans(
+            trace_id=request.query_params.get("trace_id"),
+            limit=limit,
+        )
+    })
+
+
+def telemetry_routes() -> list[Route]:
+    """/metrics and /traces routes for an agent server app"""
+    return [
+        Route("/metrics", metrics, methods=["GET"]),
+        Route("/traces", traces, methods=["GET"]),
+    ]
@@ -0,0 +1,102 @@
+import re
+import logging
+from importlib.metadata import PackageNotFoundError, version
+
+import anyio
+from mcp import ClientSession
+from mcp.types import (
+    CancelledNotification,
+    CancelledNotificationParams,
+    ClientNotification,
+)
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+
+logger = logging.getLogger(__name__)
+
+# Seconds allowed for telling the server about a cancelled request
+NOTIFY_TIMEOUT = 2.0
+
+# mcp releases (major, minor) whose private ClientSession.send_request and
+# _request_id behave as _cancellable() expects; pyproject pins mcp>=1.21.1.
+# Check the patch against a new release before adding it here.
+SUPPORTED_MCP_VERSIONS = {(1, 21)}
+
+
+def _mcp_version() -> tuple[int, ...]:
+    try:
+        installed = version("mcp")
+    except PackageNotFoundError:
+        return ()
+    return tuple(int(part) for part in re.findall(r"\d+", installed)[:2])
+
+
+def cancellation_supported() -> bool:
+    """
+    True if the installed mcp release is one the session patch was checked against.
+    """
+    return _mcp_version() in SUPPORTED_MCP_VERSIONS and hasattr(ClientSession, "send_request")
+
+
+_SUPPORTED = cancellation_supported()
+if not _SUPPORTED:
+    logger.warning(
+        "MCP cancellation is not propagated to servers: mcp %s is not a supported version",
+        ".".join(map(str, _mcp_version())) or "(unknown)",
+    )
+
+
+def _cancellable(session: ClientSession) -> ClientSession:
+    """
+    Makes a client session send `notifications/cancelled` for any request
+    whose caller is cancelled, so the server stops working on it (and e.g.
+    kills the processes it started). The MCP client does not do this itself.
+    """
+    if getattr(session, "_propagates_cancellation", False):
+        return session
+    if not isinstance(getattr(session, "_request_id", None), int):
+        return session
+
+    send_request = session.send_request
+
+    async def send_request_with_cancel(request, result_type, *args, **kwargs):
+        # send_request takes this id before its first await
+        request_id = session._request_id
+        try:
+            return await send_request(request, result_type, *args, **kwargs)
+        except anyio.get_cancelled_exc_class():
+            with anyio.CancelScope(shield=True), anyio.move_on_after(NOTIFY_TIMEOUT):
+                try:
+                    await session.send_notification(ClientNotification(
+                        CancelledNotification(
+                            params=CancelledNotificationParams(
+                                requestId=request_id,
+                                reason="Cancelled by client",
+                            )
+                        )
+                    ))
+                except Exception as e:
+                    print(f"Could not notify MCP server of cancellation: {e}")
+            raise
+
+    session.send_request = send_request_with_cancel
+    session._propagates_cancellation = True
+    return session
+
+
+def propagate_cancellation(toolset: MCPToolset) -> MCPToolset:
+    """
+    Makes every session the toolset opens forward cancellations of tool
+    calls to the MCP server. With an unsupported mcp release the toolset
+    is returned unchanged: cancelled calls then only stop on the client.
+    """
+    if not _SUPPORTED:
+        return toolset
+
+    manager = toolset._mcp_session_manager
+    create_session = manager.create_session
+
+    async def create_cancellable_session(*args, **kwargs) -> ClientSession:
+        return _cancellable(await create_session(*args, **kwargs))
+
+    manager.create_session = create_cancellable_session
+    return toolset
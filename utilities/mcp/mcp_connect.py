@@ -1,63 +1,331 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
 from utilities.mcp.mcp_discovery import MCPDiscovery
+from utilities.mcp.mcp_manifest_cache import MCPManifestCache, CachedMCPToolset
+from utilities.mcp.mcp_cancellation import propagate_cancellation
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
 from google.adk.tools.mcp_tool import StdioConnectionParams
 from google.adk.tools.mcp_tool.mcp_session_manager import StreamableHTTPConnectionParams
-from mcp import StdioServerParameters
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import Tool as McpBaseTool
+
+
+@dataclass
+class ServerLoadReport:
+    """
+    Result of loading the tools of one MCP server.
+
+    Attributes:
+        name (str): Server name from the config file
+        latency (float): Seconds spent connecting and listing tools
+        tool_count (int): Number of tools the server exposed
+        tool_names (list[str]): Names of those tools
+        error (str, optional): Why loading failed, if it did
+        cached (bool): True if the tools came from the manifest cache
+    """
+    name: str
+    latency: float
+    tool_count: int = 0
+    tool_names: Optional[list[str]] = None
+    error: Optional[str] = None
+    cached: bool = False
 
 
 class MCPConnect:
     """
     Discovers MCP servers, loads their tools,
     and caches them as MCPToolsets compatible with Google ADK.
+
+    Servers are loaded concurrently, each under its own timeout, so one slow
+    or broken server neither delays nor drops the others.
+
+    With a manifest cache, servers whose config entry is unchanged are not
+    contacted at load time: their tools are built from the cached manifest
+    and the server is connected when a tool is first called. The cached
+    manifests are then checked against the live servers in the background.
     """
 
-    def __init__(self, config_file: str = None):
+    def __init__(
+        self,
+        config_file: str = None,
+        load_timeout: float = 30.0,
+        manifest_cache: Optional[MCPManifestCache] = None
+    ):
         self.discovery = MCPDiscovery(config_file=config_file)
         self.toolsets: list[MCPToolset] = []
+        self.load_timeout = load_timeout
+        self.load_reports: list[ServerLoadReport] = []
+        self.manifest_cache = manifest_cache
+        self.validation_task: Optional[asyncio.Task] = None
 
-    async def load_all_tools(self):
+    @staticmethod
+    def _is_http(server: dict[str, Any]) -> bool:
+        return server.get("command") == "streamable_http"
+
+    @classmethod
+    def _build_toolset(
+        cls,
+        server: dict[str, Any],
+        tools: Optional[list[McpBaseTool]] = None
+    ) -> MCPToolset:
+        # Choose connection type
+        if cls._is_http(server):
+            conn = StreamableHTTPConnectionParams(
+                url=server["args"][0]
+            )
+        else:
+            conn = StdioConnectionParams(
+                server_params=StdioServerParameters(
+                    command=server["command"],
+                    args=server["args"]
+                ),
+                timeout=5
+            )
+
+        if tools is not None:
+            toolset = CachedMCPToolset(connection_params=conn, tools=tools)
+        else:
+            toolset = MCPToolset(connection_params=conn)
+
+        # Cancelled tool calls are cancelled on the server too
+        return propagate_cancellation(toolset)
+
+    async def _load_server(
+        self,
+        server: dict[str, Any]
+    ) -> tuple[MCPToolset, list, Optional[str]]:
         """
-        Loads all tools from discovered MCP servers
-        and caches them as MCPToolsets.
+        Connects to one server and fetches its tools.
+
+        With a manifest cache the tools are listed over a short-lived
+        session, which also reports the server's version for the manifest,
+        and the toolset connects when a tool is first called, as it does
+        for a cached manifest. ADK's toolset does not expose the version.
+
+        Returns:
+            tuple[MCPToolset, list, str | None]: Toolset, its ADK tools and
+            the server version (None without a manifest cache)
         """
+        if self.manifest_cache:
+            version, mcp_tools = await self._probe_server(server)
+            toolset = self._build_toolset(server, tools=mcp_tools)
+            return toolset, await toolset.get_tools(), version
+
+        toolset = self._build_toolset(server)
+
         try:
-            for name, server in self.discovery.list_servers().items():
-                # Choose connection type
-                if server.get("command") == "streamable_http":
-                    conn = StreamableHTTPConnectionParams(
-                        url=server["args"][0]
-                    )
-                else:
-                    conn = StdioConnectionParams(
-                        server_params=StdioServerParameters(
-                            command=server["command"],
-                            args=server["args"]
-                        ),
-                        timeout=5
+            # Fetch tools from server
+            tools = await toolset.get_tools()
+        except BaseException:
+            try:
+                await toolset.close()
+            except BaseException:
+                pass
+            raise
+
+        return toolset, tools, None
+
+    async def load_all_tools(self) -> list[ServerLoadReport]:
+        """
+        Loads all tools from discovered MCP servers concurrently
+        and caches them as MCPToolsets.
+
+        Every server is loaded in its own task so that a failure (including
+        a cancellation escaping the MCP client) only drops that server.
+
+        Returns:
+            list[ServerLoadReport]: One report per configured server
+        """
+        servers = self.discovery.list_servers()
+        started = time.monotonic()
+        finished_at: dict[str, float] = {}
+
+        # Serve unchanged servers straight from the manifest cache
+        cached: dict[str, MCPToolset] = {}
+        if self.manifest_cache:
+            for name, server in servers.items():
+                entry = self.manifest_cache.get(name, server)
+                if entry:
+                    cached[name] = self._build_toolset(
+                        server,
+                        tools=self.manifest_cache.tools(entry)
                     )
 
-                toolset = MCPToolset(connection_params=conn)
+        async def timed_load(name: str, server: dict[str, Any]):
+            try:
+                return await self._load_server(server)
+            finally:
+                finished_at[name] = time.monotonic()
+
+        tasks = {
+            name: asyncio.create_task(timed_load(name, server))
+            for name, server in servers.items()
+            if name not in cached
+        }
 
-                # Fetch tools from server
-                tools = await toolset.get_tools()
-                tool_names = [tool.name for tool in tools]
+        if tasks:
+            _, pending = await asyncio.wait(
+                tasks.values(),
+                timeout=self.load_timeout
+            )
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
 
+        self.load_reports = []
+        for name, server in servers.items():
+            if name in cached:
+                toolset = cached[name]
+                tool_names = [tool.name for tool in toolset.cached_tools]
                 print(
-                    f"[bold green]Loaded tools from server "
+                    f"[bold green]Loaded cached tools for server "
                     f"[cyan]'{name}'[/cyan]: {', '.join(tool_names)}[/bold green]"
                 )
-
-                # Cache toolset
                 self.toolsets.append(toolset)
+                self.load_reports.append(ServerLoadReport(
+                    name=name,
+                    latency=0.0,
+                    tool_count=len(tool_names),
+                    tool_names=tool_names,
+                    cached=True,
+                ))
+                continue
+
+            task = tasks[name]
+            latency = finished_at.get(name, time.monotonic()) - started
+
+            if task.cancelled():
+                error = (
+                    f"timed out after {self.load_timeout}s"
+                    if latency >= self.load_timeout else "connection cancelled"
+                )
+            elif task.exception() is not None:
+                error = str(task.exception()) or type(task.exception()).__name__
+            else:
+                error = None
+
+            if error:
+                print(
+                    f"[bold red]Error loading tools from server "
+                    f"(skipping) '{name}': {error}[/bold red]"
+                )
+                self.load_reports.append(ServerLoadReport(
+                    name=name,
+                    latency=latency,
+                    error=error,
+                ))
+                continue
+
+            toolset, tools, version = task.result()
+            tool_names = [tool.name for tool in tools]
+            if self.manifest_cache:
+                self.manifest_cache.put(
+                    name,
+                    server,
+                    [tool.raw_mcp_tool for tool in tools],
+                    server_version=version
+                )
 
-        except Exception as e:
             print(
-                f"[bold red]Error loading tools from server "
-                f"(skipping) '{name}': {e}[/bold red]"
+                f"[bold green]Loaded tools from server "
+                f"[cyan]'{name}'[/cyan]: {', '.join(tool_names)}[/bold green]"
             )
 
+            # Cache toolsets in config order
+            self.toolsets.append(toolset)
+            self.load_reports.append(ServerLoadReport(
+                name=name,
+                latency=latency,
+                tool_count=len(tool_names),
+                tool_names=tool_names,
+            ))
+
+        # Check cached manifests against the live servers in the background
+        if cached:
+            self.validation_task = asyncio.create_task(
+                self.validate_cached({
+                    name: (servers[name], toolset)
+                    for name, toolset in cached.items()
+                })
+            )
+
+        return self.load_reports
+
+    async def _probe_server(
+        self,
+        server: dict[str, Any]
+    ) -> tuple[Optional[str], list[McpBaseTool]]:
+        """
+        Opens a short-lived session to a server and returns its reported
+        version and tool definitions.
+        """
+        if self._is_http(server):
+            transport = streamablehttp_client(server["args"][0])
+        else:
+            transport = stdio_client(StdioServerParameters(
+                command=server["command"],
+                args=server["args"]
+            ))
+
+        async with transport as streams:
+            async with ClientSession(*streams[:2]) as session:
+                init = await session.initialize()
+                tools = await session.list_tools()
+
+        return init.serverInfo.version, tools.tools
+
+    async def _validate_server(
+        self,
+        name: str,
+        server: dict[str, Any],
+        toolset: CachedMCPToolset
+    ):
+        try:
+            version, tools = await asyncio.wait_for(
+                self._probe_server(server),
+                timeout=self.load_timeout
+            )
+        except (Exception, asyncio.CancelledError) as e:
+            print(
+                f"[bold yellow]Could not validate cached tools for server "
+                f"'{name}': {str(e) or type(e).__name__}[/bold yellow]"
+            )
+            return
+
+        entry = self.manifest_cache.get(name, server)
+        if entry and self.manifest_cache.is_current(entry, version, tools):
+            return
+
+        # Schema or version changed: refresh the manifest and the live toolset
+        self.manifest_cache.put(name, server, tools, server_version=version)
+        toolset.set_tools(tools)
+        print(
+            f"[bold green]Refreshed cached tools for server "
+            f"[cyan]'{name}'[/cyan]: {', '.join(tool.name for tool in tools)}[/bold green]"
+        )
+
+    async def validate_cached(
+        self,
+        cached: dict[str, tuple[dict[str, Any], CachedMCPToolset]]
+    ):
+        """
+        Compares cached manifests with what the live servers report and
+        updates any that changed. Each server is validated in its own task.
+        """
+        tasks = [
+            asyncio.create_task(self._validate_server(name, server, toolset))
+            for name, (server, toolset) in cached.items()
+        ]
+        await asyncio.wait(tasks)
+
     def get_tools(self) -> list[MCPToolset]:
         """
         Returns the cached list of MCPToolsets.
         """
-        return self.toolsets.copy()
\ No newline at end of file
+        return self.toolsets.copy()
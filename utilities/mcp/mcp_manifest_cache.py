@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+from typing import Any, Dict, List, Optional
+
+from mcp.types import Tool as McpBaseTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.mcp_tool.mcp_tool import McpTool
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+from google.adk.agents.readonly_context import ReadonlyContext
+
+
+def config_hash(server: Dict[str, Any]) -> str:
+    """
+    Stable hash of one server entry from mcp_config.json.
+    """
+    encoded = json.dumps(server, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def schema_hash(tools: List[McpBaseTool]) -> str:
+    """
+    Stable hash of a server's tool names, descriptions and input schemas.
+    """
+    encoded = json.dumps(
+        [
+            tool.model_dump(mode="json", exclude_none=True)
+            for tool in sorted(tools, key=lambda tool: tool.name)
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class MCPManifestCache:
+    """
+    On-disk cache of the tool list each MCP server exposes.
+
+    Entries are keyed by server name and only used while the hash of the
+    server's config entry still matches. Each entry also records the server
+    version and a hash of its tool schemas so a live check can tell whether
+    the cached manifest is out of date.
+    """
+
+    def __init__(self, cache_file: str = None):
+        if cache_file:
+            self.cache_file = cache_file
+        else:
+            self.cache_file = os.path.join(
+                os.path.expanduser("~/.cache/mcp_a2a_project"),
+                "mcp_tool_manifest.json"
+            )
+
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Ignoring unreadable MCP manifest cache {self.cache_file}: {e}")
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+        tmp_file = f"{self.cache_file}.tmp"
+
+        with open(tmp_file, "w") as f:
+            json.dump(self.entries, f, indent=2)
+
+        os.replace(tmp_file, self.cache_file)
+
+    def get(self, name: str, server: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached manifest for a server if its config is unchanged.
+
+        Args:
+            name (str): Server name from the config file
+            server (Dict[str, Any]): The server's config entry
+
+        Returns:
+            Dict[str, Any] | None: Manifest entry, or None if missing or stale
+        """
+        entry = self.entries.get(name)
+        if not entry or entry.get("config_hash") != config_hash(server):
+            return None
+        return entry
+
+    def tools(self, entry: Dict[str, Any]) -> List[McpBaseTool]:
+        """
+        Rebuilds the MCP tool definitions stored in a manifest entry.
+        """
+        return [McpBaseTool.model_validate(tool) for tool in entry["tools"]]
+
+    def is_current(
+        self,
+        entry: Dict[str, Any],
+        server_version: Optional[str],
+        tools: List[McpBaseTool]
+    ) -> bool:
+        """
+        Checks a manifest entry against what the live server reports.
+        """
+        return (
+            entry.get("server_version") == server_version
+            and entry.get("schema_hash") == schema_hash(tools)
+        )
+
+    def put(
+        self,
+        name: str,
+        server: Dict[str, Any],
+        tools: List[McpBaseTool],
+        server_version: Optional[str] = None
+    ):
+        """
+        Stores (or replaces) the manifest for a server and persists the cache.
+        """
+        self.entries[name] = {
+            "config_hash": config_hash(server),
+            "server_version": server_version,
+            "schema_hash": schema_hash(tools),
+            "tools": [
+                tool.model_dump(mode="json", exclude_none=True)
+                for tool in tools
+            ],
+        }
+
+        try:
+            self._save()
+        except Exception as e:
+            print(f"Could not write MCP manifest cache {self.cache_file}: {e}")
+
+    def invalidate(self, name: str):
+        """
+        Drops the manifest for one server.
+        """
+        if self.entries.pop(name, None) is not None:
+            try:
+                self._save()
+            except Exception as e:
+                print(f"Could not write MCP manifest cache {self.cache_file}: {e}")
+
+
+class CachedMCPToolset(MCPToolset):
+    """
+    MCPToolset that serves its tool list from a cached manifest.
+
+    The tools are regular ADK McpTools bound to this toolset's session
+    manager, so the server is only connected to when a tool is first called.
+    """
+
+    def __init__(self, *, tools: List[McpBaseTool], **kwargs):
+        super().__init__(**kwargs)
+        self._cached_tools = tools
+
+    @property
+    def cached_tools(self) -> List[McpBaseTool]:
+        return list(self._cached_tools)
+
+    def set_tools(self, tools: List[McpBaseTool]):
+        """
+        Replaces the cached tool definitions (e.g. after a schema change).
+        """
+        self._cached_tools = tools
+
+    async def get_tools(
+        self,
+        readonly_context: Optional[ReadonlyContext] = None,
+    ) -> List[BaseTool]:
+        tools = []
+        for tool in self._cached_tools:
+            mcp_tool = McpTool(
+                mcp_tool=tool,
+                mcp_session_manager=self._mcp_session_manager,
+                auth_scheme=self._auth_scheme,
+                auth_credential=self._auth_credential,
+                require_confirmation=self._require_confirmation,
+                header_provider=self._header_provider,
+            )
+
+            if self._is_tool_selected(mcp_tool, readonly_context):
+                tools.append(mcp_tool)
+        return tools